@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark ANSI - Débit du parser ANSI sur flux coloré et flux brut
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.ansi import AnsiParser
+from core.line_assembler import LineAssembler
+
+CHUNK_SIZE = 4096
+
+
+def systemd_stream(lines: int) -> str:
+    """Flux type systemd: statuts colorés, retours chariot"""
+    out = []
+    for i in range(lines):
+        if i % 3 == 0:
+            out.append(f"[\x1b[0;32m  OK  \x1b[0m] Started Service number {i}.\r\n")
+        elif i % 3 == 1:
+            out.append(f"[  {i / 100:8.6f}] mmc0: new HS200 MMC card at address 0001\r\n")
+        else:
+            out.append(f"\x1b[1;31mFAILED\x1b[0m Failed to start unit-{i}.service\r\n")
+    return ''.join(out)
+
+
+def plain_stream(lines: int) -> str:
+    """Flux brut sans séquences (U-Boot, noyau)"""
+    return ''.join(
+        f"[  {i / 100:8.6f}] usb 1-1: new high-speed USB device number {i}\n"
+        for i in range(lines)
+    )
+
+
+def top_stream(frames: int) -> str:
+    """Rafraîchissements plein écran type top"""
+    out = ['\x1b[?1049h']
+    for f in range(frames):
+        out.append('\x1b[H\x1b[2J')
+        for row in range(24):
+            out.append(f'\x1b[{row + 1};1H\x1b[7m{row:4d}\x1b[27m root  20 0 {f}\x1b[K')
+    out.append('\x1b[?1049l')
+    return ''.join(out)
+
+
+def chunks(data: str):
+    """Découpe en chunks comme les lectures série"""
+    return [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+
+
+def bench(name: str, data: str, repeat: int = 5) -> dict:
+    """Mesure le débit (Mo/s) avec et sans parser ANSI"""
+    parts = chunks(data)
+
+    best_raw = best_ansi = float('inf')
+    for _ in range(repeat):
+        assembler = LineAssembler()
+        start = time.perf_counter()
+        for part in parts:
+            assembler.feed(part)
+        best_raw = min(best_raw, time.perf_counter() - start)
+
+        parser = AnsiParser()
+        assembler = LineAssembler()
+        start = time.perf_counter()
+        for part in parts:
+            ops, plain = parser.feed(part)
+            assembler.feed(plain)
+        best_ansi = min(best_ansi, time.perf_counter() - start)
+
+    mb = len(data) / 1e6
+    return {
+        'name': name,
+        'mb': round(mb, 2),
+        'raw_mb_s': round(mb / best_raw, 1),
+        'ansi_mb_s': round(mb / best_ansi, 1),
+    }
+
+
+def main():
+    results = [
+        bench('plain', plain_stream(100000)),
+        bench('systemd', systemd_stream(100000)),
+        bench('top', top_stream(500)),
+    ]
+    for r in results:
+        print(f"{r['name']:8s} {r['mb']:6.2f} Mo  lignes seules {r['raw_mb_s']:8.1f} Mo/s"
+              f"  + ANSI {r['ansi_mb_s']:8.1f} Mo/s")
+    return results
+
+
+if __name__ == '__main__':
+    main()
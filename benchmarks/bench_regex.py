@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark Regex - Coût par ligne au pire cas sur flux d'octets aléatoires
+
+Flux binaire (mauvaise vitesse, bruit de ligne) décodé comme le lecteur
+série: détection + modules ligne par ligne, avec et sans plafond de
+longueur; pipeline complet avec et sans détecteur de flux binaire; puis
+patterns pathologiques refusés par core.regex_safety.
+
+    python3 benchmarks/bench_regex.py --mb 4
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from core.context_detector import ContextDetector
+from core.line_assembler import LineAssembler
+from core.module_manager import ModuleManager
+from core.pipeline import ConsolePipeline
+from core.regex_safety import MAX_LINE_LENGTH, RE2_AVAILABLE, check_pattern
+
+CHUNK_SIZE = 4096
+
+# Patterns au retour arrière exponentiel et entrée qui les fait échouer
+PATHOLOGICAL = [
+    (r'(a+)+$', 'a', '!'),
+    (r'(\w+\s?)+$', 'ab ', '!'),
+    (r'(a|aa)+b', 'a', ''),
+    (r'(.*,)*x', ',', ''),
+]
+
+
+def random_stream(size: int, seed: int, newline_every: int = 0) -> bytes:
+    """Octets aléatoires; `newline_every` > 0: un '\\n' tous les N octets en moyenne"""
+    rng = random.Random(seed)
+    data = bytearray(rng.randbytes(size))
+    if newline_every:
+        data = data.replace(b'\n', b'')
+        for i in range(0, len(data) - newline_every, newline_every):
+            data[i + rng.randrange(newline_every)] = 10
+    return bytes(data)
+
+
+def lines_of(data: bytes) -> list:
+    """Lignes telles que les voit le pipeline (décodage par chunk, assemblage)"""
+    assembler = LineAssembler()
+    lines = []
+    for i in range(0, len(data), CHUNK_SIZE):
+        lines.extend(assembler.feed(data[i:i + CHUNK_SIZE].decode('utf-8', errors='replace')))
+    lines.append(assembler.flush())
+    return [line for line in lines if line.strip()]
+
+
+def per_line(lines: list, cap: int) -> dict:
+    """Détection + modules Linux/U-Boot ligne par ligne: pire cas, p99, débit"""
+    detector = ContextDetector()
+    manager = ModuleManager()
+    modules = [m for m in ('linux_module', 'uboot_module') if manager.load_module(m)]
+    costs = []
+    total = time.perf_counter()
+    for line in lines:
+        line = line[:cap]
+        start = time.perf_counter()
+        detector.update(line)
+        for name in modules:
+            manager.loaded_modules[name].process_line(line, 'linux_kernel')
+        costs.append(time.perf_counter() - start)
+    total = time.perf_counter() - total
+    costs.sort()
+    return {
+        'lines': len(lines),
+        'max_us': costs[-1] * 1e6 if costs else 0.0,
+        'p99_us': costs[int(len(costs) * 0.99)] * 1e6 if costs else 0.0,
+        'lines_per_s': len(lines) / total if total else 0.0,
+    }
+
+
+def pipeline_seconds(data: bytes, classify: bool) -> float:
+    """Pipeline complet par chunks: feed_bytes (détecteur binaire) ou décodage systématique"""
+    pipeline = ConsolePipeline()
+    start = time.perf_counter()
+    for i in range(0, len(data), CHUNK_SIZE):
+        chunk = data[i:i + CHUNK_SIZE]
+        if classify:
+            pipeline.feed_bytes(chunk)
+        else:
+            pipeline.feed(chunk.decode('utf-8', errors='replace'))
+    pipeline.finish()
+    return time.perf_counter() - start
+
+
+def pathological(limit_seconds: float = 0.5) -> list:
+    """Temps de `re` quand l'entrée grandit, jusqu'à `limit_seconds` par essai"""
+    results = []
+    for pattern, unit, tail in PATHOLOGICAL:
+        compiled = re.compile(pattern)
+        timings = []
+        for n in range(8, 64, 2):
+            start = time.perf_counter()
+            compiled.search(unit * n + tail)
+            elapsed = time.perf_counter() - start
+            timings.append((n * len(unit), elapsed))
+            if elapsed > limit_seconds:
+                break
+        results.append((pattern, check_pattern(pattern), timings))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coût par ligne sur flux aléatoires")
+    parser.add_argument('--mb', type=float, default=2.0, help="Taille de chaque flux")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    size = int(args.mb * 1e6)
+    streams = [
+        ('binaire', random_stream(size, args.seed)),
+        ('lignes 80', random_stream(size, args.seed, 80)),
+        ('lignes 64k', random_stream(size, args.seed, 65536)),
+    ]
+    print(f"Plafond de ligne: {MAX_LINE_LENGTH} caractères, re2 {'disponible' if RE2_AVAILABLE else 'absent'}")
+    for name, data in streams:
+        lines = lines_of(data)
+        for label, cap in (('plafond', MAX_LINE_LENGTH), ('sans plafond', len(data))):
+            r = per_line(lines, cap)
+            print(f"  {name:10s} {label:12s} {r['lines']:>8,d} lignes  pire {r['max_us']:>10.1f} µs"
+                  f"  p99 {r['p99_us']:>8.1f} µs  {r['lines_per_s']:>10,.0f} lignes/s")
+
+    print("\nPipeline complet (Mo/s):")
+    for name, data in streams:
+        mb = len(data) / 1e6
+        decoded = mb / pipeline_seconds(data, False)
+        classified = mb / pipeline_seconds(data, True)
+        print(f"  {name:10s} tout analysé {decoded:8.2f}   détecteur binaire {classified:8.2f}")
+
+    print("\nPatterns pathologiques (moteur re):")
+    for pattern, reason, timings in pathological():
+        n, seconds = timings[-1]
+        print(f"  {pattern:14s} {n:3d} car. → {seconds * 1000:9.1f} ms   {reason or 'accepté'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
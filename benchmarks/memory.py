@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Memory - Octets par ligne conservée (objets par ligne vs colonnes compactes)
+
+    python3 benchmarks/memory.py                  # boot synthétique de 200k lignes
+    python3 benchmarks/memory.py --lines 1000000 --log benchmarks/logs/mcbin_openwrt.log
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from core.context_detector import ContextDetector, ContextInfo, ContextType
+from core.records import LineStore, EventStore
+from benchmarks.synthetic import generate_boot, DEFAULT_MIX
+
+
+class LineObject:
+    """Référence: un objet par ligne (texte, contexte, horodatage, port)"""
+
+    def __init__(self, number, line, context, ts, port):
+        self.number = number
+        self.line = line
+        self.context = context
+        self.ts = ts
+        self.port = port
+
+
+@dataclass
+class DictContextInfo:
+    """Référence: ContextInfo avant slots (dict hardware par instance)"""
+    type: ContextType
+    prompt: Optional[str] = None
+    version: Optional[str] = None
+    hardware: dict = None
+
+    def __post_init__(self):
+        if self.hardware is None:
+            self.hardware = {}
+
+
+def measure(build) -> int:
+    """Octets alloués et retenus par build()"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mémoire par ligne conservée")
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--log', help="Log de boot à répéter au lieu du boot synthétique")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.log:
+        with open(args.log, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            text = f.read()
+        base = [l for l in text.splitlines() if l.strip()]
+        lines = (base * (args.lines // len(base) + 1))[:args.lines]
+    else:
+        lines = [l for l in generate_boot(args.lines, dict(DEFAULT_MIX), args.seed).split('\n') if l.strip()]
+
+    detector = ContextDetector()
+    contexts = []
+    for line in lines:
+        detector.update(line)
+        contexts.append(detector.current_context.type.value)
+    ts = time.time()
+    count = len(lines)
+    text_bytes = sum(len(l.encode('utf-8')) for l in lines)
+
+    def objects():
+        # Les lignes reçues sont des chaînes neuves (décodage série): copie
+        # pour que la référence paie ses str
+        return [LineObject(i, line.encode('utf-8').decode('utf-8'), context, ts + i * 1e-3, 'ttyUSB0')
+                for i, (line, context) in enumerate(zip(lines, contexts))]
+
+    def store():
+        s = LineStore(max_bytes=None)
+        for i, (line, context) in enumerate(zip(lines, contexts)):
+            s.append(line, context, ts + i * 1e-3, 'ttyUSB0')
+        return s
+
+    def events_objects():
+        return [{'hardware': {'key': line[:8]}, 'commands': [], 'alerts': []} for line in lines]
+
+    def events_store():
+        s = EventStore()
+        for i, line in enumerate(lines):
+            s.add('hardware', i, ts, 'key', line[:8])
+        return s
+
+    print(f"{count} lignes, {text_bytes / count:.1f} octets de texte UTF-8 par ligne\n")
+    print(f"{'représentation':40s} {'octets/ligne':>12s}")
+    for name, build in (('objet + str par ligne', objects),
+                        ('LineStore (colonnes)', store),
+                        ('dict résultat par événement', events_objects),
+                        ('EventStore (colonnes)', events_store)):
+        print(f"{name:40s} {measure(build) / count:12.1f}")
+
+    n = 100000
+    for name, cls in (('ContextInfo (dataclass + dict)', DictContextInfo),
+                      ('ContextInfo (slots)', ContextInfo)):
+        size = measure(lambda: [cls(type=ContextType.LINUX_KERNEL) for _ in range(n)])
+        print(f"{name:40s} {size / n:12.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Benchmarks - Débit du pipeline sur boots synthétiques et logs enregistrés
+
+Les logs de `benchmarks/logs/` sont des boots reconstitués à la main (~170
+lignes, répétées): utiles pour voir les étapes sur des phases réalistes,
+trop courts pour juger une régression. `--compare` les affiche à titre
+indicatif; seuls le boot généré et les captures réelles déposées dans
+`benchmarks/captures/` comptent. Aucune capture n'est fournie: sans elles,
+`run` et `--compare` listent ce qui n'est pas exercé (SYNTHETIC_GAPS).
+
+    python3 benchmarks/run.py                      # tout, résultats JSON
+    python3 benchmarks/run.py --lines 200000 --mix kernel=0.9,shell=0.1
+    python3 benchmarks/run.py --compare results/a.json results/b.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from core.ansi import AnsiParser, strip_ansi
+from core.context_detector import ContextDetector
+from core.line_assembler import LineAssembler
+from core.module_manager import ModuleManager
+from core.pipeline import ConsolePipeline
+from benchmarks.synthetic import generate_boot, DEFAULT_MIX
+
+# Boots reconstitués (synthétiques, indicatifs) et captures réelles (non fournies)
+LOGS_DIR = os.path.join(ROOT, 'benchmarks', 'logs')
+CAPTURES_DIR = os.path.join(ROOT, 'benchmarks', 'captures')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+CHUNK_SIZE = 4096
+# Lignes par lot pour les benchmarks process_batch (~ un chunk de 4 Ko)
+BATCH_LINES = 64
+
+# Seuil de régression signalé par --compare (perte de débit)
+REGRESSION_THRESHOLD = 0.10
+
+# Ce que le boot généré et les logs reconstitués ne contiennent pas: sans
+# capture réelle, ces chemins ne sont pas mesurés et leurs régressions
+# passent inaperçues
+SYNTHETIC_GAPS = (
+    "lignes longues (plafond PIDEBUGGER_MAX_LINE, troncature)",
+    "rafales binaires et bruit de mauvaise vitesse (core.binary_stream)",
+    "ANSI plein écran: curseur, effacements (top, htop, menuconfig)",
+    "UTF-8 hors ASCII (cadres whiptail, tree)",
+    "réponses printenv / bdinfo U-Boot complètes (profils de cartes)",
+    "chunks au rythme de l'UART (ici: chunks fixes de 4 Ko)",
+)
+
+
+def git_commit() -> str:
+    """Commit courant (ou 'unknown')"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def best_of(rounds: int, func) -> float:
+    """Meilleur temps sur plusieurs exécutions"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class Dataset:
+    """Flux console préparé pour les différentes étapes"""
+
+    def __init__(self, name: str, text: str, informative: bool = False):
+        self.name = name
+        self.text = text
+        # Hors comparaison de régression (log synthétique trop court)
+        self.informative = informative
+        self.raw = text.encode('utf-8')
+        self.chunks = [self.raw[i:i + CHUNK_SIZE] for i in range(0, len(self.raw), CHUNK_SIZE)]
+        self.text_chunks = [c.decode('utf-8', errors='replace') for c in self.chunks]
+        self.lines = [l for l in strip_ansi(text).split('\n') if l.strip()]
+
+        # Contexte de chaque ligne (pour les benchmarks modules)
+        detector = ContextDetector()
+        self.contexts = []
+        for line in self.lines:
+            detector.update(line)
+            self.contexts.append(detector.current_context.type.value)
+
+        # Lots comme dans ConsolePipeline: coupés aux changements de contexte
+        self.batches = []
+        start = 0
+        for i in range(1, len(self.lines) + 1):
+            if i == len(self.lines) or i - start >= BATCH_LINES or self.contexts[i] != self.contexts[start]:
+                self.batches.append((self.lines[start:i], self.contexts[start:i]))
+                start = i
+
+
+def bench_decode(ds: Dataset):
+    for chunk in ds.chunks:
+        chunk.decode('utf-8', errors='replace')
+
+
+def bench_assembler(ds: Dataset):
+    assembler = LineAssembler()
+    for chunk in ds.text_chunks:
+        assembler.feed(chunk)
+
+
+def bench_ansi(ds: Dataset):
+    parser = AnsiParser()
+    for chunk in ds.text_chunks:
+        parser.feed(chunk)
+
+
+def bench_detector(ds: Dataset):
+    detector = ContextDetector()
+    for line in ds.lines:
+        detector.update(line)
+
+
+def bench_manager(ds: Dataset):
+    manager = ModuleManager()
+    current = None
+    for line, context in zip(ds.lines, ds.contexts):
+        if context != current:
+            manager.activate_for_context(context)
+            current = context
+        manager.process_line(line, context)
+
+
+def bench_manager_batch(ds: Dataset):
+    manager = ModuleManager()
+    current = None
+    for lines, contexts in ds.batches:
+        if contexts[0] != current:
+            manager.activate_for_context(contexts[0])
+            current = contexts[0]
+        manager.process_batch(lines, contexts)
+
+
+def make_module_bench(module_name: str):
+    """Benchmark d'un module seul sur toutes les lignes"""
+    def bench(ds: Dataset):
+        manager = ModuleManager()
+        manager.load_module(module_name)
+        process_line = manager.loaded_modules[module_name].process_line
+        for line, context in zip(ds.lines, ds.contexts):
+            process_line(line, context)
+    return bench
+
+
+def make_module_batch_bench(module_name: str):
+    """Même module via process_batch (lots de BATCH_LINES lignes)"""
+    def bench(ds: Dataset):
+        manager = ModuleManager()
+        manager.load_module(module_name)
+        process_batch = manager.loaded_modules[module_name].process_batch
+        for lines, contexts in ds.batches:
+            process_batch(lines, contexts)
+    return bench
+
+
+def bench_e2e(ds: Dataset):
+    pipeline = ConsolePipeline()
+    for chunk in ds.chunks:
+        pipeline.feed(chunk.decode('utf-8', errors='replace'))
+    pipeline.finish()
+
+
+def suites() -> dict:
+    """Étapes mesurées"""
+    benches = {
+        'decode': bench_decode,
+        'assembler': bench_assembler,
+        'ansi': bench_ansi,
+        'detector': bench_detector,
+        'manager': bench_manager,
+        'manager:batch': bench_manager_batch,
+    }
+    for module_name in sorted(ModuleManager().discover_modules()):
+        benches[f'module:{module_name}'] = make_module_bench(module_name)
+        benches[f'module:{module_name}:batch'] = make_module_batch_bench(module_name)
+    benches['e2e'] = bench_e2e
+    return benches
+
+
+def capture_paths() -> list:
+    """Captures réelles déposées dans CAPTURES_DIR"""
+    return sorted(glob.glob(os.path.join(CAPTURES_DIR, '*.log')))
+
+
+def synthetic_notice() -> str:
+    """Avertissement: résultats sans capture réelle"""
+    lines = [f"⚠️ Aucune capture réelle dans {os.path.relpath(CAPTURES_DIR, ROOT)}/: "
+             "résultats synthétiques uniquement. Non exercés:"]
+    lines.extend(f"   - {gap}" for gap in SYNTHETIC_GAPS)
+    return '\n'.join(lines)
+
+
+def load_datasets(args) -> list:
+    """Boot généré, logs synthétiques et captures réelles (répétés pour stabiliser la mesure)"""
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        for item in args.mix.split(','):
+            phase, weight = item.split('=')
+            mix[phase.strip()] = float(weight)
+
+    datasets = [Dataset(f'synthetic-{args.lines}', generate_boot(args.lines, mix, args.seed))]
+
+    logs = sorted(glob.glob(os.path.join(LOGS_DIR, '*.log')))
+    for paths, informative in ((logs, True), (capture_paths(), False)):
+        for path in paths:
+            with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+                text = f.read()
+            name = os.path.splitext(os.path.basename(path))[0]
+            datasets.append(Dataset(f'{name}-x{args.log_repeat}', text * args.log_repeat, informative))
+
+    return datasets
+
+
+def run(args) -> dict:
+    """Exécute les benchmarks, retourne le document JSON"""
+    results = {}
+    informative = []
+    benches = suites()
+    selected = args.suite or list(benches)
+    synthetic_only = not capture_paths()
+    if synthetic_only:
+        print(synthetic_notice())
+
+    for ds in load_datasets(args):
+        mb = len(ds.raw) / 1e6
+        results[ds.name] = {}
+        if ds.informative:
+            informative.append(ds.name)
+        print(f"\n{ds.name}: {len(ds.lines)} lignes, {mb:.2f} Mo{' (synthétique, indicatif)' if ds.informative else ''}")
+
+        for name in selected:
+            seconds = best_of(args.rounds, lambda: benches[name](ds))
+            entry = {
+                'seconds': round(seconds, 6),
+                'lines_per_s': round(len(ds.lines) / seconds),
+                'mb_per_s': round(mb / seconds, 3),
+            }
+            results[ds.name][name] = entry
+            print(f"  {name:28s} {entry['lines_per_s']:>12,d} lignes/s {entry['mb_per_s']:>10.2f} Mo/s")
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'lines': args.lines,
+            'seed': args.seed,
+            'mix': args.mix or '',
+            'log_repeat': args.log_repeat,
+            'rounds': args.rounds,
+            'informative': informative,
+            'synthetic_only': synthetic_only,
+        },
+        'results': results,
+    }
+
+
+def compare(base_path: str, new_path: str, threshold: float = REGRESSION_THRESHOLD) -> int:
+    """Compare deux résultats, retourne 1 si une régression dépasse le seuil"""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    print(f"{base['meta']['commit']} → {new['meta']['commit']}")
+    # Résultats anciens (sans 'synthetic_only'): aucune capture n'existait
+    if base['meta'].get('synthetic_only', True) or new['meta'].get('synthetic_only', True):
+        print(synthetic_notice())
+    # Logs synthétiques: affichés sans verdict (résultats anciens: d'après LOGS_DIR)
+    informative = set(base['meta'].get('informative', ())) | set(new['meta'].get('informative', ()))
+    logs = [os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(LOGS_DIR, '*.log'))]
+    regressions = 0
+    for dataset, benches in new['results'].items():
+        indicative = dataset in informative or any(dataset.startswith(f'{log}-x') for log in logs)
+        for name, entry in benches.items():
+            old = base['results'].get(dataset, {}).get(name)
+            if not old:
+                continue
+            change = entry['lines_per_s'] / old['lines_per_s'] - 1
+            flag = ''
+            if indicative:
+                flag = '  (indicatif)'
+            elif change < -threshold:
+                flag = '  ⚠️ régression'
+                regressions += 1
+            print(f"  {dataset:32s} {name:28s} {change * 100:+7.1f}%{flag}")
+
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks PiDebugger")
+    parser.add_argument('--lines', type=int, default=50000, help="Lignes du boot synthétique")
+    parser.add_argument('--mix', help="Poids des phases, ex: kernel=0.9,shell=0.1")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--log-repeat', type=int, default=100, help="Répétitions des logs enregistrés")
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--suite', action='append', help="Limite aux étapes indiquées")
+    parser.add_argument('--output', help="Fichier JSON (défaut: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help="Compare deux résultats")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare)
+
+    # Les modules sont importés en relatif à la racine du dépôt
+    os.chdir(ROOT)
+    document = run(args)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{document['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print(f"\nRésultats: {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
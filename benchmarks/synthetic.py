@@ -0,0 +1,141 @@
+"""
+Synthetic - Génération de flux console de boot réalistes et reproductibles
+"""
+import random
+from typing import Dict, List, Optional
+
+# Phases dans l'ordre du boot, avec leur poids par défaut dans le flux
+PHASES = ('bootrom', 'wtmi', 'atf', 'uboot', 'kernel', 'shell')
+
+DEFAULT_MIX = {
+    'bootrom': 0.01,
+    'wtmi': 0.01,
+    'atf': 0.03,
+    'uboot': 0.10,
+    'kernel': 0.70,
+    'shell': 0.15,
+}
+
+HEADERS = {
+    'bootrom': [
+        "TIM-1.0",
+        "BootROM - 2.03",
+        "Booting from SPI NOR flash",
+        "UART enabled",
+    ],
+    'wtmi': [
+        "WTMI-devel-18.12.1-1a13f2f",
+        "WTMI: system early-init",
+        "SVC REV: 5, CPU VDD voltage: 1.155V",
+    ],
+    'atf': [
+        "NOTICE:  Booting Trusted Firmware",
+        "NOTICE:  BL1: v1.5(release):armada-18.12.3",
+        "NOTICE:  BL1: Booting BL2",
+        "NOTICE:  BL2: v1.5(release):armada-18.12.3",
+        "NOTICE:  BL1: Booting BL31",
+        "NOTICE:  BL31: v1.5(release):armada-18.12.3",
+        "NOTICE:  BL31: Platform: Marvell Armada 3720",
+    ],
+    'uboot': [
+        "U-Boot 2018.03-devel-18.12.3-gc9aa92c-armbian (Feb 20 2019 - 09:45:04 +0100)",
+        "Model: Globalscale Marvell ESPRESSOBin Board",
+        "Board: ESPRESSObin, Armada 3720",
+        "CPU:    Marvell Armada 3720 @ 1000 MHz",
+        "DRAM:  1 GiB",
+        "Hit any key to stop autoboot:  0",
+    ],
+    'kernel': [
+        "Starting kernel ...",
+        "[    0.000000] Booting Linux on physical CPU 0x0000000000 [0x410fd034]",
+        "[    0.000000] Linux version 5.15.93-mvebu64 (root@build) (aarch64-linux-gnu-gcc 8.3.0) #1 SMP PREEMPT",
+        "[    0.000000] Machine model: Globalscale Marvell ESPRESSOBin Board",
+    ],
+    'shell': [
+        "",
+        "Ubuntu 22.04.2 LTS espressobin ttyMV0",
+        "",
+        "espressobin login: root",
+        "Password: ",
+        "root@espressobin:~# ",
+    ],
+}
+
+BODY = {
+    'bootrom': [
+        "Image checksum verification PASSED",
+        "BootROM: Image {n:d} loaded",
+    ],
+    'wtmi': [
+        "wtmi_clock_init: {n:d}",
+        "DDR3 Training Sequence - Ver TIP-1.29.0",
+        "DDR3 Training Sequence - Ended Successfully",
+    ],
+    'atf': [
+        "INFO:    BL31: Initializing runtime services {n:d}",
+        "INFO:    Loading image id={n:d} at address 0x4024000",
+        "INFO:    Image id={n:d} loaded: 0x4024000 - 0x403b0b0",
+    ],
+    'uboot': [
+        "Comphy-{c:d}: PEX0          2.5 Gbps",
+        "MMC:   sdhci@d0000: {c:d}, sdhci@d8000: 1",
+        "Loading Environment from SPI Flash... SF: Detected w25q32dw with page size 256 Bytes",
+        "Net:   eth0: neta@30000 [PRIME]",
+        "=> ",
+        "switch to partitions #0, OK",
+        "{n:d} bytes read in 123 ms (18.3 MiB/s)",
+        "## Flattened Device Tree blob at 06000000",
+    ],
+    'kernel': [
+        "[{t:12.6f}] mvebu-pcie d0070000.pcie: link up",
+        "[{t:12.6f}] usb 1-1: new high-speed USB device number {c:d} using xhci-hcd",
+        "[{t:12.6f}] mmcblk0: mmc0:aaaa SC16G 14.8 GiB",
+        "[{t:12.6f}]  mmcblk0: p1",
+        "[{t:12.6f}] mv88e6085 d0032004.mdio-mii:01: switch 0x3410 detected: Marvell 88E6341",
+        "[{t:12.6f}] EXT4-fs (mmcblk0p1): mounted filesystem with ordered data mode. Opts: (null)",
+        "[{t:12.6f}] calling  armada_37xx_wdt_driver_init+0x0/0x1000 @ 1",
+        "[{t:12.6f}] initcall armada_37xx_wdt_driver_init+0x0/0x1000 returned 0 after {c:d} usecs",
+        "[{t:12.6f}] systemd[1]: systemd 249.11-0ubuntu3 running in system mode",
+        "[  \x1b[0;32mOK\x1b[0m  ] Started Journal Service.",
+        "[  \x1b[0;32mOK\x1b[0m  ] Reached target Local File Systems.",
+    ],
+    'shell': [
+        "root@espressobin:~# dmesg | tail",
+        "Linux espressobin 5.15.93-mvebu64 #1 SMP PREEMPT aarch64 GNU/Linux",
+        "eth0: flags=4163<UP,BROADCAST,RUNNING,MULTICAST>  mtu 1500",
+        "        inet 192.168.1.{c:d}  netmask 255.255.255.0  broadcast 192.168.1.255",
+        "Filesystem      Size  Used Avail Use% Mounted on",
+        "/dev/mmcblk0p1   15G  2.1G   12G  15% /",
+        "root@espressobin:~# ",
+    ],
+}
+
+
+def generate_boot(lines: int, mix: Optional[Dict[str, float]] = None, seed: int = 0,
+                  line_ending: str = '\r\n') -> str:
+    """Génère un boot complet BootROM → shell d'environ `lines` lignes
+
+    Chaque phase commence par ses lignes caractéristiques (déclenchant la
+    détection) puis reçoit une part des lignes selon `mix`.
+    """
+    mix = {**DEFAULT_MIX, **(mix or {})}
+    total_weight = sum(mix[p] for p in PHASES) or 1.0
+    rng = random.Random(seed)
+
+    out: List[str] = []
+    t = 0.0
+    for phase in PHASES:
+        out.extend(HEADERS[phase])
+        count = max(int(lines * mix[phase] / total_weight) - len(HEADERS[phase]), 0)
+        templates = BODY[phase]
+        for i in range(count):
+            t += rng.random() * 0.002
+            out.append(rng.choice(templates).format(n=i, c=rng.randrange(1, 64), t=t))
+
+    return line_ending.join(out) + line_ending
+
+
+def generate_cycles(cycles: int, lines_per_boot: int, mix: Optional[Dict[str, float]] = None,
+                    seed: int = 0) -> str:
+    """Enchaîne plusieurs boots (cycles d'alimentation successifs)"""
+    return ''.join(generate_boot(lines_per_boot, mix, seed + i) for i in range(cycles))
@@ -1,4 +1,8 @@
 from .context_detector import ContextDetector, ContextType, ContextInfo
 from .module_manager import ModuleManager
+from .profiles import ProfileWatcher, ProfileError, load_profiles
 
-__all__ = ['ContextDetector', 'ContextType', 'ContextInfo', 'ModuleManager']
+__all__ = [
+    'ContextDetector', 'ContextType', 'ContextInfo', 'ModuleManager',
+    'ProfileWatcher', 'ProfileError', 'load_profiles',
+]
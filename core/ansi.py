@@ -0,0 +1,236 @@
+"""
+ANSI Parser - Machine à états ANSI/VT100 en flux
+"""
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Opérations produites par le parser
+OP_TEXT = 'text'            # (OP_TEXT, texte, style)
+OP_CLEAR = 'clear'          # (OP_CLEAR, mode)        CSI n J
+OP_ERASE_LINE = 'erase'     # (OP_ERASE_LINE, mode)   CSI n K
+OP_GOTO = 'goto'            # (OP_GOTO, ligne, col)   CSI l;c H (base 0)
+OP_MOVE = 'move'            # (OP_MOVE, dligne, dcol) CSI A/B/C/D, \b
+OP_CR = 'cr'                # (OP_CR,)                \r seul
+OP_SCREEN_END = 'screen_end'  # (OP_SCREEN_END,)      sortie écran alternatif
+
+# Style: (fg, bg, bold, underline), couleurs '#rrggbb' ou None (défaut)
+DEFAULT_STYLE = (None, None, False, False)
+
+# Palette 16 couleurs (thème Dark+)
+BASIC_COLORS = (
+    '#000000', '#cd3131', '#0dbc79', '#e5e510',
+    '#2472c8', '#bc3fbc', '#11a8cd', '#e5e5e5',
+    '#666666', '#f14c4c', '#23d18b', '#f5f543',
+    '#3b8eea', '#d670d6', '#29b8db', '#ffffff',
+)
+
+# Séquences complètes ou caractères de contrôle à interpréter
+_CONTROL_RE = re.compile(
+    r'\x1b\[([0-?]*)[ -/]*([@-~])'              # CSI
+    r'|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)'       # OSC (titre fenêtre...)
+    r'|\x1b[ -/]*[0-Z\\^-~]'                     # ESC simple (charset, DECSC...)
+    r'|[\r\b\x07\x00\x0e\x0f]'
+)
+
+# Une séquence incomplète en fin de chunk est conservée au plus jusqu'à cette taille
+MAX_PENDING = 64
+
+
+@lru_cache(maxsize=512)
+def color_256(index: int) -> str:
+    """Couleur de la palette xterm 256"""
+    if index < 16:
+        return BASIC_COLORS[index]
+    if index < 232:
+        index -= 16
+        levels = (0, 95, 135, 175, 215, 255)
+        r, g, b = levels[index // 36], levels[(index // 6) % 6], levels[index % 6]
+        return f'#{r:02x}{g:02x}{b:02x}'
+    gray = 8 + (index - 232) * 10
+    return f'#{gray:02x}{gray:02x}{gray:02x}'
+
+
+def _parse_color(params: List[int], i: int) -> Tuple[Optional[str], int]:
+    """Couleur étendue 38/48 (;5;n ou ;2;r;g;b), retourne (couleur, index suivant)"""
+    if i + 1 < len(params) and params[i + 1] == 5 and i + 2 < len(params):
+        return color_256(params[i + 2] & 0xff), i + 3
+    if i + 1 < len(params) and params[i + 1] == 2 and i + 4 < len(params):
+        r, g, b = (p & 0xff for p in params[i + 2:i + 5])
+        return f'#{r:02x}{g:02x}{b:02x}', i + 5
+    return None, len(params)
+
+
+@lru_cache(maxsize=1024)
+def apply_sgr(style: tuple, raw_params: str) -> tuple:
+    """Applique une séquence SGR à un style (résultat mis en cache)"""
+    fg, bg, bold, underline = style
+    params = [int(p) if p.isdigit() else 0 for p in raw_params.split(';')] if raw_params else [0]
+
+    i = 0
+    while i < len(params):
+        p = params[i]
+        i += 1
+        if p == 0:
+            fg, bg, bold, underline = DEFAULT_STYLE
+        elif p == 1:
+            bold = True
+        elif p == 22:
+            bold = False
+        elif p == 4:
+            underline = True
+        elif p == 24:
+            underline = False
+        elif 30 <= p <= 37:
+            fg = BASIC_COLORS[p - 30]
+        elif 90 <= p <= 97:
+            fg = BASIC_COLORS[p - 90 + 8]
+        elif p == 39:
+            fg = None
+        elif 40 <= p <= 47:
+            bg = BASIC_COLORS[p - 40]
+        elif 100 <= p <= 107:
+            bg = BASIC_COLORS[p - 100 + 8]
+        elif p == 49:
+            bg = None
+        elif p in (38, 48):
+            color, i = _parse_color(params, i - 1)
+            if p == 38:
+                fg = color
+            else:
+                bg = color
+
+    return (fg, bg, bold, underline)
+
+
+class AnsiParser:
+    """Parser ANSI/VT100 en flux
+
+    Découpe chaque chunk avec une seule regex: le texte entre deux séquences
+    est émis en un bloc, les SGR consécutifs de même style sont fusionnés.
+    Les séquences coupées entre deux chunks sont conservées pour le suivant.
+    """
+
+    def __init__(self):
+        self.style = DEFAULT_STYLE
+        self.pending = ''
+
+    def reset(self):
+        """Réinitialise style et séquence en attente"""
+        self.style = DEFAULT_STYLE
+        self.pending = ''
+
+    def feed(self, data: str) -> Tuple[list, str]:
+        """Traite un chunk, retourne (opérations, texte sans séquences)"""
+        if self.pending:
+            data = self.pending + data
+            self.pending = ''
+        if '\r\n' in data:
+            data = data.replace('\r\n', '\n')
+
+        # Chemin rapide: aucun caractère de contrôle
+        if '\x1b' not in data and '\r' not in data and '\b' not in data:
+            if not data:
+                return [], ''
+            return [(OP_TEXT, data, self.style)], data
+
+        # Séquence potentiellement incomplète en fin de chunk
+        tail = data.rfind('\x1b')
+        if tail >= 0 and len(data) - tail < MAX_PENDING and not _CONTROL_RE.match(data, tail):
+            data, self.pending = data[:tail], data[tail:]
+        elif data.endswith('\r'):
+            data, self.pending = data[:-1], '\r'
+
+        ops = []
+        plain = []
+        text = []
+        style = self.style
+        pos = 0
+
+        for match in _CONTROL_RE.finditer(data):
+            start = match.start()
+            if start > pos:
+                text.append(data[pos:start])
+            pos = match.end()
+
+            token = match.group(0)
+            final = match.group(2)
+
+            if final == 'm':
+                new_style = apply_sgr(style, match.group(1))
+                if new_style != style:
+                    self._flush(ops, plain, text, style)
+                    style = new_style
+                continue
+
+            op = self._control(token, final, match.group(1))
+            if op:
+                self._flush(ops, plain, text, style)
+                ops.append(op)
+
+        if pos < len(data):
+            text.append(data[pos:])
+        self._flush(ops, plain, text, style)
+
+        self.style = style
+        return ops, ''.join(plain)
+
+    @staticmethod
+    def _flush(ops: list, plain: list, text: list, style: tuple):
+        """Émet le texte accumulé en un seul run"""
+        if not text:
+            return
+        chunk = ''.join(text)
+        text.clear()
+        if '\x1b' in chunk:
+            # ESC isolé non reconnu
+            chunk = chunk.replace('\x1b', '')
+        if not chunk:
+            return
+        if ops and ops[-1][0] == OP_TEXT and ops[-1][2] == style:
+            ops[-1] = (OP_TEXT, ops[-1][1] + chunk, style)
+        else:
+            ops.append((OP_TEXT, chunk, style))
+        plain.append(chunk)
+
+    @staticmethod
+    def _control(token: str, final: Optional[str], raw_params: Optional[str]):
+        """Convertit une séquence de contrôle en opération (None = ignorée)"""
+        if final is None:
+            if token == '\r':
+                return (OP_CR,)
+            if token == '\b':
+                return (OP_MOVE, 0, -1)
+            return None
+
+        if raw_params and raw_params.startswith('?'):
+            # Écran alternatif (top, htop, less...)
+            if raw_params[1:] in ('1049', '47', '1047'):
+                return (OP_CLEAR, 2) if final == 'h' else (OP_SCREEN_END,)
+            return None
+
+        params = [int(p) if p.isdigit() else 0 for p in raw_params.split(';')] if raw_params else []
+        n = params[0] if params and params[0] else 1
+
+        if final in 'Hf':
+            row = params[0] - 1 if params and params[0] else 0
+            col = params[1] - 1 if len(params) > 1 and params[1] else 0
+            return (OP_GOTO, row, col)
+        if final == 'J':
+            return (OP_CLEAR, params[0] if params else 0)
+        if final == 'K':
+            return (OP_ERASE_LINE, params[0] if params else 0)
+        if final == 'A':
+            return (OP_MOVE, -n, 0)
+        if final == 'B':
+            return (OP_MOVE, n, 0)
+        if final == 'C':
+            return (OP_MOVE, 0, n)
+        if final == 'D':
+            return (OP_MOVE, 0, -n)
+        return None
+
+
+def strip_ansi(text: str) -> str:
+    """Supprime les séquences ANSI d'un texte complet"""
+    return _CONTROL_RE.sub('', text.replace('\r\n', '\n'))
@@ -0,0 +1,174 @@
+"""
+Binary Stream - Détection des flux binaires (XMODEM, mauvaise vitesse)
+
+Un flux binaire n'a rien à offrir à la détection ni aux modules, et c'est
+quand il arrive au débit maximal qu'il coûte le plus. Le classifieur
+mesure la part d'octets texte sur une fenêtre glissante (deux `translate`
+en C par chunk, plus un décodage UTF-8 s'il y a des octets hauts) avec
+hystérésis: passage en binaire sous BINARY_BELOW, retour au texte
+au-dessus de TEXT_ABOVE. En binaire, le chunk n'est ni décodé ni
+analysé: l'appelant l'affiche en résumé hexadécimal.
+
+Au retour du texte, la fin de la fenêtre qui était déjà du texte (la
+ligne qui a fait basculer) est rendue avec le chunk courant.
+
+    python3 -m core.binary_stream capture.bin
+"""
+import argparse
+import sys
+from collections import deque
+from typing import Optional
+
+from .metrics import METRICS
+
+# Fenêtre glissante (octets) et seuils d'hystérésis (part d'octets texte)
+WINDOW_BYTES = 256
+BINARY_BELOW = 0.75
+TEXT_ABOVE = 0.90
+# Octets minimum dans la fenêtre avant de conclure au binaire (bruit à la mise sous tension)
+MIN_BYTES = 64
+
+# Texte: ASCII imprimable, contrôles de terminal et séquences UTF-8 bien
+# formées (cadres de whiptail/menuconfig, `tree`, CJK); les autres octets
+# ≥ 0x80 comptent pour moitié. Octets aléatoires: ~0,64, texte: ~1,0
+_TEXT_BYTES = bytes(range(0x20, 0x7f)) + b'\t\n\r\x1b\x08\x07'
+_TEXT_SET = frozenset(_TEXT_BYTES)
+_LOW_BYTES = bytes(range(0x80))
+# Colonne ASCII du résumé hexadécimal
+_DUMP_TABLE = bytes(b if 0x20 <= b < 0x7f else 0x2e for b in range(256))
+
+BINARY_BYTES = METRICS.counter('pidebugger_binary_bytes_total',
+                               'Octets reçus en mode binaire (ni décodés ni analysés)')
+BINARY_SWITCHES = METRICS.counter('pidebugger_binary_switches_total',
+                                  'Passages texte ↔ binaire du flux')
+
+
+def text_score(data: bytes) -> float:
+    """Nombre pondéré d'octets texte d'un chunk"""
+    other = len(data.translate(None, _TEXT_BYTES))      # contrôles + octets hauts
+    high = len(data.translate(None, _LOW_BYTES))
+    if not high:
+        return len(data) - other
+    # Octets des séquences UTF-8 valides: ce qui survit au décodage sans les erreurs
+    utf8 = len(data.decode('utf-8', errors='ignore').encode('utf-8')) - (len(data) - high)
+    return len(data) - other + utf8 + (high - utf8) / 2
+
+
+def hex_summary(sample: bytes, total: int, width: int = 16) -> str:
+    """Ligne de résumé: taille de la rafale, premiers octets en hexadécimal et ASCII"""
+    head = sample[:width]
+    hexa = ' '.join(f'{b:02x}' for b in head)
+    return f"[binaire {total} octets] {hexa:<{width * 3 - 1}}  |{head.translate(_DUMP_TABLE).decode('ascii')}|"
+
+
+class BinaryClassifier:
+    """Part d'octets texte sur une fenêtre glissante, avec hystérésis"""
+
+    def __init__(self, window: int = WINDOW_BYTES, binary_below: float = BINARY_BELOW,
+                 text_above: float = TEXT_ABOVE):
+        self.window = window
+        self.binary_below = binary_below
+        self.text_above = text_above
+        self.reset()
+
+    def reset(self):
+        # (octets, score) par chunk, le plus ancien tronqué à la fenêtre
+        self.chunks = deque()
+        self.size = 0
+        self.score = 0.0
+        self.binary = False
+        # Derniers octets reçus en binaire (reprise du texte)
+        self.tail = b''
+        self.switches = 0
+
+    @property
+    def ratio(self) -> float:
+        return self.score / self.size if self.size else 1.0
+
+    def feed(self, data: bytes) -> Optional[bytes]:
+        """Octets à traiter comme texte, None si le flux est binaire"""
+        if not data:
+            return None if self.binary else data
+        size, score = len(data), text_score(data)
+        self.chunks.append((size, score))
+        self.size += size
+        self.score += score
+        excess = self.size - self.window
+        while excess > 0:
+            old_size, old_score = self.chunks[0]
+            if old_size <= excess:
+                self.chunks.popleft()
+                self.size -= old_size
+                self.score -= old_score
+                excess -= old_size
+            else:
+                kept = old_score * (old_size - excess) / old_size
+                self.chunks[0] = (old_size - excess, kept)
+                self.size -= excess
+                self.score -= old_score - kept
+                excess = 0
+
+        ratio = self.ratio
+        if not self.binary:
+            if ratio < self.binary_below and self.size >= MIN_BYTES:
+                self._switch(True)
+                self.tail = data[-self.window:]
+                if METRICS.enabled:
+                    BINARY_BYTES.inc(size)
+                return None
+            return data
+
+        if ratio > self.text_above:
+            self._switch(False)
+            # Texte déjà reçu à la fin de la rafale: rendu avec ce chunk
+            resumed = self.tail[len(self.tail) - _text_run(self.tail):]
+            self.tail = b''
+            return resumed + data
+        self.tail = (self.tail + data)[-self.window:]
+        if METRICS.enabled:
+            BINARY_BYTES.inc(size)
+        return None
+
+    def _switch(self, binary: bool):
+        self.binary = binary
+        self.switches += 1
+        if METRICS.enabled:
+            BINARY_SWITCHES.inc()
+
+
+def _text_run(data: bytes) -> int:
+    """Longueur de la suite d'octets ASCII texte en fin de `data`"""
+    for i in range(len(data) - 1, -1, -1):
+        if data[i] not in _TEXT_SET:
+            return len(data) - 1 - i
+    return len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rafales binaires d'un log brut")
+    parser.add_argument('log')
+    parser.add_argument('--chunk', type=int, default=4096, help="Taille des chunks rejoués")
+    parser.add_argument('--window', type=int, default=WINDOW_BYTES)
+    args = parser.parse_args(argv)
+
+    with open(args.log, 'rb') as f:
+        data = f.read()
+    classifier = BinaryClassifier(args.window)
+    start, sample, binary_bytes = 0, b'', 0
+    for pos in range(0, len(data), args.chunk):
+        chunk = data[pos:pos + args.chunk]
+        was_binary = classifier.binary
+        if classifier.feed(chunk) is None:
+            if not was_binary:
+                start, sample = pos, chunk
+            binary_bytes += len(chunk)
+        elif was_binary:
+            print(f"@{start:<10d} {hex_summary(sample, pos - start)}")
+    if classifier.binary:
+        print(f"@{start:<10d} {hex_summary(sample, len(data) - start)}")
+    print(f"\n{binary_bytes}/{len(data)} octets binaires, {classifier.switches} bascules")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
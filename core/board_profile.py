@@ -0,0 +1,283 @@
+"""
+Board Profile - Environnement U-Boot et bdinfo structurés, en cache par carte
+
+Les réponses `printenv` / `bdinfo` sont analysées par UbootModule, qui les
+publie comme fait matériel (PROFILE_FACT); `ProfileRecorder` les fusionne
+dans le profil de la carte et l'écrit en JSON depuis son propre thread
+(jamais dans le thread GUI ni dans un processus de module). Une variable
+dont la ligne brute n'a pas changé n'est pas ré-analysée.
+"""
+import argparse
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .events import HardwareFact
+
+BOARDS_DIR = os.environ.get(
+    'PIDEBUGGER_BOARDS', os.path.join(os.path.expanduser('~'), '.pidebugger', 'boards'))
+
+# Clé du fait publié par UbootModule à la fin d'une réponse printenv/bdinfo
+PROFILE_FACT = 'board_profile'
+
+HEX_RE = re.compile(r'^(?:0x)?([0-9a-fA-F]+)$')
+ADDRESS_KEY_RE = re.compile(r'(_addr|_addr_r|addr|_size|_start)$')
+
+
+def parse_env_value(key: str, value: str):
+    """Valeur typée d'une variable d'environnement"""
+    if key == 'bootargs':
+        args = {}
+        for token in value.split():
+            name, sep, arg = token.partition('=')
+            args[name] = arg if sep else True
+        return args
+    if key in ('bootcmd', 'altbootcmd', 'preboot') or ';' in value:
+        return [cmd.strip() for cmd in value.split(';') if cmd.strip()]
+    if ADDRESS_KEY_RE.search(key):
+        match = HEX_RE.match(value)
+        if match:
+            return int(match.group(1), 16)
+    if value.isdigit():
+        return int(value)
+    return value
+
+
+def slug(board: str) -> str:
+    return re.sub(r'[^\w.-]+', '_', board).strip('_') or 'unknown'
+
+
+class BoardProfile:
+    """Profil d'une carte: environnement, bdinfo, bancs DRAM"""
+
+    def __init__(self, board: str):
+        self.board = board
+        self.env: Dict[str, str] = {}        # valeurs brutes
+        self.parsed: Dict[str, object] = {}  # valeurs typées
+        self.bdinfo: Dict[str, str] = {}
+        self.dram: List[Dict[str, int]] = []
+        self.updated = 0.0
+        self.dirty = False
+        self.reparsed = 0                    # variables analysées (statistique)
+
+    def set_env(self, key: str, value: str) -> bool:
+        """Met à jour une variable; retourne True si elle a changé"""
+        if self.env.get(key) == value:
+            return False
+        self.env[key] = value
+        self.parsed[key] = parse_env_value(key, value)
+        self.reparsed += 1
+        self.dirty = True
+        return True
+
+    def remove_env(self, keys):
+        for key in keys:
+            self.env.pop(key, None)
+            self.parsed.pop(key, None)
+            self.dirty = True
+
+    def set_bdinfo(self, key: str, value: str):
+        if self.bdinfo.get(key) != value:
+            self.bdinfo[key] = value
+            self.dirty = True
+
+    def set_dram(self, banks: List[Dict[str, int]]):
+        if banks != self.dram:
+            self.dram = banks
+            self.dirty = True
+
+    @property
+    def dram_total(self) -> int:
+        return sum(bank.get('size', 0) for bank in self.dram)
+
+    def to_dict(self) -> dict:
+        return {
+            'board': self.board,
+            'updated': self.updated,
+            'env': self.env,
+            'bdinfo': self.bdinfo,
+            'dram': self.dram,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BoardProfile':
+        profile = cls(data['board'])
+        profile.env = dict(data.get('env', {}))
+        profile.parsed = {k: parse_env_value(k, v) for k, v in profile.env.items()}
+        profile.bdinfo = dict(data.get('bdinfo', {}))
+        profile.dram = list(data.get('dram', []))
+        profile.updated = data.get('updated', 0.0)
+        return profile
+
+
+class BoardStore:
+    """Profils persistés (un JSON par carte), chargés à la demande"""
+
+    def __init__(self, directory: str = BOARDS_DIR):
+        self.directory = directory
+        self.profiles: Dict[str, BoardProfile] = {}
+
+    def path(self, board: str) -> str:
+        return os.path.join(self.directory, f"{slug(board)}.json")
+
+    def get(self, board: str) -> BoardProfile:
+        """Profil d'une carte (créé vide si inconnu)"""
+        profile = self.profiles.get(board)
+        if profile is None:
+            profile = self._load(board) or BoardProfile(board)
+            self.profiles[board] = profile
+        return profile
+
+    def _load(self, board: str) -> Optional[BoardProfile]:
+        path = self.path(board)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return BoardProfile.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Erreur profil carte {path}: {e}")
+            return None
+
+    def save(self, profile: BoardProfile):
+        """Écrit le profil s'il a changé (remplacement atomique)"""
+        if not profile.dirty:
+            return
+        profile.updated = time.time()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(profile.board)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(profile.to_dict(), f, indent=1, sort_keys=True)
+            os.replace(path + '.tmp', path)
+            profile.dirty = False
+        except OSError as e:
+            print(f"Erreur profil carte {profile.board}: {e}")
+
+    def boards(self) -> List[str]:
+        """Cartes connues sur disque"""
+        if not os.path.isdir(self.directory):
+            return []
+        boards = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith('.json'):
+                profile = self._load(name[:-5])
+                if profile:
+                    boards.append(profile.board)
+        return boards
+
+
+class ProfileRecorder:
+    """Persistance des profils publiés par UbootModule (abonné HardwareFact)
+
+    Fait PROFILE_FACT: {'board', 'env' (variables lues), 'full_env'
+    (printenv complet: les autres variables ont disparu), 'bdinfo', 'dram',
+    'renamed_from' (carte nommée après coup par son environnement)}.
+    """
+
+    def __init__(self, store: Optional[BoardStore] = None):
+        self.store = store or BoardStore()
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, name='board-profiles', daemon=True)
+        self.thread.start()
+
+    def subscribe(self, bus):
+        bus.subscribe(HardwareFact, self.on_facts)
+
+    def on_facts(self, events):
+        for event in events:
+            if event.key == PROFILE_FACT:
+                self.queue.put(event.value)
+
+    def _run(self):
+        while True:
+            data = self.queue.get()
+            if data is None:
+                return
+            self.apply(data)
+
+    def apply(self, data: dict) -> BoardProfile:
+        """Fusionne un fait dans le profil de sa carte et l'écrit s'il a changé"""
+        profile = self.store.get(data['board'])
+        renamed = data.get('renamed_from')
+        if renamed:
+            # Données déjà enregistrées sous le nom provisoire
+            previous = self.store.get(renamed)
+            for key, value in previous.bdinfo.items():
+                profile.set_bdinfo(key, value)
+            if previous.dram:
+                profile.set_dram(previous.dram)
+        env = data.get('env')
+        if env is not None:
+            if data.get('full_env'):
+                profile.remove_env(set(profile.env) - set(env))
+            for key, value in env.items():
+                profile.set_env(key, value)
+        for key, value in data.get('bdinfo', {}).items():
+            profile.set_bdinfo(key, value)
+        if 'dram' in data:
+            profile.set_dram(data['dram'])
+        self.store.save(profile)
+        return profile
+
+    def close(self):
+        """Écrit les faits en attente puis arrête le thread"""
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+
+
+def diff(a: BoardProfile, b: BoardProfile) -> dict:
+    """Différences d'environnement, bdinfo et DRAM entre deux cartes"""
+    def compare(x: dict, y: dict) -> dict:
+        return {
+            'added': {k: y[k] for k in sorted(y.keys() - x.keys())},
+            'removed': {k: x[k] for k in sorted(x.keys() - y.keys())},
+            'changed': {k: [x[k], y[k]] for k in sorted(x.keys() & y.keys()) if x[k] != y[k]},
+        }
+
+    return {
+        'env': compare(a.env, b.env),
+        'bdinfo': compare(a.bdinfo, b.bdinfo),
+        'dram': None if a.dram == b.dram else [a.dram, b.dram],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profils de cartes (printenv / bdinfo)")
+    parser.add_argument('--dir', default=BOARDS_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help="Cartes connues")
+    show = sub.add_parser('show', help="Profil d'une carte")
+    show.add_argument('board')
+    show.add_argument('key', nargs='?', help="Variable d'environnement")
+    cmp = sub.add_parser('diff', help="Compare deux cartes")
+    cmp.add_argument('board_a')
+    cmp.add_argument('board_b')
+    args = parser.parse_args(argv)
+
+    store = BoardStore(args.dir)
+    if args.command == 'list':
+        for board in store.boards():
+            profile = store.get(board)
+            print(f"{board:32s} {len(profile.env):4d} variables  "
+                  f"{len(profile.dram)} bancs DRAM  {profile.dram_total / 2**30:.2f} GiB")
+    elif args.command == 'show':
+        profile = store.get(args.board)
+        if args.key:
+            print(profile.env.get(args.key, ''))
+        else:
+            json.dump(profile.to_dict(), sys.stdout, indent=2, sort_keys=True)
+            print()
+    else:
+        json.dump(diff(store.get(args.board_a), store.get(args.board_b)), sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
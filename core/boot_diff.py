@@ -0,0 +1,390 @@
+"""
+Boot Diff - Comparaison de captures de boot alignées par phase de contexte
+
+Chaque capture est découpée en phases par le ContextDetector; les phases
+sont alignées entre captures puis comparées ligne à ligne après
+normalisation (timestamps, adresses, durées). Le diff est un patience
+diff (ancres = lignes uniques, indexées par dictionnaire): quasi linéaire
+sur des logs de centaines de milliers de lignes. Dans un grand trou sans
+ligne unique (logs répétitifs), les ancres sont des suites de 2, 4, 8…
+lignes consécutives uniques des deux côtés. Les captures sont
+segmentées en parallèle, une par processus.
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .ansi import strip_ansi
+from .context_detector import ContextDetector
+from .profiles import load_profiles
+
+# Timestamp dmesg en début de ligne (seule source de durée des phases: les
+# étages de bootloader n'en ont pas)
+DMESG_TS_RE = re.compile(r'^\[\s*(\d+\.\d+)\]')
+
+# Normalisation: ce qui change d'un boot à l'autre sans être une régression
+NORMALIZE = [
+    (re.compile(r'\[\s*\d+\.\d+\]'), '[T]'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '0xX'),
+    (re.compile(r'\b[0-9a-fA-F]{8,}\b'), 'X'),
+    (re.compile(r'\b\d+(\.\d+)?\s*(ms|us|usecs|msecs|ns|s|MiB/s|KiB/s)\b'), 'N\\2'),
+    (re.compile(r'\b\d{1,2}:\d{2}:\d{2}\b'), 'HH:MM:SS'),
+]
+
+# Au-delà, un trou sans ancre unique n'est pas confié à difflib (quadratique)
+SMALL_GAP = 250_000
+# Longueurs des suites de lignes essayées comme ancres dans un tel trou
+WINDOW_SIZES = (2, 4, 8, 16, 32)
+
+
+def _small_diff(a, b, alo, ahi, blo, bhi, out):
+    """Diff fin (difflib) d'un petit trou sans ancre unique"""
+    matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            out.extend(('=', alo + i1 + k, blo + j1 + k) for k in range(i2 - i1))
+        else:
+            out.extend(('-', alo + i, None) for i in range(i1, i2))
+            out.extend(('+', None, blo + j) for j in range(j1, j2))
+
+
+def normalize(line: str) -> str:
+    """Forme comparable d'une ligne"""
+    for regex, repl in NORMALIZE:
+        line = regex.sub(repl, line)
+    return ' '.join(line.split())
+
+
+@dataclass
+class Phase:
+    """Suite de lignes d'un même contexte"""
+    context: str
+    lines: List[str] = field(default_factory=list)
+    keys: List[str] = field(default_factory=list)     # lignes normalisées (clés du diff)
+    times: List[Optional[float]] = field(default_factory=list)
+
+    @property
+    def start(self) -> Optional[float]:
+        return next((t for t in self.times if t is not None), None)
+
+    @property
+    def end(self) -> Optional[float]:
+        return next((t for t in reversed(self.times) if t is not None), None)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.start is None:
+            return None
+        return self.end - self.start
+
+
+def segment(text: str, detector: Optional[ContextDetector] = None) -> List[Phase]:
+    """Découpe une capture en phases de contexte"""
+    detector = detector or ContextDetector()
+    phases = [Phase('unknown')]
+    # Corps de ligne (sans timestamp dmesg) → clé: les logs se répètent
+    keys: Dict[str, str] = {}
+    for raw in strip_ansi(text.replace('\r\n', '\n')).split('\n'):
+        line = raw.rstrip('\r')
+        if not line.strip():
+            continue
+        if detector.update(line):
+            phases.append(Phase(detector.current_context.type.value))
+        phase = phases[-1]
+        phase.lines.append(line)
+        match = DMESG_TS_RE.match(line)
+        body = line[match.end():] if match else line
+        key = keys.get(body)
+        if key is None:
+            key = keys[body] = normalize(body)
+        phase.keys.append(f"[T] {key}" if match else key)
+        phase.times.append(float(match.group(1)) if match else None)
+    return [p for p in phases if p.lines]
+
+
+def patience_diff(a: List[str], b: List[str]) -> List[Tuple[str, Optional[int], Optional[int]]]:
+    """Diff de deux suites de clés: [('=', i, j) | ('-', i, None) | ('+', None, j)]
+
+    Les lignes uniques dans les deux suites servent d'ancres (plus longue
+    sous-suite croissante en O(n log n)); les trous entre ancres sont
+    traités de la même façon, avec une pile explicite (pas de récursion).
+    """
+    out = []
+    # Éléments: (i, j) ligne commune, (alo, ahi, blo, bhi) trou à comparer
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if len(item) == 2:
+            out.append(('=', item[0], item[1]))
+            continue
+        alo, ahi, blo, bhi = item
+
+        # Préfixe / suffixe communs
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            out.append(('=', alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            stack.append((ahi, bhi))
+
+        if alo == ahi or blo == bhi:
+            out.extend(('-', i, None) for i in range(alo, ahi))
+            out.extend(('+', None, j) for j in range(blo, bhi))
+            continue
+
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if not anchors:
+            if (ahi - alo) * (bhi - blo) <= SMALL_GAP:
+                _small_diff(a, b, alo, ahi, blo, bhi, out)
+                continue
+            # Grand trou sans ligne unique (logs répétitifs): ancres sur des
+            # suites de lignes uniques, de plus en plus longues
+            for size in WINDOW_SIZES:
+                anchors = _unique_anchors(a, b, alo, ahi, blo, bhi, size)
+                if anchors:
+                    break
+            else:
+                out.extend(('-', i, None) for i in range(alo, ahi))
+                out.extend(('+', None, j) for j in range(blo, bhi))
+                continue
+
+        items = []
+        prev_i, prev_j = alo, blo
+        for i, j in anchors:
+            items.append((prev_i, i, prev_j, j))
+            items.append((i, j))
+            prev_i, prev_j = i + 1, j + 1
+        items.append((prev_i, ahi, prev_j, bhi))
+        stack.extend(reversed(items))
+
+    return out
+
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi, size: int = 1) -> List[Tuple[int, int]]:
+    """Lignes uniques dans a[alo:ahi] et b[blo:bhi], en ordre croissant commun
+
+    Avec `size` > 1, ce sont des suites de `size` lignes consécutives qui
+    doivent être uniques des deux côtés; chacune donne `size` ancres.
+    """
+    if size == 1:
+        keys_a, keys_b = a[alo:ahi], b[blo:bhi]
+    else:
+        keys_a = list(zip(*(a[alo + k:ahi - size + 1 + k] for k in range(size))))
+        keys_b = list(zip(*(b[blo + k:bhi - size + 1 + k] for k in range(size))))
+    counts_b = Counter(keys_b)
+    unique = {key for key, count in Counter(keys_a).items()
+              if count == 1 and counts_b.get(key) == 1}
+    if not unique:
+        return []
+    in_b = {key: j for j, key in enumerate(keys_b, blo) if key in unique}
+    pairs = [(i, in_b[key]) for i, key in enumerate(keys_a, alo) if key in unique]
+
+    # Plus longue sous-suite croissante sur j (patience sorting)
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_index.append(k)
+        else:
+            tails[pos] = j
+            tail_index[pos] = k
+        previous[k] = tail_index[pos - 1] if pos else -1
+
+    result = []
+    k = tail_index[-1]
+    while k != -1:
+        result.append(pairs[k])
+        k = previous[k]
+    result.reverse()
+    if size == 1:
+        return result
+    # Suites → lignes, sans recouvrement entre suites voisines
+    lines = []
+    last_i = last_j = -1
+    for i, j in result:
+        for offset in range(size):
+            if i + offset > last_i and j + offset > last_j:
+                lines.append((i + offset, j + offset))
+                last_i, last_j = i + offset, j + offset
+    return lines
+
+
+@dataclass
+class PhaseDiff:
+    """Résultat de la comparaison d'une phase"""
+    context: str
+    a: Optional[Phase]
+    b: Optional[Phase]
+    ops: List[Tuple[str, Optional[int], Optional[int]]]
+
+    @property
+    def added(self) -> int:
+        return sum(1 for op in self.ops if op[0] == '+')
+
+    @property
+    def removed(self) -> int:
+        return sum(1 for op in self.ops if op[0] == '-')
+
+    @property
+    def duration_delta(self) -> Optional[float]:
+        if not (self.a and self.b) or self.a.duration is None or self.b.duration is None:
+            return None
+        return self.b.duration - self.a.duration
+
+    def timing_shifts(self, top: int = 5) -> List[Tuple[float, str]]:
+        """Lignes communes dont le timestamp (relatif à la phase) a le plus bougé"""
+        if not (self.a and self.b) or self.a.start is None or self.b.start is None:
+            return []
+        shifts = []
+        start_a, start_b = self.a.start, self.b.start
+        times_a, times_b = self.a.times, self.b.times
+        for tag, i, j in self.ops:
+            if tag != '=':
+                continue
+            ta, tb = times_a[i], times_b[j]
+            if ta is not None and tb is not None:
+                shifts.append(((tb - start_b) - (ta - start_a), self.b.lines[j]))
+        shifts.sort(key=lambda s: abs(s[0]), reverse=True)
+        return shifts[:top]
+
+
+def align_phases(a: List[Phase], b: List[Phase]) -> List[PhaseDiff]:
+    """Aligne les phases de deux captures (par suite de contextes) et les compare"""
+    matcher = difflib.SequenceMatcher(None, [p.context for p in a], [p.context for p in b],
+                                      autojunk=False)
+    diffs = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for pa, pb in zip(a[i1:i2], b[j1:j2]):
+                diffs.append(PhaseDiff(pa.context, pa, pb, patience_diff(pa.keys, pb.keys)))
+            continue
+        for pa in a[i1:i2]:
+            diffs.append(PhaseDiff(pa.context, pa, None,
+                                   [('-', i, None) for i in range(len(pa.lines))]))
+        for pb in b[j1:j2]:
+            diffs.append(PhaseDiff(pb.context, None, pb,
+                                   [('+', None, j) for j in range(len(pb.lines))]))
+    return diffs
+
+
+def _fmt_time(value: Optional[float]) -> str:
+    return f"{value:9.3f}s" if value is not None else f"{'—':>10s}"
+
+
+def report(name_a: str, name_b: str, diffs: List[PhaseDiff], max_lines: int = 20,
+           shifts: int = 5) -> str:
+    """Rapport texte: résumé par phase puis lignes ajoutées/supprimées"""
+    out = [f"=== {name_a} ↔ {name_b} ===",
+           f"{'phase':14s} {'lignes A':>9s} {'lignes B':>9s} {'+':>7s} {'-':>7s}"
+           f" {'durée A':>10s} {'durée B':>10s} {'Δ':>10s}"]
+    for diff in diffs:
+        out.append(
+            f"{diff.context:14s} {len(diff.a.lines) if diff.a else 0:9d}"
+            f" {len(diff.b.lines) if diff.b else 0:9d} {diff.added:7d} {diff.removed:7d}"
+            f" {_fmt_time(diff.a.duration if diff.a else None)}"
+            f" {_fmt_time(diff.b.duration if diff.b else None)}"
+            f" {_fmt_time(diff.duration_delta)}"
+        )
+    if any(d.duration_delta is None for d in diffs):
+        out.append("  — durée inconnue: phase absente ou sans timestamps dmesg (bootrom, ATF, U-Boot),"
+                   " une capture texte ne date pas ses lignes")
+
+    for diff in diffs:
+        changes = [op for op in diff.ops if op[0] != '=']
+        moved = diff.timing_shifts(shifts)
+        if not changes and not any(abs(s) >= 0.001 for s, _ in moved):
+            continue
+        out.append(f"\n--- {diff.context} ---")
+        for tag, i, j in changes[:max_lines]:
+            line = diff.a.lines[i] if tag == '-' else diff.b.lines[j]
+            out.append(f"{tag} {line}")
+        if len(changes) > max_lines:
+            out.append(f"  … {len(changes) - max_lines} autres différences")
+        for shift, line in moved:
+            if abs(shift) >= 0.001:
+                out.append(f"  Δt {shift:+.3f}s  {line}")
+    return '\n'.join(out)
+
+
+def to_dict(diffs: List[PhaseDiff]) -> list:
+    """Résultat sérialisable (JSON)"""
+    return [{
+        'context': d.context,
+        'lines_a': len(d.a.lines) if d.a else 0,
+        'lines_b': len(d.b.lines) if d.b else 0,
+        'added': [d.b.lines[j] for tag, _, j in d.ops if tag == '+'],
+        'removed': [d.a.lines[i] for tag, i, _ in d.ops if tag == '-'],
+        'duration_a': d.a.duration if d.a else None,
+        'duration_b': d.b.duration if d.b else None,
+        'timing_shifts': d.timing_shifts(),
+    } for d in diffs]
+
+
+def read_capture(path: str) -> str:
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        return f.read()
+
+
+def _segment_file(path: str, profiles_dir: Optional[str] = None) -> List[Phase]:
+    """Segmente une capture (exécuté dans un processus de travail)"""
+    detector = ContextDetector()
+    if profiles_dir:
+        detector.apply_profile(load_profiles(profiles_dir))
+    return segment(read_capture(path), detector)
+
+
+def segment_files(paths: List[str], profiles_dir: Optional[str] = None,
+                  jobs: Optional[int] = None) -> List[List[Phase]]:
+    """Segmente plusieurs captures, en parallèle si plusieurs CPU"""
+    jobs = min(len(paths), jobs or os.cpu_count() or 1)
+    if jobs <= 1:
+        return [_segment_file(path, profiles_dir) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_segment_file, paths, [profiles_dir] * len(paths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare des captures de boot (la première sert de référence)")
+    parser.add_argument('captures', nargs='+', help="Captures (référence en premier)")
+    parser.add_argument('--max-lines', type=int, default=20, help="Différences affichées par phase")
+    parser.add_argument('--shifts', type=int, default=5, help="Décalages temporels affichés par phase")
+    parser.add_argument('--json', action='store_true', help="Sortie JSON")
+    parser.add_argument('--profiles', help="Dossier de profils (défaut: patterns intégrés)")
+    parser.add_argument('--jobs', type=int, help="Processus de segmentation (défaut: nb CPU)")
+    args = parser.parse_args(argv)
+
+    if len(args.captures) < 2:
+        parser.error("au moins deux captures")
+
+    phases = segment_files(args.captures, args.profiles, args.jobs)
+    documents = {}
+    for path, other in zip(args.captures[1:], phases[1:]):
+        diffs = align_phases(phases[0], other)
+        if args.json:
+            documents[path] = to_dict(diffs)
+        else:
+            print(report(args.captures[0], path, diffs, args.max_lines, args.shifts))
+            print()
+
+    if args.json:
+        json.dump(documents, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Boot Timeline - Chronologie du boot kernel d'après les timestamps dmesg
+
+Alimentée ligne à ligne par LinuxModule: initcalls (initcall_debug),
+probes de drivers et fenêtres d'activité des drivers. Rendu en cascade
+des éléments les plus lents, export CSV / JSON / Chrome trace (Perfetto).
+"""
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, List, Optional
+
+# Types d'événements
+KIND_INITCALL = 'initcall'
+KIND_PROBE = 'probe'
+KIND_DRIVER = 'driver'      # première → dernière ligne d'un driver (approximatif)
+
+
+class TimelineEvent:
+    """Intervalle de la chronologie (secondes depuis le démarrage kernel)"""
+    __slots__ = ('kind', 'name', 'start', 'duration', 'result')
+
+    def __init__(self, kind: str, name: str, start: float, duration: float, result: int = 0):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.result = result
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    def to_dict(self) -> dict:
+        return {'kind': self.kind, 'name': self.name, 'start': self.start,
+                'duration': self.duration, 'result': self.result}
+
+
+class BootTimeline:
+    """Chronologie d'un boot, construite en flux
+
+    Un timestamp qui recule (retour à 0) démarre un nouveau boot; le
+    précédent est conservé dans `previous`.
+    """
+
+    def __init__(self):
+        self.events: List[TimelineEvent] = []
+        self.drivers: Dict[str, TimelineEvent] = {}
+        self.last_ts = 0.0
+        self.previous: Optional['BootTimeline'] = None
+
+    def reset(self):
+        """Nouveau boot"""
+        snapshot = BootTimeline()
+        snapshot.events, snapshot.drivers, snapshot.last_ts = self.events, self.drivers, self.last_ts
+        self.previous = snapshot
+        self.events = []
+        self.drivers = {}
+        self.last_ts = 0.0
+
+    def timestamp(self, ts: float):
+        """Timestamp dmesg d'une ligne"""
+        if ts + 1.0 < self.last_ts:
+            self.reset()
+        self.last_ts = max(self.last_ts, ts)
+
+    def add(self, kind: str, name: str, end_ts: float, usecs: int, result: int = 0) -> TimelineEvent:
+        """Élément terminé à `end_ts` après `usecs` µs"""
+        duration = usecs / 1e6
+        event = TimelineEvent(kind, name, max(end_ts - duration, 0.0), duration, result)
+        self.events.append(event)
+        return event
+
+    def driver_line(self, driver: str, ts: float):
+        """Ligne d'un driver: étend sa fenêtre d'activité"""
+        event = self.drivers.get(driver)
+        if event is None:
+            self.drivers[driver] = TimelineEvent(KIND_DRIVER, driver, ts, 0.0)
+        else:
+            event.duration = max(event.duration, ts - event.start)
+
+    def all_events(self) -> List[TimelineEvent]:
+        return self.events + [e for e in self.drivers.values() if e.duration > 0]
+
+    @property
+    def end(self) -> float:
+        return self.last_ts
+
+    def slowest(self, top: int = 30, kinds=None) -> List[TimelineEvent]:
+        """Éléments les plus longs, dans l'ordre chronologique"""
+        events = [e for e in self.all_events() if kinds is None or e.kind in kinds]
+        events = sorted(events, key=lambda e: e.duration, reverse=True)[:top]
+        return sorted(events, key=lambda e: e.start)
+
+    def waterfall(self, top: int = 30, width: int = 60, kinds=None) -> str:
+        """Cascade texte des éléments les plus lents"""
+        events = self.slowest(top, kinds)
+        if not events:
+            return "Aucun timestamp kernel / initcall_debug"
+        span = max(self.end, max(e.end for e in events)) or 1.0
+        lines = [f"{'début s':>9s} {'durée ms':>9s} {'type':8s} {'nom':36s} 0{' ' * (width - 2)}{span:.2f}s"]
+        for event in events:
+            first = int(event.start / span * width)
+            length = max(int(event.duration / span * width), 1)
+            bar = ' ' * first + '█' * length
+            flag = '' if event.result == 0 else f'  ⚠ {event.result}'
+            lines.append(f"{event.start:9.3f} {event.duration * 1000:9.1f} {event.kind:8s}"
+                         f" {event.name[:36]:36s} |{bar:{width}s}|{flag}")
+        return '\n'.join(lines)
+
+    def export_csv(self, path: str):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'name', 'start_s', 'duration_ms', 'result'])
+            for e in sorted(self.all_events(), key=lambda e: e.start):
+                writer.writerow([e.kind, e.name, f"{e.start:.6f}", f"{e.duration * 1000:.3f}", e.result])
+
+    def export_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'end': self.end,
+                       'events': [e.to_dict() for e in sorted(self.all_events(), key=lambda e: e.start)]},
+                      f, indent=1)
+
+    def export_trace(self, path: str):
+        """Format Chrome trace (chrome://tracing, ui.perfetto.dev)"""
+        tids = {KIND_INITCALL: 1, KIND_PROBE: 2, KIND_DRIVER: 3}
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': kind}}
+                 for kind, tid in tids.items()]
+        for e in self.all_events():
+            trace.append({'name': e.name, 'cat': e.kind, 'ph': 'X', 'pid': 1, 'tid': tids[e.kind],
+                          'ts': round(e.start * 1e6), 'dur': max(round(e.duration * 1e6), 1),
+                          'args': {'result': e.result}})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+
+    def export(self, path: str):
+        """Export selon l'extension (.csv, .trace.json, .json)"""
+        if path.endswith('.csv'):
+            self.export_csv(path)
+        elif path.endswith('.trace.json'):
+            self.export_trace(path)
+        else:
+            self.export_json(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cascade du boot kernel depuis une capture")
+    parser.add_argument('capture', help="Fichier de log console")
+    parser.add_argument('--top', type=int, default=30)
+    parser.add_argument('--kind', action='append', choices=[KIND_INITCALL, KIND_PROBE, KIND_DRIVER])
+    parser.add_argument('--export', action='append', default=[],
+                        help="Fichier .csv, .json ou .trace.json (Perfetto)")
+    args = parser.parse_args(argv)
+
+    from .pipeline import ConsolePipeline
+
+    pipeline = ConsolePipeline()
+    pipeline.manager.load_module('linux_module')
+    with open(args.capture, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        pipeline.feed(f.read())
+    pipeline.finish()
+
+    timeline = pipeline.manager.loaded_modules['linux_module'].timeline
+    print(timeline.waterfall(args.top, kinds=args.kind))
+    for path in args.export:
+        timeline.export(path)
+        print(f"Export: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,534 @@
+"""
+Bridge - Export des UART locaux en TCP brut / RFC 2217 vers plusieurs clients
+
+Un port exporté peut aussi l'être localement: pseudo-terminal (picocom,
+lrzsz, harnais de test ouvrent le pty comme un UART) et socket Unix. Tous
+les clients partagent le même hub: RX diffusé à chacun, TX de chacun écrit
+sur le port.
+"""
+import argparse
+import os
+import queue
+import selectors
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from .metrics import METRICS
+
+try:
+    import serial
+    import serial.rfc2217
+    SERIAL_AVAILABLE = True
+except ImportError:
+    SERIAL_AVAILABLE = False
+
+# Données en attente max par client avant de jeter les plus anciennes
+CLIENT_BUFFER_LIMIT = 1024 * 1024
+
+BRIDGE_CLIENTS = METRICS.gauge('pidebugger_bridge_clients', 'Clients connectés au bridge', ('port',))
+BRIDGE_DROPPED = METRICS.counter('pidebugger_bridge_dropped_bytes_total',
+                                 'Octets jetés pour des clients trop lents', ('port',))
+
+
+class FanoutClient:
+    """Client d'un hub: file bornée de chunks partagés (pas de copie)"""
+
+    def __init__(self, name: str, limit: int = CLIENT_BUFFER_LIMIT, escape_iac: bool = False):
+        self.name = name
+        self.limit = limit
+        self.escape_iac = escape_iac  # Telnet/RFC 2217: doubler les 0xFF
+        self.queue = deque()
+        self.queued = 0
+        self.offset = 0          # octets déjà envoyés du premier chunk
+        self.dropped = 0
+
+    def push(self, chunk: bytes, raw: bool = False) -> int:
+        """Ajoute un chunk, retourne le nombre d'octets jetés"""
+        if self.escape_iac and not raw and b'\xff' in chunk:
+            chunk = chunk.replace(b'\xff', b'\xff\xff')
+        self.queue.append(chunk)
+        self.queued += len(chunk)
+
+        dropped = 0
+        # Client trop lent: on jette les chunks les plus anciens
+        while self.queued > self.limit and len(self.queue) > 1:
+            old = self.queue.popleft()
+            lost = len(old) - self.offset
+            self.queued -= lost
+            self.offset = 0
+            dropped += lost
+        self.dropped += dropped
+        return dropped
+
+    def pending(self) -> Optional[memoryview]:
+        """Vue sur les données restant à envoyer du premier chunk"""
+        if not self.queue:
+            return None
+        return memoryview(self.queue[0])[self.offset:]
+
+    def consume(self, sent: int):
+        """Marque `sent` octets du premier chunk comme envoyés"""
+        self.offset += sent
+        self.queued -= sent
+        if self.offset >= len(self.queue[0]):
+            self.queue.popleft()
+            self.offset = 0
+
+
+class FanoutHub:
+    """Diffusion d'un flux à plusieurs clients
+
+    Le même objet bytes est référencé par chaque file client; un client
+    lent ne bloque jamais les autres, il perd ses données les plus anciennes.
+    """
+
+    def __init__(self, name: str, limit: int = CLIENT_BUFFER_LIMIT):
+        self.name = name
+        self.limit = limit
+        self.clients: List[FanoutClient] = []
+        self.lock = threading.Lock()
+        self.on_data = None      # réveil de la boucle d'envoi
+
+    def add_client(self, name: str, escape_iac: bool = False) -> FanoutClient:
+        client = FanoutClient(name, self.limit, escape_iac)
+        with self.lock:
+            self.clients.append(client)
+            BRIDGE_CLIENTS.set(len(self.clients), self.name)
+        return client
+
+    def remove_client(self, client: FanoutClient):
+        with self.lock:
+            if client in self.clients:
+                self.clients.remove(client)
+            BRIDGE_CLIENTS.set(len(self.clients), self.name)
+
+    def publish(self, chunk: bytes):
+        """Diffuse un chunk à tous les clients"""
+        dropped = 0
+        with self.lock:
+            for client in self.clients:
+                dropped += client.push(chunk)
+        if dropped and METRICS.enabled:
+            BRIDGE_DROPPED.inc(dropped, self.name)
+        if self.on_data:
+            self.on_data()
+
+
+class _QueueConnection:
+    """Connexion vue par PortManager RFC 2217: écrit dans la file du client"""
+
+    def __init__(self, hub: FanoutHub, client: FanoutClient, wake):
+        self.hub = hub
+        self.client = client
+        self.wake = wake
+
+    def write(self, data: bytes):
+        # Négociation Telnet: déjà encodée, pas d'échappement
+        with self.hub.lock:
+            self.client.push(bytes(data), raw=True)
+        self.wake()
+
+
+class ExportedPort:
+    """UART exporté: lecture série → hub, clients → écriture série"""
+
+    def __init__(self, serial_port, tcp_port: Optional[int], rfc2217: bool = False):
+        self.serial = serial_port
+        self.tcp_port = tcp_port
+        self.rfc2217 = rfc2217
+        self.hub = FanoutHub(getattr(serial_port, 'port', None) or str(tcp_port))
+        self.listener: Optional[socket.socket] = None
+        self.unix_listener: Optional[socket.socket] = None
+        self.unix_path: Optional[str] = None
+        self.pty_path: Optional[str] = None
+        self.pty_link: Optional[str] = None
+        self.reader: Optional[threading.Thread] = None
+        self.read = True            # False: port lu ailleurs (GUI) qui publie dans le hub
+        self.write_lock = threading.Lock()
+
+    def write(self, data: bytes):
+        """Écriture série (plusieurs clients peuvent émettre)"""
+        with self.write_lock:
+            self.serial.write(data)
+
+
+class _PtyEndpoint:
+    """Côté maître d'un pseudo-terminal, vu comme une socket par la boucle
+
+    Le côté esclave reste ouvert par le bridge: un client qui ferme le pty
+    ne provoque pas d'EIO, le suivant le rouvre simplement.
+    """
+
+    def __init__(self):
+        import tty                      # POSIX: le bridge TCP reste importable ailleurs
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.path = os.ttyname(self.slave)
+
+    def fileno(self) -> int:
+        return self.master
+
+    def send(self, data) -> int:
+        try:
+            return os.write(self.master, data)
+        except BlockingIOError:
+            # Tampon du pty plein (personne ne lit): réessayé au prochain tour
+            return 0
+
+    def recv(self, size: int) -> bytes:
+        return os.read(self.master, size)
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+
+class Loopback:
+    """Port série virtuel: ce qui est écrit est relu, plus les données injectées
+
+    Permet de tester un export (pty, socket) sans matériel ni pyserial.
+    """
+    port = 'loop'
+
+    def __init__(self):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.is_open = True
+
+    @property
+    def in_waiting(self) -> int:
+        return self.queue.qsize()
+
+    def read(self, size: int = 1) -> bytes:
+        try:
+            data = self.queue.get(timeout=0.1)
+        except queue.Empty:
+            return b''
+        while len(data) < size and not self.queue.empty():
+            data += self.queue.get_nowait()
+        return data
+
+    def write(self, data: bytes) -> int:
+        self.queue.put(bytes(data))
+        return len(data)
+
+    inject = write
+
+    def close(self):
+        self.is_open = False
+
+
+class _Connection:
+    """Client (TCP, Unix ou pty) connecté à un port exporté"""
+
+    def __init__(self, sock: socket.socket, port: ExportedPort, client: FanoutClient):
+        self.sock = sock
+        self.port = port
+        self.client = client
+        self.manager = None      # PortManager RFC 2217
+
+
+class BridgeServer:
+    """Serveur headless exportant des UART en TCP (brut ou RFC 2217)
+
+    Une boucle `selectors` gère accept/lecture/écriture de tous les clients;
+    un thread par UART lit le port et publie dans son hub. Accepte tout
+    objet de type pyserial (`loop://`, `socket://`...) pour les tests.
+    """
+
+    def __init__(self, bind: str = '127.0.0.1'):
+        self.bind = bind
+        self.ports: List[ExportedPort] = []
+        self.connections: Dict[socket.socket, _Connection] = {}
+        self.selector = selectors.DefaultSelector()
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+    def add_port(self, serial_port, tcp_port: Optional[int] = 0, rfc2217: bool = False,
+                 read: bool = True) -> ExportedPort:
+        """Exporte un port série sur un port TCP (0 = éphémère, None = pas de TCP)
+
+        `read=False`: le port est déjà lu ailleurs (GUI), qui publie lui-même
+        dans `exported.hub`.
+        """
+        if rfc2217 and not SERIAL_AVAILABLE:
+            raise RuntimeError("RFC 2217 nécessite pyserial")
+        exported = ExportedPort(serial_port, tcp_port, rfc2217)
+        exported.hub.on_data = self.wake
+        exported.read = read
+
+        if tcp_port is not None:
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((self.bind, tcp_port))
+            listener.listen(16)
+            listener.setblocking(False)
+            exported.listener = listener
+            exported.tcp_port = listener.getsockname()[1]
+
+        self.ports.append(exported)
+        return exported
+
+    def add_unix(self, exported: ExportedPort, path: str):
+        """Socket Unix locale (flux brut, plusieurs clients)"""
+        if os.path.exists(path):
+            os.unlink(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(16)
+        listener.setblocking(False)
+        exported.unix_listener = listener
+        exported.unix_path = path
+        if self.running:
+            self.selector.register(listener, selectors.EVENT_READ, ('accept', (exported, listener)))
+            self.wake()
+
+    def add_pty(self, exported: ExportedPort, link: Optional[str] = None) -> str:
+        """Pseudo-terminal miroir du port (lien symbolique stable optionnel)"""
+        endpoint = _PtyEndpoint()
+        exported.pty_path = endpoint.path
+        if link:
+            if os.path.islink(link):
+                os.unlink(link)
+            os.symlink(endpoint.path, link)
+            exported.pty_link = link
+        client = exported.hub.add_client(f"pty {endpoint.path}")
+        conn = _Connection(endpoint, exported, client)
+        self.connections[endpoint] = conn
+        if self.running:
+            self.selector.register(endpoint, selectors.EVENT_READ, ('client', conn))
+            self.wake()
+        return endpoint.path
+
+    def wake(self):
+        """Réveille la boucle (nouvelles données à envoyer)"""
+        try:
+            self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def start(self):
+        """Démarre la boucle réseau et les lecteurs série"""
+        self.running = True
+        self.selector.register(self._wake_r, selectors.EVENT_READ, ('wake', None))
+        for conn in self.connections.values():
+            self.selector.register(conn.sock, selectors.EVENT_READ, ('client', conn))
+        for exported in self.ports:
+            for listener in (exported.listener, exported.unix_listener):
+                if listener:
+                    self.selector.register(listener, selectors.EVENT_READ, ('accept', (exported, listener)))
+            if exported.read:
+                exported.reader = threading.Thread(target=self._read_serial, args=(exported,), daemon=True)
+                exported.reader.start()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Arrête le serveur et ferme les sockets"""
+        self.running = False
+        self.wake()
+        if self.thread:
+            self.thread.join(timeout=2)
+        for conn in list(self.connections.values()):
+            self._close(conn)
+        for exported in self.ports:
+            for listener in (exported.listener, exported.unix_listener):
+                if listener:
+                    listener.close()
+            for path in (exported.unix_path, exported.pty_link):
+                if path and os.path.lexists(path):
+                    os.unlink(path)
+        self.selector.close()
+
+    def _read_serial(self, exported: ExportedPort):
+        """Thread lecture série → hub"""
+        ser = exported.serial
+        while self.running:
+            try:
+                data = ser.read(ser.in_waiting or 1)
+            except Exception as e:
+                print(f"Erreur {exported.hub.name}: {e}")
+                time.sleep(1)
+                continue
+            if data:
+                exported.hub.publish(bytes(data))
+
+    def _loop(self):
+        """Boucle selectors: accept, lecture clients, envoi des files"""
+        while self.running:
+            # Intérêt en écriture seulement pour les clients avec données en attente
+            for sock, conn in list(self.connections.items()):
+                events = selectors.EVENT_READ
+                if conn.client.queue:
+                    events |= selectors.EVENT_WRITE
+                try:
+                    self.selector.modify(sock, events, ('client', conn))
+                except (KeyError, ValueError):
+                    pass
+
+            for key, mask in self.selector.select(timeout=0.5):
+                kind, obj = key.data
+                if kind == 'wake':
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                elif kind == 'accept':
+                    self._accept(*obj)
+                else:
+                    if mask & selectors.EVENT_READ:
+                        self._receive(obj)
+                    if mask & selectors.EVENT_WRITE and obj.sock in self.connections:
+                        self._send(obj)
+
+    def _accept(self, exported: ExportedPort, listener: socket.socket):
+        try:
+            sock, addr = listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        if listener is exported.unix_listener:
+            # Socket Unix: flux brut, jamais RFC 2217
+            client = exported.hub.add_client(f"unix {exported.unix_path}")
+            conn = _Connection(sock, exported, client)
+            self.connections[sock] = conn
+            self.selector.register(sock, selectors.EVENT_READ, ('client', conn))
+            return
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        client = exported.hub.add_client(f"{addr[0]}:{addr[1]}", escape_iac=exported.rfc2217)
+        conn = _Connection(sock, exported, client)
+        if exported.rfc2217:
+            conn.manager = serial.rfc2217.PortManager(
+                exported.serial, _QueueConnection(exported.hub, client, self.wake))
+
+        self.connections[sock] = conn
+        self.selector.register(sock, selectors.EVENT_READ, ('client', conn))
+
+    def _receive(self, conn: _Connection):
+        """Données d'un client → port série (filtrées en RFC 2217)"""
+        try:
+            data = conn.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._close(conn)
+            return
+
+        if conn.manager:
+            data = b''.join(conn.manager.filter(data))
+        if data:
+            conn.port.write(data)
+
+    def _send(self, conn: _Connection):
+        """Envoie la file d'un client sans copie (memoryview)"""
+        client = conn.client
+        with conn.port.hub.lock:
+            while True:
+                view = client.pending()
+                if view is None:
+                    return
+                try:
+                    sent = conn.sock.send(view)
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError:
+                    break
+                client.consume(sent)
+                if sent < len(view):
+                    return
+        self._close(conn)
+
+    def _close(self, conn: _Connection):
+        self.connections.pop(conn.sock, None)
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        conn.sock.close()
+        conn.port.hub.remove_client(conn.client)
+
+
+def parse_export(spec: str):
+    """'/dev/ttyUSB0:5000' → ('/dev/ttyUSB0', 5000), '/dev/ttyUSB0' → ('/dev/ttyUSB0', None)
+
+    Un suffixe qui n'est pas un port TCP (`/dev/ttyUSB0:50a0`) est refusé,
+    sauf si la spec entière désigne un port (URL pyserial, chemin existant).
+    """
+    device, _, tcp_port = spec.rpartition(':')
+    if device and tcp_port.isdigit():
+        if int(tcp_port) > 65535:
+            raise argparse.ArgumentTypeError(f"port TCP invalide: {spec}")
+        return device, int(tcp_port)
+    if device and '://' not in spec and not os.path.exists(spec):
+        raise argparse.ArgumentTypeError(f"port TCP invalide: {spec} (attendu PORT:TCP)")
+    return spec, None
+
+
+def local_paths(directory: str, device: str):
+    """Lien du pty et socket Unix d'un port: <dir>/<port>.pty, <dir>/<port>.sock"""
+    from .session_log import port_slug
+    slug = port_slug(device)
+    return os.path.join(directory, f"{slug}.pty"), os.path.join(directory, f"{slug}.sock")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Exporte des UART locaux en TCP (socket://) ou RFC 2217 (rfc2217://)")
+    parser.add_argument('exports', nargs='+', type=parse_export,
+                        help="PORT:TCP, ex: /dev/ttyUSB0:5000 (PORT seul: local uniquement, "
+                             "'loop': boucle locale sans matériel)")
+    parser.add_argument('--baud', type=int, default=115200)
+    parser.add_argument('--bind', default='0.0.0.0')
+    parser.add_argument('--rfc2217', action='store_true', help="Protocole RFC 2217 (sinon TCP brut)")
+    parser.add_argument('--pty', action='store_true', help="Exporte aussi chaque port sur un pty")
+    parser.add_argument('--unix', action='store_true', help="Exporte aussi chaque port sur une socket Unix")
+    parser.add_argument('--dir', default='/tmp', help="Dossier des liens pty et sockets Unix")
+    args = parser.parse_args(argv)
+
+    if not (args.pty or args.unix) and any(tcp_port is None for _, tcp_port in args.exports):
+        parser.error("PORT sans TCP: ajouter --pty ou --unix (sinon rien n'est exporté)")
+    if not SERIAL_AVAILABLE and any(device != 'loop' for device, _ in args.exports):
+        print("⚠️  pyserial non installé")
+        return 1
+
+    server = BridgeServer(args.bind)
+    for device, tcp_port in args.exports:
+        if device == 'loop':
+            ser = Loopback()
+        else:
+            ser = serial.serial_for_url(device, args.baud, timeout=0.1)
+        exported = server.add_port(ser, tcp_port, args.rfc2217)
+        if tcp_port is not None:
+            scheme = 'rfc2217' if args.rfc2217 else 'socket'
+            print(f"🔌 {device} → {scheme}://{args.bind}:{exported.tcp_port}")
+        link, sock = local_paths(args.dir, device)
+        if args.pty:
+            print(f"🔌 {device} → {server.add_pty(exported, link)} ({link})")
+        if args.unix:
+            server.add_unix(exported, sock)
+            print(f"🔌 {device} → unix:{sock}")
+
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
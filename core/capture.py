@@ -0,0 +1,345 @@
+"""
+Capture - Enregistrement déclenché autour des alertes et transitions
+
+Chaque port garde en mémoire un anneau des derniers octets reçus (8 Mo par
+défaut); rien n'est écrit sur disque tant qu'aucun déclencheur ne se
+produit. Déclencheurs: transition vers un contexte choisi, ligne qui
+correspond à une regex (option ou `capture_patterns` d'un module), alerte
+de module. Une capture contient `pre_bytes` avant le déclencheur et
+`post_bytes` après; les déclencheurs rapprochés prolongent la même capture.
+
+Les fenêtres sont passées au thread d'écriture en memoryview de l'anneau
+(aucune copie). L'anneau doit donc rester plus grand que le retard de ce
+thread: une fenêtre écrasée pendant l'écriture est marquée `torn` dans
+l'index `<port>.captures.jsonl`.
+
+    python3 -m core.capture boot.log -o captures --trigger-re 'Kernel panic'
+"""
+import argparse
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+from .events import ContextChanged, LineReceived, Alert
+from .metrics import METRICS
+from .regex_safety import UnsafePattern, compile_pattern
+from .session_log import port_slug
+
+# Mémoire par port et fenêtres par défaut
+RING_BYTES = 8 * 2**20
+PRE_BYTES = 256 * 1024
+POST_BYTES = 256 * 1024
+# Fermeture d'une fenêtre après déclencheur même si le port se tait
+POST_SECONDS = 10.0
+# Transitions qui déclenchent par défaut (retour en BootROM = reset)
+TRIGGER_CONTEXTS = ('bootrom',)
+
+CAPTURES = METRICS.counter('pidebugger_captures_total',
+                           'Captures déclenchées écrites', ('port', 'reason'))
+CAPTURE_BYTES = METRICS.counter('pidebugger_capture_bytes_total',
+                                'Octets écrits par les captures', ('port',))
+
+
+class Ring:
+    """Anneau d'octets à positions absolues (octets reçus depuis l'ouverture)"""
+    __slots__ = ('size', 'buffer', 'view', 'end')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.end = 0
+
+    @property
+    def start(self) -> int:
+        """Plus ancienne position encore en mémoire"""
+        return max(0, self.end - self.size)
+
+    def write(self, data: bytes):
+        size = self.size
+        count = len(data)
+        chunk = data if count < size else memoryview(data)[count - size:]
+        pos = (self.end + count - len(chunk)) % size
+        first = min(len(chunk), size - pos)
+        # Affectations de même longueur: le bytearray n'est jamais
+        # redimensionné, les memoryview en attente d'écriture restent valides
+        self.buffer[pos:pos + first] = chunk[:first]
+        if first < len(chunk):
+            self.buffer[:len(chunk) - first] = chunk[first:]
+        self.end += count
+
+    def slices(self, start: int, end: int) -> List[memoryview]:
+        """Vues (une ou deux) sur [start, end), bornées au contenu en mémoire"""
+        start = max(start, self.start)
+        end = min(end, self.end)
+        if start >= end:
+            return []
+        size = self.size
+        pos = start % size
+        length = end - start
+        if pos + length <= size:
+            return [self.view[pos:pos + length]]
+        return [self.view[pos:], self.view[:length - (size - pos)]]
+
+
+class _Window:
+    """Capture ouverte: bornes dans le flux et déclencheurs reçus"""
+    __slots__ = ('start', 'end', 'deadline', 'triggers')
+
+    def __init__(self, start: int, end: int, deadline: float):
+        self.start = start
+        self.end = end
+        self.deadline = deadline
+        self.triggers: List[dict] = []
+
+
+class TriggerCapture:
+    """Anneau d'un port + captures déclenchées, écrites par un thread
+
+    `write()` (thread de lecture série) ne fait qu'une copie dans l'anneau;
+    `fire()` (thread GUI ou pipeline) ouvre ou prolonge une fenêtre.
+    """
+
+    def __init__(self, directory: str, port: str, ring_bytes: int = RING_BYTES,
+                 pre_bytes: int = PRE_BYTES, post_bytes: int = POST_BYTES,
+                 post_seconds: float = POST_SECONDS):
+        self.directory = directory
+        self.port = port
+        self.slug = port_slug(port)
+        self.ring = Ring(ring_bytes)
+        # Une fenêtre ne dépasse pas la moitié de l'anneau: l'autre moitié
+        # laisse au thread d'écriture le temps de la recopier
+        self.max_window = ring_bytes // 2
+        self.pre_bytes = min(pre_bytes, self.max_window // 2)
+        self.post_bytes = min(post_bytes, self.max_window // 2)
+        self.post_seconds = post_seconds
+
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, f"{self.slug}.captures.jsonl")
+
+        self.lock = threading.Lock()
+        # horodatage de chunk → fin du chunk dans le flux (pour fire())
+        self.chunk_ends: OrderedDict = OrderedDict()
+        self.window: Optional[_Window] = None
+        self.written = 0
+
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def write(self, data: bytes, timestamp: float) -> int:
+        """Ajoute un chunk à l'anneau, retourne sa position dans le flux"""
+        with self.lock:
+            offset = self.ring.end
+            self.ring.write(data)
+            self.chunk_ends[timestamp] = self.ring.end
+            if len(self.chunk_ends) > 4096:
+                self.chunk_ends.popitem(last=False)
+            window = self.window
+            if window and (self.ring.end >= window.end or timestamp >= window.deadline):
+                self._close_window()
+        return offset
+
+    def fire(self, reason: str, detail: str = '', timestamp: Optional[float] = None):
+        """Déclencheur à la fin du chunk horodaté (ou à la position courante)"""
+        now = time.time()
+        with self.lock:
+            offset = self.chunk_ends.get(timestamp, self.ring.end)
+            window = self.window
+            if window and offset + self.post_bytes - window.start > self.max_window:
+                self._close_window()
+                window = None
+            if window is None:
+                window = self.window = _Window(
+                    max(offset - self.pre_bytes, self.ring.start, 0),
+                    offset + self.post_bytes, now + self.post_seconds)
+            else:
+                window.end = max(window.end, offset + self.post_bytes)
+                window.deadline = now + self.post_seconds
+            window.triggers.append({'reason': reason, 'detail': detail[:200],
+                                    't': timestamp or now, 'goff': offset})
+
+    def poll(self, now: Optional[float] = None):
+        """Ferme une fenêtre échue sur un port silencieux"""
+        now = now or time.time()
+        with self.lock:
+            if self.window and now >= self.window.deadline:
+                self._close_window()
+
+    def close(self):
+        """Écrit la fenêtre ouverte (tronquée) et arrête le thread"""
+        with self.lock:
+            if self.window:
+                self._close_window()
+        self.queue.put(None)
+        self.thread.join()
+
+    def _close_window(self):
+        """Passe la fenêtre au thread d'écriture (appelé sous le verrou)"""
+        window, self.window = self.window, None
+        window.end = min(window.end, self.ring.end)
+        self.queue.put((window, self.ring.slices(window.start, window.end)))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            window, slices = item
+            try:
+                self._write_capture(window, slices)
+            except OSError as e:
+                print(f"Erreur capture {self.port}: {e}")
+
+    def _write_capture(self, window: _Window, slices: List[memoryview]):
+        first = window.triggers[0]
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(first['t']))
+        reason = re.sub(r'[^\w.-]+', '_', first['reason'])
+        name = f"{self.slug}-{stamp}-{window.start}-{reason}.log"
+        size = 0
+        with open(os.path.join(self.directory, name), 'wb') as f:
+            for view in slices:
+                f.write(view)
+                size += len(view)
+        with self.lock:
+            # Début de fenêtre réécrit par le lecteur pendant la copie
+            torn = self.ring.start > window.start
+        self.written += 1
+
+        entry = {'type': 'capture', 'file': name, 'port': self.port, 't': first['t'],
+                 'goff': window.start, 'len': size, 'torn': torn,
+                 'triggers': window.triggers}
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+        if METRICS.enabled:
+            CAPTURES.inc(1, self.port, first['reason'])
+            CAPTURE_BYTES.inc(size, self.port)
+
+
+class CaptureTriggers:
+    """Déclencheurs abonnés au bus (core.events) → fire() de la capture active
+
+        triggers = CaptureTriggers(contexts=('bootrom',), patterns=[r'Kernel panic'])
+        triggers.subscribe(bus)
+        triggers.capture = TriggerCapture('captures', port)
+    """
+
+    def __init__(self, contexts: Optional[Iterable[str]] = TRIGGER_CONTEXTS,
+                 patterns: Iterable[str] = (), alerts: bool = True):
+        # None: toute transition de contexte
+        self.contexts = None if contexts is None else set(contexts)
+        self.patterns: List[str] = []
+        self.pattern_re = None
+        self.alerts = alerts
+        self.capture: Optional[TriggerCapture] = None
+        self.bus = None
+        self.add_patterns(patterns)
+
+    def add_patterns(self, patterns: Iterable[str]):
+        """Ajoute des regex (une seule recherche combinée par ligne)"""
+        added = [p for p in patterns if p not in self.patterns]
+        if not added:
+            return
+        for pattern in added:
+            try:
+                compile_pattern(pattern)
+            except (re.error, UnsafePattern) as e:
+                print(f"Erreur regex de capture {pattern!r}: {e}")
+                continue
+            self.patterns.append(pattern)
+        if not self.patterns:
+            return
+        subscribe = self.bus is not None and self.pattern_re is None
+        self.pattern_re = compile_pattern('|'.join(f'(?:{p})' for p in self.patterns))
+        if subscribe:
+            self.bus.subscribe(LineReceived, self.on_lines)
+
+    def subscribe(self, bus):
+        """Lignes seulement si des regex sont définies"""
+        self.bus = bus
+        bus.subscribe(ContextChanged, self.on_contexts)
+        if self.alerts:
+            bus.subscribe(Alert, self.on_alerts)
+        if self.pattern_re is not None:
+            bus.subscribe(LineReceived, self.on_lines)
+
+    def on_contexts(self, events):
+        if self.capture is None:
+            return
+        for event in events:
+            context = event.context.type.value
+            if self.contexts is None or context in self.contexts:
+                self.capture.fire('context', context, event.ts)
+
+    def on_lines(self, events):
+        if self.capture is None:
+            return
+        search = self.pattern_re.search
+        for event in events:
+            if search(event.line):
+                self.capture.fire('regex', event.line.strip(), event.ts)
+
+    def on_alerts(self, events):
+        if self.capture is None:
+            return
+        for event in events:
+            self.capture.fire('alert', event.message, event.ts)
+
+
+def main(argv=None):
+    """Rejoue un log brut par chunks et écrit les captures déclenchées"""
+    from .context_detector import ContextDetector
+    from .events import EventBus
+    from .module_manager import ModuleManager
+    from .pipeline import ConsolePipeline
+
+    parser = argparse.ArgumentParser(description="Captures déclenchées sur un log brut")
+    parser.add_argument('log')
+    parser.add_argument('-o', '--output', default='captures', help="Dossier des captures")
+    parser.add_argument('--ring', type=float, default=RING_BYTES / 2**20, metavar='MB')
+    parser.add_argument('--pre', type=int, default=PRE_BYTES, metavar='BYTES')
+    parser.add_argument('--post', type=int, default=POST_BYTES, metavar='BYTES')
+    parser.add_argument('--trigger-context', action='append', default=None, metavar='CTX',
+                        help="Contexte déclencheur ('*': toute transition)")
+    parser.add_argument('--trigger-re', action='append', default=[], metavar='REGEX')
+    parser.add_argument('--no-alerts', action='store_true', help="Alertes non déclenchantes")
+    parser.add_argument('--chunk', type=int, default=4096, help="Taille des chunks rejoués")
+    args = parser.parse_args(argv)
+
+    contexts = args.trigger_context if args.trigger_context is not None else TRIGGER_CONTEXTS
+    if '*' in contexts:
+        contexts = None
+    triggers = CaptureTriggers(contexts, args.trigger_re, alerts=not args.no_alerts)
+    manager = ModuleManager()
+    manager.on_module_loaded = lambda name, module: triggers.add_patterns(
+        getattr(module, 'capture_patterns', ()))
+    bus = EventBus()
+    triggers.subscribe(bus)
+    pipeline = ConsolePipeline(ContextDetector(), manager, bus=bus)
+    capture = triggers.capture = TriggerCapture(
+        args.output, os.path.basename(args.log), int(args.ring * 2**20), args.pre, args.post)
+
+    with open(args.log, 'rb') as f:
+        data = f.read()
+    ts = time.time()
+    for pos in range(0, len(data), args.chunk):
+        chunk = data[pos:pos + args.chunk]
+        ts += 1e-3
+        capture.write(chunk, ts)
+        pipeline.feed_bytes(chunk, ts)
+    pipeline.finish()
+    capture.close()
+
+    print(f"{capture.written} capture(s) → {capture.index_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
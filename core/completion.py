@@ -0,0 +1,180 @@
+"""
+Completion - Complétion de commandes classée par fréquence et récence
+
+Candidats: commandes des modules, historique (session et sessions
+précédentes, persisté en JSON) et commandes découvertes dans la sortie
+`help` de U-Boot. Un trie donne les candidats d'un préfixe; la frappe
+qui prolonge le préfixe précédent ne fait que filtrer le dernier résultat.
+"""
+import heapq
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+HISTORY_PATH = os.environ.get(
+    'PIDEBUGGER_HISTORY', os.path.join(os.path.expanduser('~'), '.pidebugger_history.json'))
+
+# Demi-vie de l'usage d'une commande (secondes): une commande utilisée
+# il y a une semaine compte moitié moins qu'une commande utilisée à l'instant
+HALF_LIFE = 7 * 24 * 3600
+
+# Score de base selon l'origine (l'historique s'y ajoute)
+SOURCE_WEIGHTS = {
+    'module': 0.6,
+    'help': 0.3,
+    'history': 0.0,
+}
+
+# Entrées d'historique conservées sur disque
+HISTORY_LIMIT = 5000
+
+
+class _Node:
+    __slots__ = ('children', 'entry')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.entry: Optional['_Entry'] = None
+
+
+class _Entry:
+    """Candidat: score d'usage décroissant dans le temps"""
+    __slots__ = ('command', 'base', 'usage', 'updated', 'count')
+
+    def __init__(self, command: str):
+        self.command = command
+        self.base = 0.0
+        self.usage = 0.0
+        self.updated = 0.0
+        self.count = 0
+
+    def score(self, now: float) -> float:
+        if not self.usage:
+            return self.base
+        return self.base + self.usage * 0.5 ** ((now - self.updated) / HALF_LIFE)
+
+    def use(self, now: float):
+        self.usage = self.score(now) - self.base + 1.0
+        self.updated = now
+        self.count += 1
+
+
+class CommandCompleter:
+    """Trie de commandes + classement fréquence/récence"""
+
+    def __init__(self, path: Optional[str] = None, limit: int = 10):
+        self.path = path
+        self.limit = limit
+        self.root = _Node()
+        self.entries: Dict[str, _Entry] = {}
+        # Dernière recherche (filtrage incrémental pendant la frappe)
+        self._last_prefix = None
+        self._last_entries: List[_Entry] = []
+
+    def _entry(self, command: str) -> _Entry:
+        entry = self.entries.get(command)
+        if entry is None:
+            entry = self.entries[command] = _Entry(command)
+            node = self.root
+            for char in command:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node()
+                node = child
+            node.entry = entry
+            self._last_prefix = None
+        return entry
+
+    def add(self, command: str, source: str = 'module'):
+        """Ajoute un candidat (sans usage)"""
+        command = command.strip()
+        if not command:
+            return
+        entry = self._entry(command)
+        entry.base = max(entry.base, SOURCE_WEIGHTS.get(source, 0.0))
+
+    def add_many(self, commands: Iterable[str], source: str = 'module'):
+        for command in commands:
+            self.add(command, source)
+
+    def record(self, command: str, now: Optional[float] = None):
+        """Commande envoyée: fréquence + récence"""
+        command = command.strip()
+        if command:
+            self._entry(command).use(now if now is not None else time.time())
+
+    def _under(self, prefix: str) -> List[_Entry]:
+        """Entrées dont la commande commence par `prefix`"""
+        last = self._last_prefix
+        if last is not None and prefix.startswith(last):
+            entries = [e for e in self._last_entries if e.command.startswith(prefix)]
+        else:
+            node = self.root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    entries = []
+                    break
+            else:
+                entries = []
+                stack = [node]
+                while stack:
+                    node = stack.pop()
+                    if node.entry is not None:
+                        entries.append(node.entry)
+                    stack.extend(node.children.values())
+
+        self._last_prefix = prefix
+        self._last_entries = entries
+        return entries
+
+    def complete(self, prefix: str, limit: Optional[int] = None,
+                 now: Optional[float] = None) -> List[str]:
+        """Meilleurs candidats pour un préfixe"""
+        now = now if now is not None else time.time()
+        entries = self._under(prefix)
+        best = heapq.nlargest(limit or self.limit, entries,
+                              key=lambda e: (e.score(now), -len(e.command)))
+        return [e.command for e in best]
+
+    def rank(self, commands: List[str], now: Optional[float] = None) -> List[str]:
+        """Trie une liste de commandes par score (ordre stable à égalité)"""
+        now = now if now is not None else time.time()
+        entries = self.entries
+        return sorted(commands, key=lambda c: -(entries[c].score(now) if c in entries else 0.0))
+
+    def load(self):
+        """Charge l'historique des sessions précédentes"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erreur historique {self.path}: {e}")
+            return
+        for command, (usage, updated, count) in data.get('history', {}).items():
+            entry = self._entry(command)
+            entry.usage, entry.updated, entry.count = usage, updated, count
+        self.add_many(data.get('discovered', []), 'help')
+
+    def save(self):
+        """Écrit l'historique (remplacement atomique)"""
+        if not self.path:
+            return
+        now = time.time()
+        used = [e for e in self.entries.values() if e.count]
+        used = heapq.nlargest(HISTORY_LIMIT, used, key=lambda e: e.score(now))
+        data = {
+            'history': {e.command: [e.usage, e.updated, e.count] for e in used},
+            'discovered': sorted(e.command for e in self.entries.values()
+                                 if e.base == SOURCE_WEIGHTS['help']),
+        }
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Erreur historique {self.path}: {e}")
@@ -3,9 +3,13 @@ Context Detector - Détection avancée du contexte système
 """
 import re
 from enum import Enum
+from time import perf_counter
 from dataclasses import dataclass
 from typing import Optional, List
 
+from .metrics import METRICS, DETECT_SECONDS
+from .regex_safety import compile_pattern, required_literals
+
 class ContextType(Enum):
     """Types de contexte"""
     UNKNOWN = "unknown"
@@ -21,17 +25,18 @@ class ContextType(Enum):
     LINUX_INIT = "linux_init"
     LINUX_SHELL = "linux_shell"
 
-@dataclass
+@dataclass(slots=True)
 class ContextInfo:
-    """Informations de contexte"""
+    """Informations de contexte (slots: pas de __dict__ par instance)"""
     type: ContextType
     prompt: Optional[str] = None
     version: Optional[str] = None
-    hardware: dict = None
+    hardware: Optional[dict] = None     # créé au premier fait matériel
     
-    def __post_init__(self):
+    def set_hardware(self, key: str, value):
         if self.hardware is None:
             self.hardware = {}
+        self.hardware[key] = value
 
 class ContextDetector:
     """Détecteur de contexte système"""
@@ -97,18 +102,96 @@ class ContextDetector:
         ContextType.LINUX_SHELL: r'([\w-]+[@:][\w/~]+[#\$])',
     }
     
+    # Patterns pour versions
+    VERSION_PATTERNS = {
+        ContextType.UBOOT_MAIN: r'U-Boot ([\d.]+)',
+        ContextType.LINUX_KERNEL: r'Linux version ([\d.-]+)',
+    }
+    
     def __init__(self):
         self.current_context = ContextInfo(type=ContextType.UNKNOWN)
         self.history: List[ContextInfo] = []
+        patterns, prompts, versions = self.compile_tables(
+            self.PATTERNS, self.PROMPT_PATTERNS, self.VERSION_PATTERNS
+        )
+        self.tables = (patterns, prompts, versions, self.literal_prefilter(patterns))
+        # Profiler actif (None = désactivé)
+        self.profiler = None
+    
+    @staticmethod
+    def compile_tables(patterns: dict, prompt_patterns: dict, version_patterns: dict) -> tuple:
+        """Compile les patterns en tables de détection (UnsafePattern si coût non borné)"""
+        compiled_patterns = tuple(
+            (context_type, tuple((compile_pattern(p, re.IGNORECASE), w) for p, w in pats))
+            for context_type, pats in patterns.items()
+        )
+        prompts = {ctx: compile_pattern(p) for ctx, p in prompt_patterns.items()}
+        versions = {ctx: compile_pattern(p) for ctx, p in version_patterns.items()}
+        return compiled_patterns, prompts, versions
+    
+    @staticmethod
+    def literal_prefilter(patterns):
+        """Regex des littéraux (casefold) dont l'un figure dans toute ligne détectable
+        
+        Une seule recherche de littéraux au lieu de tous les patterns: la
+        plupart des lignes (dmesg, sortie de commandes) n'en contiennent
+        aucun. None si un pattern n'a pas de littéral obligatoire.
+        """
+        needles = set()
+        for _, regexes in patterns:
+            for regex, _ in regexes:
+                literals = required_literals(regex.pattern, regex.flags)
+                if not literals:
+                    return None
+                needles.update(literals)
+        # Une chaîne qui en contient une plus courte est redondante
+        needles = sorted(n for n in needles if not any(m != n and m in n for m in needles))
+        return re.compile('|'.join(map(re.escape, needles)))
+    
+    def apply_profile(self, profile):
+        """Remplace les tables de détection (contexte courant conservé)"""
+        # Échange atomique: detect() lit self.tables une seule fois par appel
+        self.tables = (profile.patterns, profile.prompts, profile.versions,
+                       self.literal_prefilter(profile.patterns))
     
     def detect(self, line: str) -> Optional[ContextType]:
         """Détecte le contexte d'une ligne"""
+        if self.profiler:
+            return self._detect_profiled(line)
+        
+        patterns, _, _, prefilter = self.tables
+        # Sans aucun littéral obligatoire, aucun pattern ne peut matcher
+        if prefilter is not None and not prefilter.search(line.casefold()):
+            return None
         scores = {}
         
-        for context_type, patterns in self.PATTERNS.items():
+        for context_type, regexes in patterns:
             score = 0.0
-            for pattern, weight in patterns:
-                if re.search(pattern, line, re.IGNORECASE):
+            for regex, weight in regexes:
+                if regex.search(line):
+                    score += weight
+            
+            if score > 0:
+                scores[context_type] = score
+        
+        if scores:
+            return max(scores.items(), key=lambda x: x[1])[0]
+        
+        return None
+    
+    def _detect_profiled(self, line: str) -> Optional[ContextType]:
+        """detect() avec temps et hits par pattern"""
+        patterns = self.tables[0]
+        record = self.profiler.record
+        scores = {}
+        
+        for context_type, regexes in patterns:
+            score = 0.0
+            for regex, weight in regexes:
+                start = perf_counter()
+                hit = regex.search(line) is not None
+                record('detect', context_type.value, regex.pattern, perf_counter() - start, hit)
+                if hit:
                     score += weight
             
             if score > 0:
@@ -121,26 +204,29 @@ class ContextDetector:
     
     def update(self, line: str) -> bool:
         """Met à jour le contexte depuis une ligne"""
-        detected = self.detect(line)
+        _, prompts, versions, _ = self.tables
+        if METRICS.enabled:
+            start = perf_counter()
+            detected = self.detect(line)
+            DETECT_SECONDS.observe(perf_counter() - start)
+        else:
+            detected = self.detect(line)
         
         if detected and detected != self.current_context.type:
             # Nouveau contexte
             new_context = ContextInfo(type=detected)
             
             # Extraire prompt
-            prompt_pattern = self.PROMPT_PATTERNS.get(detected)
-            if prompt_pattern:
-                match = re.search(prompt_pattern, line)
+            prompt_re = prompts.get(detected)
+            if prompt_re:
+                match = prompt_re.search(line)
                 if match:
                     new_context.prompt = match.group(1)
             
             # Extraire version
-            if detected == ContextType.UBOOT_MAIN:
-                match = re.search(r'U-Boot ([\d.]+)', line)
-                if match:
-                    new_context.version = match.group(1)
-            elif detected == ContextType.LINUX_KERNEL:
-                match = re.search(r'Linux version ([\d.-]+)', line)
+            version_re = versions.get(detected)
+            if version_re:
+                match = version_re.search(line)
                 if match:
                     new_context.version = match.group(1)
             
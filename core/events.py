@@ -0,0 +1,190 @@
+"""
+Events - Bus d'événements typés, livrés par lots
+
+Le pipeline publie des événements typés (ligne reçue, changement de
+contexte, fait matériel, alerte, commande découverte ou envoyée) au lieu
+des dicts {'hardware','commands','alerts'}. Chaque consommateur (panels,
+journaux, métriques) s'abonne aux types qui l'intéressent; un type sans
+abonné ne coûte qu'un test à la publication.
+
+Les événements sont des objets à slots préalloués et réutilisés: ils ne
+sont valides que pendant l'appel du callback. Un abonné qui veut les
+conserver en copie les champs.
+"""
+from typing import Callable, Dict, List
+
+from .metrics import METRICS
+
+# Événements préalloués par type et par tampon (agrandi au besoin)
+CAPACITY = 256
+
+EVENTS_PUBLISHED = METRICS.counter('pidebugger_events_total',
+                                   'Événements livrés aux abonnés', ('type',))
+
+
+class LineReceived:
+    """Ligne complète reçue (numéro dans la session, contexte courant)"""
+    __slots__ = ('number', 'line', 'context', 'ts')
+
+    def __init__(self):
+        self.set(0, '', '', 0.0)
+
+    def set(self, number: int, line: str, context: str, ts: float):
+        self.number = number
+        self.line = line
+        self.context = context
+        self.ts = ts
+
+
+class ContextChanged:
+    """Nouveau contexte détecté (ContextInfo), modules déjà activés"""
+    __slots__ = ('number', 'context', 'ts')
+
+    def __init__(self):
+        self.set(0, None, 0.0)
+
+    def set(self, number: int, context, ts: float):
+        self.number = number
+        self.context = context
+        self.ts = ts
+
+
+class HardwareFact:
+    """Information matérielle extraite par un module"""
+    __slots__ = ('number', 'key', 'value', 'context', 'ts')
+
+    def __init__(self):
+        self.set(0, '', '', '', 0.0)
+
+    def set(self, number: int, key: str, value, context: str, ts: float):
+        self.number = number
+        self.key = key
+        self.value = value
+        self.context = context
+        self.ts = ts
+
+
+class Alert:
+    """Alerte levée par un module"""
+    __slots__ = ('number', 'message', 'context', 'ts')
+
+    def __init__(self):
+        self.set(0, '', '', 0.0)
+
+    def set(self, number: int, message: str, context: str, ts: float):
+        self.number = number
+        self.message = message
+        self.context = context
+        self.ts = ts
+
+
+class CommandDiscovered:
+    """Commande découverte dans la sortie de la cible (`help` U-Boot)"""
+    __slots__ = ('number', 'command', 'context', 'ts')
+
+    def __init__(self):
+        self.set(0, '', '', 0.0)
+
+    def set(self, number: int, command: str, context: str, ts: float):
+        self.number = number
+        self.command = command
+        self.context = context
+        self.ts = ts
+
+
+class CommandSent:
+    """Commande envoyée par l'utilisateur"""
+    __slots__ = ('command', 'port', 'ts')
+
+    def __init__(self):
+        self.set('', '', 0.0)
+
+    def set(self, command: str, port: str, ts: float):
+        self.command = command
+        self.port = port
+        self.ts = ts
+
+
+# Ordre de livraison des lots lors d'un flush
+EVENT_TYPES = (ContextChanged, LineReceived, HardwareFact, Alert, CommandDiscovered, CommandSent)
+
+
+class _Channel:
+    """Abonnés et tampons d'un type d'événement"""
+    __slots__ = ('subscribers', 'buffers', 'active', 'count')
+
+    def __init__(self, event_type, capacity: int):
+        self.subscribers: List[Callable] = []
+        # Double tampon: les publications faites pendant une livraison
+        # vont dans l'autre tampon (livrées au flush suivant)
+        self.buffers = ([event_type() for _ in range(capacity)],
+                        [event_type() for _ in range(capacity)])
+        self.active = 0
+        self.count = 0
+
+
+class EventBus:
+    """Publication/abonnement par type, livraison par lots à `flush()`
+
+        bus.subscribe(HardwareFact, on_facts)     # on_facts(list[HardwareFact])
+        bus.publish(HardwareFact, number, key, value, context, ts)
+        bus.flush()
+    """
+
+    def __init__(self, capacity: int = CAPACITY):
+        self.channels: Dict[type, _Channel] = {t: _Channel(t, capacity) for t in EVENT_TYPES}
+
+    def subscribe(self, event_type, callback: Callable):
+        """callback(events) reçoit chaque lot d'événements du type"""
+        self.channels[event_type].subscribers.append(callback)
+
+    def unsubscribe(self, event_type, callback: Callable):
+        subscribers = self.channels[event_type].subscribers
+        if callback in subscribers:
+            subscribers.remove(callback)
+
+    def wants(self, event_type) -> bool:
+        """Au moins un abonné (à tester avant de construire des événements en boucle)"""
+        return bool(self.channels[event_type].subscribers)
+
+    def publish(self, event_type, *fields):
+        """Remplit un événement préalloué (ignoré sans abonné)"""
+        channel = self.channels[event_type]
+        if not channel.subscribers:
+            return
+        buffer = channel.buffers[channel.active]
+        count = channel.count
+        if count == len(buffer):
+            buffer.append(event_type())
+        buffer[count].set(*fields)
+        channel.count = count + 1
+
+    def publish_result(self, result: dict, number: int, context: str, ts: float):
+        """Résultat de module (dict) → HardwareFact / Alert / CommandDiscovered"""
+        if result['hardware'] and self.channels[HardwareFact].subscribers:
+            for key, value in result['hardware'].items():
+                self.publish(HardwareFact, number, key, value, context, ts)
+        if result['alerts'] and self.channels[Alert].subscribers:
+            for message in result['alerts']:
+                self.publish(Alert, number, message, context, ts)
+        if result['commands'] and self.channels[CommandDiscovered].subscribers:
+            for command in result['commands']:
+                self.publish(CommandDiscovered, number, command, context, ts)
+
+    def flush(self):
+        """Livre les lots en attente, type par type (ordre de EVENT_TYPES)"""
+        counted = METRICS.enabled
+        for event_type, channel in self.channels.items():
+            count = channel.count
+            if not count:
+                continue
+            events = channel.buffers[channel.active][:count]
+            channel.active ^= 1
+            channel.count = 0
+            if counted:
+                EVENTS_PUBLISHED.inc(count, event_type.__name__)
+            for callback in list(channel.subscribers):
+                try:
+                    callback(events)
+                except Exception as e:
+                    print(f"Erreur abonné {event_type.__name__}: {e}")
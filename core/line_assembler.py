@@ -0,0 +1,33 @@
+"""
+Line Assembler - Reconstitution des lignes à travers les chunks série
+"""
+from typing import List
+
+
+class LineAssembler:
+    """Assemble les lignes complètes d'un flux découpé en chunks
+
+    Une ligne coupée entre deux lectures série n'est plus vue en deux
+    morceaux par la détection. La ligne en cours (prompt sans retour à la
+    ligne) reste accessible via `partial`.
+    """
+
+    def __init__(self):
+        self.partial = ''
+
+    def feed(self, text: str) -> List[str]:
+        """Ajoute du texte, retourne les lignes complètes"""
+        if '\n' not in text:
+            self.partial += text
+            return []
+
+        lines = text.split('\n')
+        if self.partial:
+            lines[0] = self.partial + lines[0]
+        self.partial = lines.pop()
+        return lines
+
+    def flush(self) -> str:
+        """Retourne et vide la ligne en cours"""
+        line, self.partial = self.partial, ''
+        return line
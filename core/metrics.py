@@ -0,0 +1,210 @@
+"""
+Metrics - Compteurs et histogrammes internes (format texte Prometheus)
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple
+
+# Buckets de latence (secondes), de la microseconde à la seconde
+LATENCY_BUCKETS = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0,
+)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    """Formate les labels {a="x",b="y"}"""
+    parts = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    """Compteur monotone"""
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, *labels):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in list(self.values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Gauge(Counter):
+    """Valeur instantanée"""
+    kind = 'gauge'
+
+    def set(self, value: float, *labels):
+        self.values[labels] = value
+
+
+class Histogram:
+    """Histogramme à buckets fixes"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [compteurs par bucket (+Inf en dernier), somme, total]
+        self.values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self):
+        for labels, (counts, total, count) in list(self.values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield (f'{self.name}_bucket',
+                       _format_labels(self.labelnames, labels, f'le="{le}"'), cumulative)
+            yield f'{self.name}_sum', _format_labels(self.labelnames, labels), total
+            yield f'{self.name}_count', _format_labels(self.labelnames, labels), count
+
+    def mean(self, *labels) -> float:
+        entry = self.values.get(labels)
+        return entry[1] / entry[2] if entry and entry[2] else 0.0
+
+
+class MetricsRegistry:
+    """Registre des métriques
+
+    Désactivé par défaut: les points d'instrumentation testent `enabled`
+    avant toute mesure, le coût est alors d'une lecture d'attribut.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.metrics: Dict[str, object] = {}
+
+    def _register(self, cls, name: str, help: str, labelnames, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help, tuple(labelnames), **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Exposition au format texte Prometheus"""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, float]:
+        """Valeurs courantes (compteurs/jauges, sommes et totaux d'histogrammes)"""
+        values = {}
+        for metric in list(self.metrics.values()):
+            for name, labels, value in metric.samples():
+                if not name.endswith('_bucket'):
+                    values[name + labels] = value
+        return values
+
+
+# Registre global de l'application
+METRICS = MetricsRegistry()
+
+# Métriques du pipeline
+RX_BYTES = METRICS.counter('pidebugger_rx_bytes_total', 'Octets reçus', ('port',))
+RX_LINES = METRICS.counter('pidebugger_rx_lines_total', 'Lignes reçues', ('port',))
+READER_WAKEUPS = METRICS.counter('pidebugger_reader_wakeups_total', 'Réveils du thread de lecture', ('port',))
+DECODE_SECONDS = METRICS.histogram('pidebugger_decode_seconds', 'Temps de décodage par chunk', ('port',))
+DETECT_SECONDS = METRICS.histogram('pidebugger_detect_seconds', 'Latence ContextDetector.detect par ligne')
+MODULE_SECONDS = METRICS.histogram('pidebugger_module_seconds', 'Latence process_line par module', ('module',))
+FLUSH_SECONDS = METRICS.histogram('pidebugger_gui_flush_seconds', 'Latence de rendu terminal par chunk')
+QUEUE_DEPTH = METRICS.gauge('pidebugger_queue_depth', 'Chunks en attente vers le thread GUI', ('port',))
+
+
+class MetricsServer:
+    """Endpoint HTTP local exposant /metrics"""
+
+    def __init__(self, registry: MetricsRegistry = METRICS, host: str = '127.0.0.1', port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd = None       # ThreadingHTTPServer (http.server importé au démarrage)
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Démarre le serveur dans un thread démon"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.registry.enabled = True
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Arrête le serveur"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+class RateTracker:
+    """Calcule des débits (par seconde) à partir de snapshots successifs"""
+
+    def __init__(self, registry: MetricsRegistry = METRICS):
+        self.registry = registry
+        self.last = {}
+        self.last_time = None
+
+    def rates(self) -> Dict[str, float]:
+        """Débits des compteurs *_total depuis l'appel précédent"""
+        now = time.monotonic()
+        current = {k: v for k, v in self.registry.snapshot().items() if '_total' in k}
+        rates = {}
+        if self.last_time is not None:
+            elapsed = max(now - self.last_time, 1e-9)
+            for key, value in current.items():
+                rates[key] = (value - self.last.get(key, 0)) / elapsed
+        self.last = current
+        self.last_time = now
+        return rates
@@ -3,15 +3,39 @@ Module Manager - Gestion des modules contextuels
 """
 import importlib
 import os
-from typing import Dict, List, Optional
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from .metrics import METRICS, MODULE_SECONDS
+from .regex_safety import UnsafePattern, compile_pattern
 
 class ModuleManager:
     """Gestionnaire de modules"""
     
+    # Mapping contexte → modules (remplacé par les profils)
+    CONTEXT_MODULES = {
+        'bootrom': ['bootrom_module'],
+        'wtmi': ['wtmi_module'],
+        'uboot_spl': ['uboot_module'],
+        'uboot_main': ['uboot_module'],
+        'linux_kernel': ['linux_module'],
+        'linux_init': ['linux_module'],
+        'linux_shell': ['linux_module'],
+        'atf_bl1': ['atf_module'],
+        'atf_bl2': ['atf_module'],
+        'atf_bl31': ['atf_module'],
+    }
+    
     def __init__(self, modules_dir='modules'):
         self.modules_dir = modules_dir
         self.loaded_modules: Dict[str, any] = {}
         self.active_modules: List[str] = []
+        self.context_modules: Dict[str, List[str]] = dict(self.CONTEXT_MODULES)
+        self.module_commands: Dict[str, Dict[str, List[str]]] = {}
+        self.profiler = None
+        self.disabled_modules = set()   # désactivés par la sandbox
+        self.sandbox = None
+        self.on_module_loaded = None    # callback(module_name, instance)
     
     def discover_modules(self) -> List[str]:
         """Découvre les modules disponibles"""
@@ -41,7 +65,12 @@ class ModuleManager:
             
             if module_class:
                 instance = module_class()
+                instance.profiler = self.profiler
+                self._screen_extractors(module_name, instance)
+                self._apply_commands(module_name, instance)
                 self.loaded_modules[module_name] = instance
+                if self.on_module_loaded:
+                    self.on_module_loaded(module_name, instance)
                 return True
         
         except Exception as e:
@@ -55,14 +84,80 @@ class ModuleManager:
             if not self.load_module(module_name):
                 return
         
+        if module_name in self.disabled_modules:
+            return
+        
         if module_name not in self.active_modules:
             self.active_modules.append(module_name)
     
+    def activate_for_context(self, context_type: str) -> List[str]:
+        """Active uniquement les modules associés à un contexte"""
+        modules = self.context_modules.get(context_type, [])
+        
+        # Désactiver tous puis activer ceux du contexte
+        for mod in self.get_active_modules():
+            self.deactivate_module(mod)
+        
+        for mod in modules:
+            self.activate_module(mod)
+        
+        return self.get_active_modules()
+    
+    def apply_profile(self, profile):
+        """Applique un profil compilé (mapping contextes et commandes)"""
+        if profile.context_modules:
+            self.context_modules = dict(profile.context_modules)
+        self.module_commands = profile.module_commands
+        
+        for module_name, instance in self.loaded_modules.items():
+            self._apply_commands(module_name, instance)
+    
+    def _screen_extractors(self, module_name: str, instance):
+        """Écarte les extracteurs au retour arrière non borné (core.regex_safety)"""
+        extractors = getattr(instance, 'extractors', None)
+        if not extractors:
+            return
+        
+        kept = []
+        for key, regex in extractors:
+            try:
+                kept.append((key, compile_pattern(regex.pattern, regex.flags)))
+            except UnsafePattern as e:
+                print(f"Erreur extracteur {module_name}.{key} ignoré: {e}")
+        instance.extractors = kept
+    
+    def _apply_commands(self, module_name: str, instance):
+        """Remplace les catégories de commandes définies par le profil"""
+        if not hasattr(instance, 'commands'):
+            return
+        
+        # Conserver les commandes d'origine pour pouvoir revenir en arrière
+        defaults = getattr(instance, 'default_commands', None)
+        if defaults is None:
+            defaults = instance.default_commands = dict(instance.commands)
+        
+        commands = self.module_commands.get(module_name, {})
+        instance.commands = {**defaults, **commands}
+    
     def deactivate_module(self, module_name: str):
         """Désactive un module"""
         if module_name in self.active_modules:
             self.active_modules.remove(module_name)
     
+    def set_profiler(self, profiler):
+        """Active (ou désactive avec None) le profilage des modules"""
+        self.profiler = profiler
+        for instance in self.loaded_modules.values():
+            instance.profiler = profiler
+    
+    def enable_sandbox(self, **options):
+        """Budget de temps par module et isolation en processus (core.sandbox)"""
+        from .sandbox import ModuleSandbox
+        
+        if self.sandbox is None:
+            self.sandbox = ModuleSandbox(self, **options)
+        return self.sandbox
+    
     def get_active_modules(self) -> List[str]:
         """Retourne les modules actifs"""
         return self.active_modules.copy()
@@ -78,18 +173,45 @@ class ModuleManager:
         
         return suggestions
     
+    def get_all_commands(self) -> List[str]:
+        """Toutes les commandes connues des modules chargés (complétion)"""
+        commands = []
+        for module in self.loaded_modules.values():
+            for category in getattr(module, 'commands', {}).values():
+                commands.extend(category)
+        return commands
+    
     def process_line(self, line: str, context_type: str) -> dict:
         """Traite une ligne avec les modules actifs"""
+        if self.sandbox:
+            return self.sandbox.process_line(line, context_type)
+        
         results = {
             'hardware': {},
             'commands': [],
             'alerts': []
         }
         
+        timed = METRICS.enabled
+        profiler = self.profiler
+        
         for module_name in self.active_modules:
             module = self.loaded_modules.get(module_name)
             if module and hasattr(module, 'process_line'):
-                module_result = module.process_line(line, context_type)
+                if profiler:
+                    start = perf_counter()
+                    module_result = module.process_line(line, context_type)
+                    elapsed = perf_counter() - start
+                    profiler.record('module', type(module).__name__, 'process_line',
+                                    elapsed, bool(module_result))
+                    if timed:
+                        MODULE_SECONDS.observe(elapsed, module_name)
+                elif timed:
+                    start = perf_counter()
+                    module_result = module.process_line(line, context_type)
+                    MODULE_SECONDS.observe(perf_counter() - start, module_name)
+                else:
+                    module_result = module.process_line(line, context_type)
                 
                 if module_result:
                     results['hardware'].update(module_result.get('hardware', {}))
@@ -97,3 +219,47 @@ class ModuleManager:
                     results['alerts'].extend(module_result.get('alerts', []))
         
         return results
+    
+    def process_batch(self, lines: List[str], contexts: List[str]) -> List[Tuple[int, dict]]:
+        """Traite un lot de lignes (mêmes modules actifs pour tout le lot)
+        
+        Chaque module reçoit le lot entier (BaseModule.process_batch); retourne
+        les résultats fusionnés des lignes concernées [(index, résultat)].
+        """
+        if self.sandbox or self.profiler:
+            # Budget et profilage restent mesurés par ligne
+            batch = []
+            for i, (line, context_type) in enumerate(zip(lines, contexts)):
+                result = self.process_line(line, context_type)
+                if result['hardware'] or result['commands'] or result['alerts']:
+                    batch.append((i, result))
+            return batch
+        
+        merged: Dict[int, dict] = {}
+        timed = METRICS.enabled and lines
+        
+        for module_name in self.active_modules:
+            module = self.loaded_modules.get(module_name)
+            if not module:
+                continue
+            if timed:
+                start = perf_counter()
+            if hasattr(module, 'process_batch'):
+                module_results = module.process_batch(lines, contexts)
+            elif hasattr(module, 'process_line'):
+                module_results = [(i, r) for i, r in enumerate(map(module.process_line, lines, contexts)) if r]
+            else:
+                continue
+            if timed:
+                # Moyenne par ligne du lot (un seul point par lot)
+                MODULE_SECONDS.observe((perf_counter() - start) / len(lines), module_name)
+            
+            for i, module_result in module_results:
+                result = merged.get(i)
+                if result is None:
+                    result = merged[i] = {'hardware': {}, 'commands': [], 'alerts': []}
+                result['hardware'].update(module_result.get('hardware', {}))
+                result['commands'].extend(module_result.get('commands', []))
+                result['alerts'].extend(module_result.get('alerts', []))
+        
+        return sorted(merged.items())
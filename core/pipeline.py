@@ -0,0 +1,153 @@
+"""
+Console Pipeline - Traitement headless du flux console
+"""
+import time
+from typing import Callable, Optional
+
+from .ansi import AnsiParser
+from .binary_stream import BinaryClassifier
+from .context_detector import ContextDetector
+from .events import EventBus, LineReceived, ContextChanged
+from .line_assembler import LineAssembler
+from .module_manager import ModuleManager
+from .regex_safety import MAX_LINE_LENGTH, clip
+
+
+class ConsolePipeline:
+    """Flux console → ANSI → lignes → détection contexte → modules
+
+    Utilisé par le GUI comme par les outils headless (replay, profilage,
+    benchmarks) pour que tous voient exactement le même traitement.
+    Les événements typés sont publiés sur `bus` et livrés en fin de chunk.
+    """
+
+    def __init__(self, detector: Optional[ContextDetector] = None,
+                 manager: Optional[ModuleManager] = None,
+                 on_context: Optional[Callable] = None,
+                 on_result: Optional[Callable] = None,
+                 bus: Optional[EventBus] = None,
+                 classifier: Optional[BinaryClassifier] = None):
+        self.detector = detector or ContextDetector()
+        self.manager = manager or ModuleManager()
+        self.bus = bus or EventBus()
+        self.ansi = AnsiParser()
+        self.lines = LineAssembler()
+        self.on_context = on_context
+        self.on_result = on_result
+        self.classifier = classifier or BinaryClassifier()
+        self.line_count = 0
+        self.binary_bytes = 0   # octets sautés en mode binaire
+        self.ts = 0.0           # horodatage du chunk en cours
+
+    def reset(self):
+        """Réinitialise le flux (nouvelle connexion)"""
+        self.ansi.reset()
+        self.lines.flush()
+        self.classifier.reset()
+
+    def feed_bytes(self, data: bytes, ts: Optional[float] = None) -> list:
+        """Chunk brut: décodé et traité s'il est texte, sauté s'il est binaire"""
+        text = self.classifier.feed(data)
+        if text is None:
+            self.skip_binary(len(data))
+            return []
+        return self.feed(text.decode('utf-8', errors='replace'), ts)
+
+    def skip_binary(self, size: int):
+        """Chunk binaire: ni ANSI, ni lignes, ni détection
+
+        La ligne en cours et une séquence ANSI incomplète sont abandonnées:
+        le texte qui suivra la rafale ne doit pas s'y coller.
+        """
+        self.binary_bytes += size
+        self.ansi.reset()
+        if self.lines.partial:
+            self.lines.flush()
+
+    def feed(self, text: str, ts: Optional[float] = None) -> list:
+        """Traite un chunk, retourne les opérations ANSI à afficher"""
+        self.ts = ts if ts is not None else time.time()
+        ops, plain = self.ansi.feed(text)
+
+        # Lignes du chunk traitées par lots: un lot s'arrête à chaque
+        # changement de contexte (les modules actifs changent). Détection et
+        # modules voient la ligne plafonnée, les abonnés la ligne complète
+        batch, contexts, texts = [], [], []
+        for line in self.lines.feed(plain):
+            if not line.strip():
+                continue
+            self.line_count += 1
+            clipped = clip(line) if len(line) > MAX_LINE_LENGTH else line
+            if self.detector.update(clipped):
+                # Lot précédent: lignes line_count - len(batch) .. line_count - 1
+                self._process_batch(batch, contexts, self.line_count - len(batch), texts)
+                batch, contexts, texts = [], [], []
+                self._context_changed()
+            batch.append(clipped)
+            texts.append(line)
+            contexts.append(self.detector.current_context.type.value)
+        self._process_batch(batch, contexts, self.line_count - len(batch) + 1, texts)
+
+        # Ligne en cours (prompt sans retour à la ligne): contexte seulement,
+        # sur sa fin (le prompt) si elle dépasse le plafond
+        partial = self.lines.partial[-MAX_LINE_LENGTH:]
+        if partial.strip() and self.detector.update(partial):
+            self._context_changed()
+
+        self.bus.flush()
+        return ops
+
+    def process_line(self, line: str):
+        """Traite une ligne complète"""
+        if not line.strip():
+            return
+        clipped = clip(line)
+        self.line_count += 1
+
+        # Détection contexte
+        if self.detector.update(clipped):
+            self._context_changed()
+
+        # Traiter avec modules
+        context_type = self.detector.current_context.type.value
+        result = self.manager.process_line(clipped, context_type)
+
+        self.bus.publish(LineReceived, self.line_count, line, context_type, self.ts)
+        if result['hardware'] or result['commands'] or result['alerts']:
+            self.bus.publish_result(result, self.line_count, context_type, self.ts)
+            if self.on_result:
+                self.on_result(result)
+
+    def _process_batch(self, batch: list, contexts: list, first: int, texts: list):
+        """Lot de lignes (numérotées à partir de `first`) → modules → événements
+
+        `batch`: lignes plafonnées pour les modules, `texts`: lignes complètes.
+        """
+        if not batch:
+            return
+        results = self.manager.process_batch(batch, contexts)
+
+        bus, ts = self.bus, self.ts
+        if bus.wants(LineReceived):
+            for i, line in enumerate(texts):
+                bus.publish(LineReceived, first + i, line, contexts[i], ts)
+        for i, result in results:
+            if result['hardware'] or result['commands'] or result['alerts']:
+                bus.publish_result(result, first + i, contexts[i], ts)
+                if self.on_result:
+                    self.on_result(result)
+
+    def finish(self):
+        """Traite la dernière ligne incomplète (fin de capture)"""
+        line = self.lines.flush()
+        if line:
+            self.process_line(line)
+        self.bus.flush()
+
+    def _context_changed(self):
+        """Nouveau contexte: activer les modules associés"""
+        context = self.detector.get_context()
+        self.manager.activate_for_context(context.type.value)
+        self.bus.publish(ContextChanged, self.line_count, context, self.ts)
+        if self.on_context:
+            self.on_context(context)
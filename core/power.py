@@ -0,0 +1,437 @@
+"""
+Power - Commande d'alimentation/reset et cycles de boot automatisés
+
+Backends interchangeables, choisis par une spec texte:
+
+    gpio:17            ligne GPIO (libgpiod), gpio:17:low pour un relais actif bas,
+                       gpio:/dev/gpiochip1:5 pour un autre contrôleur
+    hidrelay:/dev/hidraw0:1     relais USB HID (canal 1)
+    serialrelay:/dev/ttyUSB3:1  relais USB série type LCUS (canal 1)
+    mock[:boot.log[:baud]]      carte simulée: rejoue un log à la mise sous tension
+
+`BootCycler` relie un backend au bus d'événements: chaque mise sous tension
+ouvre un cycle, chaque ContextChanged y ajoute l'instant d'entrée dans la
+phase (relatif à la mise sous tension), jusqu'au contexte cible ou au
+timeout. `InrushScheduler` espace les mises sous tension de plusieurs
+cartes (appel de courant).
+
+    python3 -m core.power --board b1 /dev/ttyUSB0 gpio:17 \\
+                          --board b2 /dev/ttyUSB1 gpio:27 --cycles 200 -o cycles.jsonl
+    python3 -m core.power --board sim mock mock:benchmarks/logs/mcbin_openwrt.log --cycles 5
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .metrics import METRICS
+
+try:
+    import gpiod
+    from gpiod.line import Direction, Value
+    GPIOD_AVAILABLE = True
+except ImportError:
+    GPIOD_AVAILABLE = False
+
+# Coupure avant remise sous tension (décharge des condensateurs)
+OFF_SECONDS = 2.0
+# Boot abandonné au-delà (carte bloquée)
+BOOT_TIMEOUT = 120.0
+# Contexte qui termine un cycle
+TARGET_CONTEXT = 'linux_shell'
+# Écart minimal entre deux mises sous tension (plusieurs cartes)
+STAGGER_SECONDS = 0.5
+# Débit simulé par défaut de la carte mock
+MOCK_BAUD = 115200
+
+# Boot minimal de la carte mock sans log
+MOCK_BOOT = (
+    "BootROM - 2.03\nBooting from SPI flash\n"
+    "NOTICE:  BL1: v1.5(release)\n"
+    "NOTICE:  BL2: v1.5(release)\n"
+    "NOTICE:  BL31: v1.5(release)\n"
+    "U-Boot 2019.10 (Jan 01 2020)\nModel: Mock board\nHit any key to stop autoboot:  0\n"
+    "[    0.000000] Booting Linux on physical CPU 0x0000000000 [0x410fd034]\n"
+    "[    0.000000] Linux version 5.4.0 (mock)\n"
+    "[    2.000000] Run /sbin/init as init process\n"
+    "[    2.100000] systemd[1]: systemd 245 running in system mode (version mock)\n"
+    "mock login: root\nroot@mock:~# \n"
+)
+
+POWER_CYCLES = METRICS.counter('pidebugger_power_cycles_total',
+                               'Cycles de boot terminés', ('board', 'result'))
+BOOT_SECONDS = METRICS.histogram('pidebugger_boot_seconds',
+                                 'Mise sous tension → contexte cible', ('board',),
+                                 buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120))
+
+
+class PowerBackend:
+    """Commande d'alimentation d'une carte (`set(True)` = sous tension)"""
+    name = 'base'
+
+    def set(self, on: bool):
+        raise NotImplementedError
+
+    def on(self):
+        self.set(True)
+
+    def off(self):
+        self.set(False)
+
+    def cycle(self, off_seconds: float = OFF_SECONDS):
+        """Coupure puis remise sous tension (bloquant)"""
+        self.off()
+        time.sleep(off_seconds)
+        self.on()
+
+    def close(self):
+        pass
+
+
+class GpioPower(PowerBackend):
+    """Ligne GPIO via libgpiod (Raspberry Pi: relais ou transistor sur la ligne)"""
+    name = 'gpio'
+
+    def __init__(self, line: int, chip: str = '/dev/gpiochip0', active_low: bool = False):
+        if not GPIOD_AVAILABLE:
+            raise RuntimeError("gpiod (libgpiod v2) non installé")
+        self.line = line
+        self.request = gpiod.request_lines(
+            chip, consumer='pidebugger',
+            config={line: gpiod.LineSettings(direction=Direction.OUTPUT, active_low=active_low)})
+
+    def set(self, on: bool):
+        self.request.set_value(self.line, Value.ACTIVE if on else Value.INACTIVE)
+
+    def close(self):
+        self.request.release()
+
+
+def _hidiocsfeature(length: int) -> int:
+    """HIDIOCSFEATURE(len) de linux/hidraw.h: _IOC(_IOC_WRITE|_IOC_READ, 'H', 0x06, len)"""
+    return (3 << 30) | (length << 16) | (ord('H') << 8) | 0x06
+
+
+class HidRelayPower(PowerBackend):
+    """Relais USB HID (cartes "USBRelay" 1-8 canaux, rapport 0xFF/0xFD)
+
+    La commande est un feature report (SET_REPORT): un `write` sur hidraw
+    enverrait un output report, que ces relais ignorent.
+    """
+    name = 'hidrelay'
+
+    def __init__(self, device: str, channel: int = 1):
+        self.channel = channel
+        self.fd = os.open(device, os.O_RDWR)
+
+    def set(self, on: bool):
+        import fcntl
+        report = bytes([0x00, 0xFF if on else 0xFD, self.channel, 0, 0, 0, 0, 0, 0])
+        fcntl.ioctl(self.fd, _hidiocsfeature(len(report)), report)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SerialRelayPower(PowerBackend):
+    """Relais USB série (LCUS/CH340: A0 canal état somme)"""
+    name = 'serialrelay'
+
+    def __init__(self, device: str, channel: int = 1):
+        import serial
+        self.channel = channel
+        self.serial = serial.Serial(device, 9600, timeout=0.5)
+
+    def set(self, on: bool):
+        state = 1 if on else 0
+        self.serial.write(bytes([0xA0, self.channel, state, (0xA0 + self.channel + state) & 0xFF]))
+
+    def close(self):
+        self.serial.close()
+
+
+class MockPower(PowerBackend):
+    """Carte simulée: à la mise sous tension, rejoue un log au débit `baud`
+
+    Sert aussi de source de données (`read()`), comme un port série: un
+    banc de cycles complet tourne sans matériel.
+    """
+    name = 'mock'
+
+    def __init__(self, path: Optional[str] = None, baud: int = MOCK_BAUD, chunk: int = 256):
+        if path:
+            with open(path, 'rb') as f:
+                self.data = f.read()
+        else:
+            self.data = MOCK_BOOT.encode()
+        self.bytes_per_second = baud / 10
+        self.chunk = chunk
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.generation = 0
+        self.thread = None
+
+    def set(self, on: bool):
+        # Chaque changement d'état arrête l'émission en cours
+        self.generation += 1
+        if not on:
+            return
+        self.thread = threading.Thread(target=self._emit, args=(self.generation,), daemon=True)
+        self.thread.start()
+
+    def _emit(self, generation: int):
+        delay = self.chunk / self.bytes_per_second
+        for pos in range(0, len(self.data), self.chunk):
+            if generation != self.generation:
+                return
+            self.queue.put(self.data[pos:pos + self.chunk])
+            time.sleep(delay)
+
+    def read(self, timeout: float = 0.1) -> bytes:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return b''
+
+    def drain(self) -> bytes:
+        """Tout ce qui a été émis depuis le dernier appel (sans attendre)"""
+        chunks = []
+        while True:
+            try:
+                chunks.append(self.queue.get_nowait())
+            except queue.Empty:
+                return b''.join(chunks)
+
+    def close(self):
+        self.off()
+
+
+def open_backend(spec: str) -> PowerBackend:
+    """Backend depuis une spec ('gpio:17', 'hidrelay:/dev/hidraw0:1', 'mock'...)"""
+    kind, _, rest = spec.partition(':')
+    args = rest.split(':') if rest else []
+    if kind == 'gpio':
+        active_low = bool(args) and args[-1] == 'low'
+        if active_low:
+            args = args[:-1]
+        if len(args) == 2:
+            return GpioPower(int(args[1]), args[0], active_low)
+        return GpioPower(int(args[0]), active_low=active_low)
+    if kind == 'hidrelay':
+        return HidRelayPower(args[0], int(args[1]) if len(args) > 1 else 1)
+    if kind == 'serialrelay':
+        return SerialRelayPower(args[0], int(args[1]) if len(args) > 1 else 1)
+    if kind == 'mock':
+        return MockPower(args[0] if args else None, int(args[1]) if len(args) > 1 else MOCK_BAUD)
+    raise ValueError(f"backend d'alimentation inconnu: {spec}")
+
+
+class BootCycler:
+    """Cycles d'une carte: phases horodatées depuis la mise sous tension
+
+    Abonné ContextChanged (core.events); `start()` ouvre un cycle, le cycle
+    se ferme à l'entrée dans `target` ou à `expire()` après `timeout`.
+    """
+
+    def __init__(self, board: str, backend: PowerBackend, target: str = TARGET_CONTEXT,
+                 timeout: float = BOOT_TIMEOUT, off_seconds: float = OFF_SECONDS,
+                 on_cycle=None):
+        self.board = board
+        self.backend = backend
+        self.target = target
+        self.timeout = timeout
+        self.off_seconds = off_seconds
+        self.on_cycle = on_cycle        # callback(résultat) à la fin de chaque cycle
+        self.results: List[dict] = []
+        self.current: Optional[dict] = None
+
+    def subscribe(self, bus):
+        from .events import ContextChanged
+        bus.subscribe(ContextChanged, self.on_contexts)
+
+    def start(self, t_on: Optional[float] = None):
+        """Mise sous tension (le backend doit déjà être coupé)"""
+        if self.current:
+            self.finish(False)
+        t_on = t_on or time.time()
+        self.backend.on()
+        self.current = {'board': self.board, 'cycle': len(self.results), 't_on': t_on,
+                        'reached': False, 'phases': {}}
+
+    def on_contexts(self, events):
+        current = self.current
+        if current is None:
+            return
+        for event in events:
+            context = event.context.type.value
+            # Première entrée dans chaque phase du cycle
+            current['phases'].setdefault(context, round(event.ts - current['t_on'], 4))
+            if context == self.target:
+                self.finish(True)
+                return
+
+    def expire(self, now: Optional[float] = None) -> bool:
+        """Ferme le cycle en cours après `timeout` (carte bloquée)"""
+        current = self.current
+        if current and (now or time.time()) - current['t_on'] >= self.timeout:
+            self.finish(False)
+            return True
+        return False
+
+    def finish(self, reached: bool):
+        current, self.current = self.current, None
+        current['reached'] = reached
+        self.results.append(current)
+        if METRICS.enabled:
+            POWER_CYCLES.inc(1, self.board, 'ok' if reached else 'timeout')
+            if reached:
+                BOOT_SECONDS.observe(current['phases'][self.target], self.board)
+        if self.on_cycle:
+            self.on_cycle(current)
+
+    @property
+    def running(self) -> bool:
+        return self.current is not None
+
+
+class InrushScheduler:
+    """Mises sous tension espacées d'au moins `stagger` s entre toutes les cartes"""
+
+    def __init__(self, stagger: float = STAGGER_SECONDS):
+        self.stagger = stagger
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait_turn(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.stagger
+        time.sleep(max(slot - now, 0.0))
+
+
+class SerialSource:
+    """Port série ou URL (socket://, rfc2217://) lu par chunks"""
+
+    def __init__(self, port: str, baud: int = 115200):
+        import serial
+        self.serial = serial.serial_for_url(port, baud, timeout=0.1)
+
+    def read(self, timeout: float = 0.1) -> bytes:
+        return self.serial.read(self.serial.in_waiting or 1)
+
+    def close(self):
+        self.serial.close()
+
+
+def run_board(cycler: BootCycler, source, cycles: int, scheduler: InrushScheduler):
+    """Boucle d'une carte: coupure, tour du scheduler, mise sous tension, boot"""
+    from .context_detector import ContextDetector, ContextType
+    from .events import EventBus
+    from .module_manager import ModuleManager
+    from .pipeline import ConsolePipeline
+
+    bus = EventBus()
+    cycler.subscribe(bus)
+    detector = ContextDetector()
+    pipeline = ConsolePipeline(detector, ModuleManager(), bus=bus)
+
+    def feed():
+        data = source.read(0.1)
+        if data:
+            pipeline.feed_bytes(data, time.time())
+
+    try:
+        for _ in range(cycles):
+            cycler.backend.off()
+            off_until = time.time() + cycler.off_seconds
+            while time.time() < off_until:
+                feed()
+            scheduler.wait_turn()
+            detector.current_context.type = ContextType.UNKNOWN
+            pipeline.reset()
+            cycler.start()
+            while cycler.running and not cycler.expire():
+                feed()
+    finally:
+        cycler.backend.off()
+        # Le backend mock est sa propre source: fermé par l'appelant avec le backend
+        if source is not cycler.backend:
+            source.close()
+
+
+def summarize(results: List[dict], contexts: Optional[List[str]] = None) -> str:
+    """Distribution par phase: nombre, min, médiane, p95, max (s depuis la mise sous tension)"""
+    phases: Dict[str, List[float]] = {}
+    for result in results:
+        for context, seconds in result['phases'].items():
+            phases.setdefault(context, []).append(seconds)
+    order = contexts or sorted(phases, key=lambda c: sorted(phases[c])[len(phases[c]) // 2])
+    reached = sum(1 for r in results if r['reached'])
+    lines = [f"{len(results)} cycles, {reached} complets",
+             f"{'phase':14s} {'n':>5s} {'min':>8s} {'p50':>8s} {'p95':>8s} {'max':>8s}"]
+    for context in order:
+        values = sorted(phases.get(context, ()))
+        if not values:
+            continue
+        p50 = values[len(values) // 2]
+        p95 = values[min(int(len(values) * 0.95), len(values) - 1)]
+        lines.append(f"{context:14s} {len(values):5d} {values[0]:8.2f} {p50:8.2f} {p95:8.2f} {values[-1]:8.2f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cycles de boot automatisés (alimentation + détection)")
+    parser.add_argument('--board', nargs=3, action='append', required=True,
+                        metavar=('NOM', 'PORT', 'BACKEND'),
+                        help="Carte: port série/URL ('mock': données du backend mock) et spec backend")
+    parser.add_argument('--cycles', type=int, default=10)
+    parser.add_argument('--target', default=TARGET_CONTEXT, help="Contexte qui termine un cycle")
+    parser.add_argument('--timeout', type=float, default=BOOT_TIMEOUT)
+    parser.add_argument('--off', type=float, default=OFF_SECONDS, help="Durée de coupure (s)")
+    parser.add_argument('--stagger', type=float, default=STAGGER_SECONDS,
+                        help="Écart minimal entre deux mises sous tension (s)")
+    parser.add_argument('-o', '--output', help="Résultats JSON lines (un cycle par ligne)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    lock = threading.Lock()
+
+    def on_cycle(result):
+        with lock:
+            state = f"{result['phases'][args.target]:.2f} s" if result['reached'] else 'timeout'
+            print(f"{result['board']:12s} cycle {result['cycle']:4d}  {state}")
+            if output:
+                output.write(json.dumps(result, separators=(',', ':')) + '\n')
+                output.flush()
+
+    scheduler = InrushScheduler(args.stagger)
+    cyclers, threads = [], []
+    for name, port, spec in args.board:
+        backend = open_backend(spec)
+        source = backend if port == 'mock' else SerialSource(port)
+        cycler = BootCycler(name, backend, args.target, args.timeout, args.off, on_cycle)
+        cyclers.append(cycler)
+        threads.append(threading.Thread(target=run_board, args=(cycler, source, args.cycles, scheduler),
+                                        daemon=True))
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        print("Interrompu")
+
+    for cycler in cyclers:
+        cycler.backend.close()
+        print(f"\n== {cycler.board}\n{summarize(cycler.results)}")
+    if output:
+        output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
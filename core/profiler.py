@@ -0,0 +1,132 @@
+"""
+Profiler - Profilage du pipeline de détection (patterns, modules, extracteurs)
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from .pipeline import ConsolePipeline
+
+
+class Profiler:
+    """Temps et hits par pattern de détection, module et extracteur
+
+    Les entrées sont indexées par (étape, propriétaire, nom):
+      ('detect', 'uboot_main', r'U-Boot 20\\d\\d')
+      ('module', 'UbootModule', 'process_line')
+      ('extract', 'UbootModule', 'board')
+    """
+
+    def __init__(self):
+        # clé -> [appels, hits, temps total (s)]
+        self.stats: Dict[Tuple[str, str, str], list] = {}
+        self.started = time.time()
+
+    def record(self, stage: str, owner: str, name: str, elapsed: float, hit: bool):
+        key = (stage, owner, name)
+        entry = self.stats.get(key)
+        if entry is None:
+            entry = self.stats[key] = [0, 0, 0.0]
+        entry[0] += 1
+        entry[1] += hit
+        entry[2] += elapsed
+
+    def attach(self, detector, manager):
+        """Active le profilage sur un détecteur et un gestionnaire de modules"""
+        detector.profiler = self
+        manager.set_profiler(self)
+
+    @staticmethod
+    def detach(detector, manager):
+        """Désactive le profilage"""
+        detector.profiler = None
+        manager.set_profiler(None)
+
+    def ranked(self) -> List[Tuple[Tuple[str, str, str], list]]:
+        """Entrées triées par temps total décroissant"""
+        return sorted(self.stats.items(), key=lambda item: item[1][2], reverse=True)
+
+    def report(self, top: int = 30) -> str:
+        """Rapport texte classé par temps total
+
+        Le temps des extracteurs est inclus dans celui du process_line de
+        leur module: le pourcentage est calculé sur detect + modules.
+        """
+        total = sum(entry[2] for (stage, _, _), entry in self.stats.items()
+                    if stage != 'extract') or 1e-12
+        lines = [
+            f"{'stage':8s} {'owner':16s} {'name':32s} {'calls':>9s} {'hits':>8s}"
+            f" {'total ms':>10s} {'µs/call':>8s} {'%':>6s}"
+        ]
+        for (stage, owner, name), (calls, hits, elapsed) in self.ranked()[:top]:
+            lines.append(
+                f"{stage:8s} {owner[:16]:16s} {name[:32]:32s} {calls:9d} {hits:8d}"
+                f" {elapsed * 1000:10.2f} {elapsed / calls * 1e6:8.2f}"
+                f" {elapsed / total * 100:6.1f}"
+            )
+        return '\n'.join(lines)
+
+    def collapsed(self) -> str:
+        """Format "collapsed stacks" (flamegraph.pl, speedscope), en µs
+
+        Les extracteurs sont empilés sous le process_line de leur module,
+        dont seul le temps propre est compté.
+        """
+        children: Dict[str, float] = {}
+        for (stage, owner, _), entry in self.stats.items():
+            if stage == 'extract':
+                children[owner] = children.get(owner, 0.0) + entry[2]
+
+        lines = []
+        for (stage, owner, name), (calls, hits, elapsed) in self.ranked():
+            if stage == 'extract':
+                frames = ['pipeline', 'module', owner, 'process_line', name]
+            else:
+                frames = ['pipeline', stage, owner, name]
+                if stage == 'module':
+                    elapsed = max(elapsed - children.get(owner, 0.0), 0.0)
+            stack = ';'.join(f.replace(';', ',').replace('\n', ' ') for f in frames)
+            lines.append(f"{stack} {max(int(elapsed * 1e6), 1)}")
+        return '\n'.join(lines) + '\n'
+
+
+def replay(path: str, profiler: Profiler, chunk_size: int = 4096) -> ConsolePipeline:
+    """Rejoue une capture à travers le pipeline profilé"""
+    pipeline = ConsolePipeline()
+    profiler.attach(pipeline.detector, pipeline.manager)
+
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            pipeline.feed(chunk)
+    pipeline.finish()
+
+    return pipeline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profilage du pipeline sur une capture")
+    parser.add_argument('capture', help="Fichier de log console à rejouer")
+    parser.add_argument('--top', type=int, default=30, help="Nombre d'entrées du rapport")
+    parser.add_argument('--collapsed', help="Écrit le format flamegraph dans ce fichier")
+    args = parser.parse_args(argv)
+
+    profiler = Profiler()
+    start = time.perf_counter()
+    pipeline = replay(args.capture, profiler)
+    elapsed = time.perf_counter() - start
+
+    print(f"{pipeline.line_count} lignes en {elapsed:.2f} s\n")
+    print(profiler.report(args.top))
+
+    if args.collapsed:
+        with open(args.collapsed, 'w', encoding='utf-8') as f:
+            f.write(profiler.collapsed())
+        print(f"\nFlamegraph: {args.collapsed}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
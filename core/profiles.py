@@ -0,0 +1,265 @@
+"""
+Profiles - Définitions de contextes et modules en TOML/YAML avec rechargement à chaud
+"""
+import importlib.util
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .context_detector import ContextDetector, ContextType
+from .module_manager import ModuleManager
+from .regex_safety import UnsafePattern, compile_pattern
+
+try:
+    import tomllib
+    TOML_AVAILABLE = True
+except ImportError:
+    try:
+        import tomli as tomllib
+        TOML_AVAILABLE = True
+    except ImportError:
+        TOML_AVAILABLE = False
+
+# PyYAML importé au premier profil YAML seulement (coûteux au démarrage)
+YAML_AVAILABLE = importlib.util.find_spec('yaml') is not None
+
+
+PROFILE_EXTENSIONS = ('.toml', '.yaml', '.yml')
+
+
+class ProfileError(ValueError):
+    """Profil invalide"""
+
+
+@dataclass
+class CompiledProfile:
+    """Tables de détection compilées depuis un ou plusieurs profils"""
+    patterns: Tuple = ()
+    prompts: Dict = field(default_factory=dict)
+    versions: Dict = field(default_factory=dict)
+    context_modules: Dict[str, List[str]] = field(default_factory=dict)
+    module_commands: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    sources: List[str] = field(default_factory=list)
+    compile_ms: float = 0.0
+
+
+def _read_document(path: str) -> dict:
+    """Lit un fichier de profil TOML ou YAML"""
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.toml':
+        if not TOML_AVAILABLE:
+            raise ProfileError(f"{path}: tomllib non disponible")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+
+    if not YAML_AVAILABLE:
+        raise ProfileError(f"{path}: PyYAML non installé")
+    import yaml
+
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            return yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ProfileError(f"{path}: YAML invalide ({e})")
+
+
+def _compile_regex(path: str, where: str, pattern, flags=0):
+    """Compile une regex en rapportant l'emplacement en cas d'erreur"""
+    if not isinstance(pattern, str):
+        raise ProfileError(f"{path}: {where}: regex attendue, reçu {pattern!r}")
+    try:
+        return compile_pattern(pattern, flags)
+    except re.error as e:
+        raise ProfileError(f"{path}: {where}: regex invalide {pattern!r} ({e})")
+    except UnsafePattern as e:
+        raise ProfileError(f"{path}: {where}: regex refusée {e}")
+
+
+def _string_list(path: str, where: str, value) -> List[str]:
+    """Valide une liste de chaînes"""
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ProfileError(f"{path}: {where}: liste de chaînes attendue")
+    return list(value)
+
+
+def merge_document(compiled: CompiledProfile, doc: dict, path: str):
+    """Valide un document de profil et le fusionne dans les tables compilées
+
+    Les patterns s'ajoutent à ceux des profils précédents, les prompts,
+    versions, modules et commandes les remplacent.
+    """
+    if not isinstance(doc, dict):
+        raise ProfileError(f"{path}: document racine invalide")
+
+    unknown = set(doc) - {'contexts', 'modules'}
+    if unknown:
+        raise ProfileError(f"{path}: sections inconnues {sorted(unknown)}")
+
+    patterns = {ctx: list(pats) for ctx, pats in compiled.patterns}
+
+    contexts = doc.get('contexts', {})
+    if not isinstance(contexts, dict):
+        raise ProfileError(f"{path}: [contexts] doit être une table")
+
+    for name, spec in contexts.items():
+        try:
+            context_type = ContextType(name)
+        except ValueError:
+            raise ProfileError(f"{path}: contexte inconnu '{name}'")
+        if not isinstance(spec, dict):
+            raise ProfileError(f"{path}: contexts.{name} doit être une table")
+
+        for i, entry in enumerate(spec.get('patterns', [])):
+            where = f"contexts.{name}.patterns[{i}]"
+            if not isinstance(entry, (list, tuple)) or len(entry) != 2:
+                raise ProfileError(f"{path}: {where}: [regex, poids] attendu")
+            regex, weight = entry
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise ProfileError(f"{path}: {where}: poids numérique attendu")
+            compiled_re = _compile_regex(path, where, regex, re.IGNORECASE)
+            patterns.setdefault(context_type, []).append((compiled_re, float(weight)))
+
+        if 'prompt' in spec:
+            regex = _compile_regex(path, f"contexts.{name}.prompt", spec['prompt'])
+            if regex.groups < 1:
+                raise ProfileError(f"{path}: contexts.{name}.prompt: groupe de capture requis")
+            compiled.prompts[context_type] = regex
+
+        if 'version' in spec:
+            regex = _compile_regex(path, f"contexts.{name}.version", spec['version'])
+            if regex.groups < 1:
+                raise ProfileError(f"{path}: contexts.{name}.version: groupe de capture requis")
+            compiled.versions[context_type] = regex
+
+        if 'modules' in spec:
+            compiled.context_modules[name] = _string_list(
+                path, f"contexts.{name}.modules", spec['modules'])
+
+    modules = doc.get('modules', {})
+    if not isinstance(modules, dict):
+        raise ProfileError(f"{path}: [modules] doit être une table")
+
+    for module_name, spec in modules.items():
+        if not isinstance(spec, dict):
+            raise ProfileError(f"{path}: modules.{module_name} doit être une table")
+        commands = spec.get('commands', {})
+        if not isinstance(commands, dict):
+            raise ProfileError(f"{path}: modules.{module_name}.commands doit être une table")
+        target = compiled.module_commands.setdefault(module_name, {})
+        for category, cmds in commands.items():
+            target[category] = _string_list(
+                path, f"modules.{module_name}.commands.{category}", cmds)
+
+    compiled.patterns = tuple((ctx, tuple(pats)) for ctx, pats in patterns.items())
+    compiled.sources.append(path)
+
+
+def list_profiles(path: str) -> List[str]:
+    """Liste les fichiers de profil d'un répertoire (ou le fichier lui-même)"""
+    if os.path.isfile(path):
+        return [path]
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.lower().endswith(PROFILE_EXTENSIONS)
+    )
+
+
+def load_profiles(path: str) -> CompiledProfile:
+    """Charge, valide et compile les profils d'un répertoire
+
+    Les fichiers sont fusionnés par ordre alphabétique: un profil de carte
+    (ex. espressobin.toml) peut compléter default.toml.
+    """
+    start = time.perf_counter()
+    compiled = CompiledProfile()
+
+    files = list_profiles(path)
+    if not files:
+        raise ProfileError(f"{path}: aucun profil trouvé")
+
+    for file in files:
+        merge_document(compiled, _read_document(file), file)
+
+    compiled.compile_ms = (time.perf_counter() - start) * 1000
+    return compiled
+
+
+def builtin_profile() -> CompiledProfile:
+    """Profil intégré, construit depuis les littéraux de ContextDetector"""
+    start = time.perf_counter()
+    compiled = CompiledProfile(
+        context_modules=dict(ModuleManager.CONTEXT_MODULES),
+        sources=['<builtin>'],
+    )
+    compiled.patterns, compiled.prompts, compiled.versions = ContextDetector.compile_tables(
+        ContextDetector.PATTERNS,
+        ContextDetector.PROMPT_PATTERNS,
+        ContextDetector.VERSION_PATTERNS,
+    )
+    compiled.compile_ms = (time.perf_counter() - start) * 1000
+    return compiled
+
+
+class ProfileWatcher:
+    """Surveille les profils et les recompile quand ils changent
+
+    `poll()` ne fait qu'un stat() par fichier tant que rien ne change; la
+    recompilation produit un nouveau CompiledProfile qui est appliqué par
+    simple échange de références, sans toucher à la session en cours.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.signature = None
+        self.profile: Optional[CompiledProfile] = None
+        self.last_error: Optional[str] = None
+        self.reload_count = 0
+
+    def _signature(self) -> tuple:
+        """Empreinte (nom, mtime, taille) des fichiers de profil"""
+        signature = []
+        for file in list_profiles(self.path):
+            try:
+                st = os.stat(file)
+            except OSError:
+                continue
+            signature.append((file, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def load(self) -> CompiledProfile:
+        """Chargement initial (profil intégré si aucun fichier utilisable)"""
+        self.signature = self._signature()
+        try:
+            self.profile = load_profiles(self.path)
+            self.last_error = None
+        except (ProfileError, OSError, ValueError) as e:
+            self.last_error = str(e)
+            self.profile = builtin_profile()
+        return self.profile
+
+    def poll(self) -> Optional[CompiledProfile]:
+        """Retourne le nouveau profil si les fichiers ont changé, sinon None
+
+        En cas d'erreur de validation, l'ancien profil reste actif et
+        l'erreur est disponible dans `last_error`.
+        """
+        signature = self._signature()
+        if signature == self.signature:
+            return None
+
+        self.signature = signature
+        try:
+            profile = load_profiles(self.path)
+        except (ProfileError, OSError, ValueError) as e:
+            self.last_error = str(e)
+            return None
+
+        self.last_error = None
+        self.profile = profile
+        self.reload_count += 1
+        return profile
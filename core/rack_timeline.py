@@ -0,0 +1,296 @@
+"""
+Rack Timeline - Transitions de contexte de plusieurs cartes sur un axe commun
+
+Chaque carte (port) est une piste: horodatages des transitions et codes de
+contexte en colonnes `array`. Sources: la session en cours (abonné
+ContextChanged) et les index des journaux de session (`*.index.jsonl`,
+lus de façon incrémentale: seules les lignes ajoutées sont relues, jamais
+les logs bruts).
+
+Le rendu est décimé par pixel: `Track.spans(t0, t1, width)` ne parcourt
+que les transitions visibles et fusionne celles d'une même colonne (coût
+en O(largeur · log n), indépendant du nombre de cycles). Zoomer revient à
+rappeler `spans` avec un autre intervalle.
+
+    python3 -m core.rack_timeline logs/ --target linux_shell
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from .records import CONTEXTS, Interner
+from .session_log import boot_starts
+
+INDEX_SUFFIX = '.index.jsonl'
+# Phase atteinte en fin de boot (classement des cartes lentes)
+TARGET_CONTEXT = 'linux_shell'
+
+
+class Track:
+    """Transitions d'une carte: phase i active de times[i] à times[i + 1]"""
+
+    def __init__(self, name: str, contexts: Interner = CONTEXTS):
+        self.name = name
+        self.contexts = contexts
+        self.times = array('d')
+        self.codes = array('B')
+        self.end = 0.0              # dernière activité connue
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def start(self) -> float:
+        return self.times[0] if self.times else 0.0
+
+    def add(self, context: str, ts: float):
+        """Transition (horodatages croissants, sinon insérée à sa place)"""
+        code = self.contexts.code(context)
+        times = self.times
+        if not times or ts >= times[-1]:
+            times.append(ts)
+            self.codes.append(code)
+        else:
+            i = bisect_right(times, ts)
+            times.insert(i, ts)
+            self.codes.insert(i, code)
+        self.end = max(self.end, ts)
+
+    def touch(self, ts: float):
+        """Activité sans transition (la phase courante s'allonge)"""
+        self.end = max(self.end, ts)
+
+    def spans(self, t0: float, t1: float, width: int) -> List[Tuple[float, float, int, int]]:
+        """Segments à dessiner entre t0 et t1 sur `width` pixels
+
+        (x0, x1, code, nombre de transitions): plusieurs transitions dans
+        une même colonne de pixels donnent un seul segment d'un pixel,
+        coloré par la phase active au bord de la colonne.
+        """
+        times, codes = self.times, self.codes
+        n = len(times)
+        if not n or t1 <= t0 or width <= 0:
+            return []
+        scale = width / (t1 - t0)
+        i = max(bisect_right(times, t0) - 1, 0)
+        start = max(times[i], t0)
+        column = -1                 # dernier bord de pixel atteint (arrondis)
+        spans = []
+        while i < n and start < t1:
+            end = times[i + 1] if i + 1 < n else self.end
+            x0 = (start - t0) * scale
+            x1 = (min(end, t1) - t0) * scale
+            if x1 - x0 >= 1 or i + 1 == n:
+                if x1 > x0:
+                    spans.append((x0, x1, codes[i], 1))
+                i += 1
+                start = end
+                continue
+            # Colonne encombrée: sauter aux transitions après le bord du pixel
+            edge = max(int(x0) + 1, column + 1)
+            column = edge
+            t_edge = t0 + edge / scale
+            j = bisect_left(times, t_edge, i + 1)
+            spans.append((x0, edge, codes[j - 1], j - i))
+            i = j - 1
+            start = t_edge
+        return spans
+
+    def cycles(self) -> List[int]:
+        """Index des transitions qui ouvrent un boot (règle de session_log.boot_starts)"""
+        return boot_starts(map(self.contexts.name, self.codes))
+
+    def cycle_bounds(self, cycle: int = -1) -> Optional[Tuple[int, int]]:
+        """Transitions [début, fin) du boot `cycle` (négatif: depuis la fin)"""
+        starts = self.cycles()
+        if cycle < 0:
+            cycle += len(starts)
+        if not 0 <= cycle < len(starts):
+            return None
+        last = starts[cycle + 1] if cycle + 1 < len(starts) else len(self.codes)
+        return starts[cycle], last
+
+    def reach_time(self, target: str, cycle: int = -1) -> Optional[float]:
+        """Durée du début du boot `cycle` jusqu'à la première entrée dans `target`"""
+        bounds = self.cycle_bounds(cycle)
+        code = self.contexts.codes.get(target)
+        if bounds is None or code is None:
+            return None
+        first, last = bounds
+        for i in range(first, last):
+            if self.codes[i] == code:
+                return self.times[i] - self.times[first]
+        return None
+
+    def phase_durations(self, cycle: int = -1) -> List[Tuple[str, float]]:
+        """(contexte, durée) des phases d'un boot"""
+        bounds = self.cycle_bounds(cycle)
+        if bounds is None:
+            return []
+        first, last = bounds
+        phases = []
+        for i in range(first, last):
+            end = self.times[i + 1] if i + 1 < len(self.times) else self.end
+            phases.append((self.contexts.name(self.codes[i]), end - self.times[i]))
+        return phases
+
+
+class RackTimeline:
+    """Pistes de toutes les cartes, axe de temps commun"""
+
+    def __init__(self, contexts: Interner = CONTEXTS):
+        self.contexts = contexts
+        self.tracks: Dict[str, Track] = {}
+        # Index de journal → position déjà lue
+        self.index_positions: Dict[str, int] = {}
+        self.live_name = None
+        # Pistes suivies en direct: relues en entier depuis leur index ensuite
+        self.followed = set()
+
+    def track(self, name: str) -> Track:
+        track = self.tracks.get(name)
+        if track is None:
+            track = self.tracks[name] = Track(name, self.contexts)
+        return track
+
+    def add(self, name: str, context: str, ts: float):
+        self.track(name).add(context, ts)
+
+    def time_range(self) -> Tuple[float, float]:
+        tracks = [t for t in self.tracks.values() if len(t)]
+        if not tracks:
+            return 0.0, 0.0
+        return min(t.start for t in tracks), max(t.end for t in tracks)
+
+    def on_contexts(self, events):
+        """Abonné ContextChanged (core.events) pour la session en cours"""
+        if self.live_name is None:
+            return
+        track = self.track(self.live_name)
+        for event in events:
+            track.add(event.context.type.value, event.ts)
+
+    def on_lines(self, events):
+        """Abonné LineReceived: prolonge la phase courante de la session"""
+        if self.live_name is not None and events:
+            self.track(self.live_name).touch(events[-1].ts)
+
+    def follow(self, name: str):
+        """Piste de la session en cours (nouveau port: `name` = son port_slug)"""
+        self.live_name = name
+        self.followed.add(name)
+
+    def subscribe(self, bus, name: str):
+        """Session en cours (`name`: port_slug du port, comme ses journaux)"""
+        from .events import ContextChanged, LineReceived
+        self.follow(name)
+        bus.subscribe(ContextChanged, self.on_contexts)
+        bus.subscribe(LineReceived, self.on_lines)
+
+    def load_directory(self, directory: str) -> int:
+        """Lit les transitions ajoutées aux index de journaux; retourne leur nombre"""
+        if not os.path.isdir(directory):
+            return 0
+        added = 0
+        for file in sorted(os.listdir(directory)):
+            name = file[:-len(INDEX_SUFFIX)]
+            # La session en cours est déjà suivie par le bus
+            if file.endswith(INDEX_SUFFIX) and name != self.live_name:
+                added += self.load_index(os.path.join(directory, file), name)
+        return added
+
+    def load_index(self, path: str, name: str) -> int:
+        position = self.index_positions.get(path, 0)
+        if name in self.followed:
+            # Ancienne session en cours: son index contient déjà ses transitions
+            self.followed.discard(name)
+            self.tracks.pop(name, None)
+            position = 0
+        track = self.track(name)
+        added = 0
+        with open(path, 'rb') as f:
+            f.seek(position)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break           # ligne en cours d'écriture, relue au prochain appel
+                position += len(raw)
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                kind = entry.get('type')
+                if kind == 'mark':
+                    track.add(entry['ctx'], entry['t'])
+                    added += 1
+                elif kind == 'frame':
+                    track.touch(entry['t1'])
+                elif kind == 'session':
+                    track.touch(entry['t'])
+        self.index_positions[path] = position
+        return added
+
+    def slowest(self, target: str = TARGET_CONTEXT, cycle: int = -1) -> List[Tuple[str, Optional[float]]]:
+        """Cartes classées par durée pour atteindre `target` (None: pas atteint, en tête)"""
+        ranked = [(name, track.reach_time(target, cycle)) for name, track in self.tracks.items()]
+        return sorted(ranked, key=lambda r: (r[1] is not None, -(r[1] or 0)))
+
+    def render_text(self, width: int = 80, t0: Optional[float] = None,
+                    t1: Optional[float] = None) -> str:
+        """Une ligne par carte, un caractère par colonne (initiale du contexte)"""
+        start, end = self.time_range()
+        t0 = start if t0 is None else t0
+        t1 = end if t1 is None else t1
+        label = max((len(name) for name in self.tracks), default=0)
+        lines = []
+        for name in sorted(self.tracks):
+            row = [' '] * width
+            for x0, x1, code, count in self.tracks[name].spans(t0, t1, width):
+                char = '#' if count > 1 else _context_char(self.contexts.name(code))
+                for x in range(int(x0), min(max(int(x1), int(x0) + 1), width)):
+                    row[x] = char
+            lines.append(f"{name:{label}s} |{''.join(row)}|")
+        lines.append(f"{'':{label}s}  {t1 - t0:.1f} s")
+        return '\n'.join(lines)
+
+
+def _context_char(context: str) -> str:
+    """bootrom → B, atf_bl31 → 3, uboot_main → U, linux_shell → $"""
+    if context.startswith('atf_'):
+        return context[-1]
+    return {'linux_shell': '$', 'linux_init': 'i', 'linux_kernel': 'L', 'unknown': '.'}.get(
+        context, context[:1].upper())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transitions de plusieurs cartes (index de journaux)")
+    parser.add_argument('directory', nargs='+', help="Dossiers de journaux de session")
+    parser.add_argument('--target', default=TARGET_CONTEXT, help="Phase de fin de boot")
+    parser.add_argument('--cycle', type=int, default=-1, help="Boot à classer (négatif: depuis la fin)")
+    parser.add_argument('--width', type=int, default=100)
+    parser.add_argument('--last', type=float, default=None, metavar='S',
+                        help="N'affiche que les S dernières secondes")
+    args = parser.parse_args(argv)
+
+    rack = RackTimeline()
+    start = time.perf_counter()
+    count = sum(rack.load_directory(directory) for directory in args.directory)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    t0, t1 = rack.time_range()
+    if args.last:
+        t0 = max(t0, t1 - args.last)
+    print(rack.render_text(args.width, t0, t1))
+    print(f"\n{len(rack.tracks)} cartes, {count} transitions ({load_ms:.1f} ms)")
+    print(f"\nBoot {args.cycle} → {args.target}:")
+    for name, seconds in rack.slowest(args.target, args.cycle):
+        print(f"  {name:24s} {'non atteint' if seconds is None else f'{seconds:8.2f} s'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""
+Records - Lignes et événements conservés en colonnes compactes
+
+Une ligne conservée coûte son texte UTF-8 dans un bytearray partagé plus
+quelques octets de colonnes `array` (offset, horodatages mural et
+monotone, code de contexte, code de port), au lieu d'un objet Python, d'un str et d'un dict par ligne.
+Contextes, ports et clés sont internés en petits entiers.
+
+Les colonnes servent aussi d'index pour les vues filtrées (contexte,
+fenêtre de temps, port): `runs()` donne les plages de lignes retenues sans
+relancer la détection, `view()` leur texte (une tranche du bytearray par
+plage, les lignes y sont stockées terminées par '\n').
+
+    store = LineStore(max_bytes=64 * 2**20)
+    bus.subscribe(LineReceived, store.on_lines)
+    store.line(-1), store.context(-1), store.ts(-1)
+    store.view(store.runs(contexts={'linux_kernel'}, t0=time.time() - 60))
+"""
+import re
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .context_detector import ContextType
+from .events import ContextChanged, HardwareFact, Alert, CommandDiscovered, CommandSent
+
+# Mémoire retenue par défaut (texte des lignes), au-delà les plus anciennes sont oubliées
+RETAIN_BYTES = 64 * 2**20
+MAX_TEXT = 2**32 - 1
+# Ports distincts d'un LineStore: codes sur un octet (filtre par table de traduction)
+MAX_PORTS = 256
+
+
+class Interner:
+    """Chaînes ↔ petits entiers (contextes, ports, clés matérielles)"""
+    __slots__ = ('codes', 'names')
+
+    def __init__(self, names=()):
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+        for name in names:
+            self.code(name)
+
+    def code(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def name(self, code: int) -> str:
+        return self.names[code]
+
+    def __len__(self):
+        return len(self.names)
+
+
+# Codes des contextes connus (stables: ordre de ContextType); les
+# contextes ajoutés par profil reçoivent les codes suivants
+CONTEXTS = Interner(ct.value for ct in ContextType)
+
+
+class LineRecord:
+    """Vue d'une ligne conservée (construite à la demande)"""
+    __slots__ = ('number', 'line', 'context', 'ts', 'port')
+
+    def __init__(self, number: int, line: str, context: str, ts: float, port: str):
+        self.number = number
+        self.line = line
+        self.context = context
+        self.ts = ts
+        self.port = port
+
+    def __repr__(self):
+        return f"LineRecord({self.number}, {self.context}, {self.ts:.3f}, {self.line!r})"
+
+
+class LineStore:
+    """Lignes conservées en colonnes (texte, offset, horodatage, contexte, port)
+
+    Les numéros de ligne sont absolus: quand `max_bytes` est dépassé, la
+    plus ancienne moitié est oubliée et `first` avance. Offsets sur 32 bits:
+    le texte conservé est toujours borné à 4 Go.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = RETAIN_BYTES, contexts: Interner = CONTEXTS):
+        self.max_bytes = min(max_bytes or MAX_TEXT, MAX_TEXT)
+        self.contexts = contexts
+        self.ports = Interner()
+        self.text = bytearray()
+        self.offsets = array('I', [0])     # début de chaque ligne dans text, + fin
+        self.times = array('d')
+        # Horloge monotone à l'arrivée: un Pi sans RTC voit son horloge murale
+        # sauter au premier NTP, les fenêtres de temps bisectent celle-ci
+        self.clocks = array('d')
+        self.context_codes = array('B')
+        self.port_codes = array('B')        # codes < MAX_PORTS (voir _select)
+        self.first = 1                      # numéro absolu de la ligne d'index 0
+        self.current_port = ''              # port des lignes reçues via on_lines
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def last(self) -> int:
+        """Numéro de la dernière ligne conservée"""
+        return self.first + len(self.times) - 1
+
+    def append(self, line: str, context: str, ts: float, port: str = ''):
+        port_code = self.port_code(port)
+        data = line.encode('utf-8')
+        self.text += data
+        self.text += b'\n'
+        self.offsets.append(len(self.text))
+        self.times.append(ts)
+        self.clocks.append(time.monotonic())
+        self.context_codes.append(self.contexts.code(context))
+        self.port_codes.append(port_code)
+        if len(self.text) > self.max_bytes:
+            self.trim(len(self.times) // 2)
+
+    def extend(self, lines: List[str], contexts: List[str], ts: float, port: str = ''):
+        """Lot de lignes d'un même chunk (un seul encodage si ASCII)"""
+        if not lines:
+            return
+        port_code = self.port_code(port)
+        joined = '\n'.join(lines) + '\n'
+        data = joined.encode('utf-8')
+        end = len(self.text)
+        if len(data) == len(joined):
+            # ASCII: longueurs en octets = longueurs en caractères
+            for line in lines:
+                end += len(line) + 1
+                self.offsets.append(end)
+        else:
+            for line in lines:
+                end += len(line.encode('utf-8')) + 1
+                self.offsets.append(end)
+        self.text += data
+
+        code = self.contexts.code
+        self.context_codes.extend(code(context) for context in contexts)
+        count = len(lines)
+        self.times.extend((ts,) * count)
+        self.clocks.extend((time.monotonic(),) * count)
+        self.port_codes.extend((port_code,) * count)
+        if len(self.text) > self.max_bytes:
+            self.trim(len(self.times) // 2)
+
+    def on_lines(self, events):
+        """Abonné LineReceived (core.events)"""
+        code = self.contexts.code
+        offsets, times, context_codes, port_codes = self.offsets, self.times, self.context_codes, self.port_codes
+        port = self.port_code(self.current_port)
+        text = self.text
+        for event in events:
+            text += event.line.encode('utf-8')
+            text += b'\n'
+            offsets.append(len(text))
+            times.append(event.ts)
+            context_codes.append(code(event.context))
+            port_codes.append(port)
+        self.clocks.extend((time.monotonic(),) * len(events))
+        if len(text) > self.max_bytes:
+            self.trim(len(times) // 2)
+
+    def port_code(self, port: str) -> int:
+        """Code d'un port (ValueError au-delà de MAX_PORTS ports distincts)"""
+        code = self.ports.codes.get(port)
+        if code is None:
+            if len(self.ports) >= MAX_PORTS:
+                raise ValueError(f"port {port!r}: plus de {MAX_PORTS} ports dans un même LineStore")
+            code = self.ports.code(port)
+        return code
+
+    def trim(self, count: int):
+        """Oublie les `count` plus anciennes lignes"""
+        count = min(count, len(self.times))
+        if count <= 0:
+            return
+        cut = self.offsets[count]
+        del self.text[:cut]
+        self.offsets = array('I', (offset - cut for offset in self.offsets[count:]))
+        del self.times[:count]
+        del self.clocks[:count]
+        del self.context_codes[:count]
+        del self.port_codes[:count]
+        self.first += count
+
+    def index(self, number: int) -> int:
+        """Index interne d'un numéro de ligne (négatif: depuis la fin)"""
+        i = len(self.times) + number if number < 0 else number - self.first
+        if not 0 <= i < len(self.times):
+            raise IndexError(f"ligne {number} hors des lignes conservées ({self.first}..{self.last})")
+        return i
+
+    def line(self, number: int) -> str:
+        i = self.index(number)
+        return self.text[self.offsets[i]:self.offsets[i + 1] - 1].decode('utf-8')
+
+    def context(self, number: int) -> str:
+        return self.contexts.name(self.context_codes[self.index(number)])
+
+    def ts(self, number: int) -> float:
+        return self.times[self.index(number)]
+
+    def port(self, number: int) -> str:
+        return self.ports.name(self.port_codes[self.index(number)])
+
+    def age(self, number: int) -> float:
+        """Secondes depuis l'arrivée de la ligne (horloge monotone)"""
+        return time.monotonic() - self.clocks[self.index(number)]
+
+    def record(self, number: int) -> LineRecord:
+        i = self.index(number)
+        return LineRecord(self.first + i, self.text[self.offsets[i]:self.offsets[i + 1] - 1].decode('utf-8'),
+                          self.contexts.name(self.context_codes[i]), self.times[i],
+                          self.ports.name(self.port_codes[i]))
+
+    def __iter__(self) -> Iterator[LineRecord]:
+        for i in range(len(self.times)):
+            yield self.record(self.first + i)
+
+    def runs(self, contexts: Optional[Iterable[str]] = None, t0: Optional[float] = None,
+             t1: Optional[float] = None, port: Optional[str] = None,
+             since: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Plages d'index [début, fin) des lignes retenues par le filtre
+
+        Fenêtre de temps par bisection sur l'horloge monotone: `t0`/`t1`
+        sont des heures murales, converties avec l'écart mural/monotone du
+        moment (un saut NTP passé ne décale pas la fenêtre). Contexte et
+        port par une table de traduction sur la colonne de codes puis une
+        recherche des plages de 1: les contextes se suivent par blocs, le
+        coût est celui d'un balayage en C de la colonne. `since`: numéro de
+        la première ligne à considérer (suite d'une vue déjà affichée).
+        """
+        clocks = self.clocks
+        offset = time.time() - time.monotonic()
+        lo = bisect_left(clocks, t0 - offset) if t0 is not None else 0
+        hi = bisect_left(clocks, t1 - offset) if t1 is not None else len(clocks)
+        if since is not None:
+            lo = max(lo, since - self.first)
+        if lo >= hi:
+            return []
+        runs = [(lo, hi)]
+        if contexts is not None:
+            wanted = {self.contexts.codes[c] for c in contexts if c in self.contexts.codes}
+            runs = _select(self.context_codes, wanted, runs)
+        if port is not None:
+            code = self.ports.codes.get(port)
+            runs = _select(self.port_codes, set() if code is None else {code}, runs)
+        return runs
+
+    def view(self, runs: List[Tuple[int, int]], max_bytes: Optional[int] = None) -> str:
+        """Texte des plages (les plus récentes si `max_bytes` est dépassé)"""
+        offsets, text = self.offsets, self.text
+        parts = []
+        size = 0
+        for start, end in reversed(runs):
+            a, b = offsets[start], offsets[end]
+            if max_bytes is not None and size + b - a > max_bytes:
+                a = b - (max_bytes - size)
+                # Reprendre au début d'une ligne
+                a = offsets[bisect_left(offsets, a, start, end)]
+                parts.append(text[a:b])
+                break
+            parts.append(text[a:b])
+            size += b - a
+        return b''.join(reversed(parts)).decode('utf-8', errors='replace')
+
+    def sizes(self, runs: List[Tuple[int, int]], max_bytes: Optional[int] = None) -> List[Tuple[int, int]]:
+        """(numéro, octets) des lignes des plages, comme `view` (les plus récentes)"""
+        offsets, first = self.offsets, self.first
+        sizes = []
+        size = 0
+        for start, end in reversed(runs):
+            for i in range(end - 1, start - 1, -1):
+                length = offsets[i + 1] - offsets[i]
+                if max_bytes is not None and size + length > max_bytes:
+                    sizes.reverse()
+                    return sizes
+                sizes.append((first + i, length))
+                size += length
+        sizes.reverse()
+        return sizes
+
+    def nbytes(self) -> int:
+        """Mémoire des colonnes (hors surallocation)"""
+        return (len(self.text) + self.offsets.itemsize * len(self.offsets)
+                + self.times.itemsize * len(self.times) + self.clocks.itemsize * len(self.clocks)
+                + len(self.context_codes) + len(self.port_codes))
+
+
+def _select(codes: array, wanted: set, runs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sous-plages de `runs` dont le code est dans `wanted`"""
+    if not wanted:
+        return []
+    table = bytes(1 if code in wanted else 0 for code in range(256))
+    selected = []
+    for lo, hi in runs:
+        marks = codes[lo:hi].tobytes().translate(table)
+        selected.extend((lo + m.start(), lo + m.end()) for m in _ONES.finditer(marks))
+    return selected
+
+
+_ONES = re.compile(b'\x01+')
+
+
+# Types d'enregistrements d'événements
+EVENT_KINDS = Interner(('context', 'hardware', 'alert', 'command', 'sent'))
+
+
+class EventStore:
+    """Événements conservés en colonnes: type, ligne, horodatage, clé, valeur
+
+    Les clés (nom matériel, contexte) sont internées; les valeurs sont
+    concaténées en UTF-8 comme le texte de LineStore.
+    """
+
+    def __init__(self):
+        self.keys = Interner()
+        self.kinds = array('B')
+        self.numbers = array('I')
+        self.times = array('d')
+        self.key_codes = array('H')
+        self.values = bytearray()
+        self.offsets = array('I', [0])
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind: str, number: int, ts: float, key: str = '', value: str = ''):
+        self.kinds.append(EVENT_KINDS.code(kind))
+        self.numbers.append(number)
+        self.times.append(ts)
+        self.key_codes.append(self.keys.code(key))
+        self.values += str(value).encode('utf-8')
+        self.offsets.append(len(self.values))
+
+    def get(self, i: int) -> Tuple[str, int, float, str, str]:
+        """(type, ligne, horodatage, clé, valeur)"""
+        return (EVENT_KINDS.name(self.kinds[i]), self.numbers[i], self.times[i],
+                self.keys.name(self.key_codes[i]),
+                self.values[self.offsets[i]:self.offsets[i + 1]].decode('utf-8'))
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self.get(i)
+
+    # Abonnés core.events
+    def on_contexts(self, events):
+        for e in events:
+            self.add('context', e.number, e.ts, e.context.type.value)
+
+    def on_facts(self, events):
+        for e in events:
+            # Faits structurés (profil de carte): persistés par core.board_profile
+            if not isinstance(e.value, (dict, list)):
+                self.add('hardware', e.number, e.ts, e.key, e.value)
+
+    def on_alerts(self, events):
+        for e in events:
+            self.add('alert', e.number, e.ts, e.context, e.message)
+
+    def on_commands(self, events):
+        for e in events:
+            self.add('command', e.number, e.ts, e.context, e.command)
+
+    def on_sent(self, events):
+        for e in events:
+            self.add('sent', 0, e.ts, e.port, e.command)
+
+    def subscribe(self, bus):
+        """Abonne le store à tous les événements hors lignes"""
+        bus.subscribe(ContextChanged, self.on_contexts)
+        bus.subscribe(HardwareFact, self.on_facts)
+        bus.subscribe(Alert, self.on_alerts)
+        bus.subscribe(CommandDiscovered, self.on_commands)
+        bus.subscribe(CommandSent, self.on_sent)
@@ -0,0 +1,552 @@
+"""
+Regex Safety - Patterns utilisateur à coût borné par ligne
+
+Le moteur `re` revient en arrière: un pattern comme `(\\w+\\s?)+$` devient
+exponentiel sur du bruit console (binaire à la mauvaise vitesse, lignes
+sans fin). Trois garde-fous:
+
+- analyse statique de l'arbre `re._parser` avant compilation: refus des
+  répétitions imbriquées sans séparateur (`(a+)+`, `(.*,)*`), des
+  alternatives sous une répétition aux premiers caractères communs
+  (`(a|aa)+`, `(a|b|ab)+`) et des chaînes de
+  3 répétitions ou plus qui se recouvrent (`.*.*.*x`, polynomial);
+- moteur RE2 optionnel (temps linéaire) avec PIDEBUGGER_REGEX_ENGINE=re2,
+  si le paquet `google-re2` est installé; les constructions que RE2 ne
+  connaît pas (références arrière, lookarounds) restent sur `re`;
+- longueur de ligne plafonnée avant détection (PIDEBUGGER_MAX_LINE): le
+  coût polynomial restant est borné par ce plafond.
+
+    python3 -m core.regex_safety '(\\w+\\s?)+$' --profiles profiles/
+"""
+import argparse
+import os
+import re
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:                     # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+from .metrics import METRICS
+
+# Caractères d'une ligne vus par la détection et les modules
+MAX_LINE_LENGTH = int(os.environ.get('PIDEBUGGER_MAX_LINE', '1024'))
+# 're' (défaut) ou 're2' (si installé)
+REGEX_ENGINE = os.environ.get('PIDEBUGGER_REGEX_ENGINE', 're')
+# Répétitions consécutives qui se recouvrent à partir desquelles on refuse
+MAX_OVERLAPPING_REPEATS = 3
+# Borne jusqu'à laquelle une répétition sans répétition infinie à l'intérieur
+# est acceptée telle quelle: au plus (découpages d'un passage) ** borne essais
+MAX_BOUNDED_REPEAT = 8
+
+REGEX_REJECTED = METRICS.counter('pidebugger_regex_rejected_total',
+                                 'Regex refusées (retour arrière non borné)')
+LINES_CLIPPED = METRICS.counter('pidebugger_lines_clipped_total',
+                                'Lignes tronquées à MAX_LINE_LENGTH avant détection')
+
+
+class UnsafePattern(ValueError):
+    """Regex au retour arrière exponentiel (ou polynomial de degré élevé)"""
+
+
+class LinearPattern:
+    """Regex RE2 avec l'interface des re.Pattern utilisée par les modules"""
+
+    __slots__ = ('pattern', 'flags', 'groups', 'search', 'match', 'finditer', 'sub')
+
+    # Drapeaux re traduits en drapeaux en ligne RE2
+    INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+
+    def __init__(self, pattern: str, flags: int = 0):
+        inline = ''.join(letter for flag, letter in self.INLINE_FLAGS if flags & flag)
+        compiled = re2.compile(f'(?{inline}){pattern}' if inline else pattern)
+        self.pattern = pattern
+        self.flags = flags
+        self.groups = compiled.groups
+        self.search = compiled.search
+        self.match = compiled.match
+        self.finditer = compiled.finditer
+        self.sub = compiled.sub
+
+    def __repr__(self):
+        return f"LinearPattern({self.pattern!r})"
+
+
+def clip(line: str) -> str:
+    """Ligne plafonnée à MAX_LINE_LENGTH caractères"""
+    if len(line) <= MAX_LINE_LENGTH:
+        return line
+    if METRICS.enabled:
+        LINES_CLIPPED.inc()
+    return line[:MAX_LINE_LENGTH]
+
+
+def compile_pattern(pattern: str, flags: int = 0):
+    """Compile une regex utilisateur (re.error si invalide, UnsafePattern si refusée)"""
+    reason = check_pattern(pattern, flags)
+    if reason:
+        REGEX_REJECTED.inc()
+        raise UnsafePattern(f"{pattern!r}: {reason}")
+    if REGEX_ENGINE == 're2' and RE2_AVAILABLE:
+        try:
+            return LinearPattern(pattern, flags)
+        except re2.error:
+            pass                        # construction propre à re
+    return re.compile(pattern, flags)
+
+
+# --- Analyse statique -------------------------------------------------------
+
+_LITERAL = sre_constants.LITERAL
+_NOT_LITERAL = sre_constants.NOT_LITERAL
+_IN = sre_constants.IN
+_ANY = sre_constants.ANY
+_RANGE = sre_constants.RANGE
+_NEGATE = sre_constants.NEGATE
+_CATEGORY = sre_constants.CATEGORY
+_SUBPATTERN = sre_constants.SUBPATTERN
+_BRANCH = sre_constants.BRANCH
+_ASSERTS = (sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+_GROUPREF_EXISTS = sre_constants.GROUPREF_EXISTS
+# Répétitions avec retour arrière (les possessives et groupes atomiques
+# de Python 3.11 n'en ont pas)
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_POSSESSIVE = getattr(sre_constants, 'POSSESSIVE_REPEAT', None)
+_ATOMIC = getattr(sre_constants, 'ATOMIC_GROUP', None)
+_MAXREPEAT = sre_constants.MAXREPEAT
+
+# Ensembles de caractères en masques d'entiers: bits 0-255 pour Latin-1,
+# puis un caractère témoin par classe Unicode (lettre grecque, chiffre arabe,
+# espace cadratin, tiret cadratin, idéogramme) et un bit pour tout autre
+_SAMPLES = (0x3b1, 0x661, 0x2003, 0x2014, 0x4e00)
+_OTHER = 1 << (256 + len(_SAMPLES))
+_ALL = (_OTHER << 1) - 1
+_NEWLINE = 1 << 10
+
+
+def _bit(code: int) -> int:
+    if code < 256:
+        return 1 << code
+    if code in _SAMPLES:
+        return 1 << (256 + _SAMPLES.index(code))
+    return _OTHER
+
+
+def _category_masks() -> dict:
+    masks = {}
+    for name, regex in (('DIGIT', r'\d'), ('NOT_DIGIT', r'\D'), ('SPACE', r'\s'),
+                        ('NOT_SPACE', r'\S'), ('WORD', r'\w'), ('NOT_WORD', r'\W')):
+        compiled = re.compile(regex)
+        mask = 0
+        for code in (*range(256), *_SAMPLES):
+            if compiled.match(chr(code)):
+                mask |= _bit(code)
+        masks[getattr(sre_constants, 'CATEGORY_' + name)] = mask | (_OTHER if name != 'SPACE' else 0)
+    return masks
+
+
+_CATEGORIES = _category_masks()
+
+
+def _literal(code: int, flags: int) -> int:
+    mask = _bit(code)
+    if flags & re.IGNORECASE:
+        for variant in (chr(code).lower(), chr(code).upper()):
+            mask |= _bit(ord(variant[0]))
+    return mask
+
+
+def _class_mask(items, flags: int) -> int:
+    mask = 0
+    negate = False
+    for op, av in items:
+        if op is _NEGATE:
+            negate = True
+        elif op is _LITERAL:
+            mask |= _literal(av, flags)
+        elif op is _RANGE:
+            low, high = av
+            for code in range(low, min(high, 255) + 1):
+                mask |= _literal(code, flags)
+            if high > 255:
+                mask |= _OTHER
+                for code in _SAMPLES:
+                    if low <= code <= high:
+                        mask |= _bit(code)
+        elif op is _CATEGORY:
+            mask |= _CATEGORIES.get(av, _ALL)
+        else:
+            mask = _ALL
+    return _ALL & ~mask | _OTHER if negate else mask
+
+
+def _char_mask(op, av, flags: int) -> Optional[int]:
+    """Masque d'un nœud qui consomme exactement un caractère (None sinon)"""
+    if op is _LITERAL:
+        return _literal(av, flags)
+    if op is _NOT_LITERAL:
+        return (_ALL & ~_literal(av, flags)) | _OTHER
+    if op is _IN:
+        return _class_mask(av, flags)
+    if op is _ANY:
+        return _ALL if flags & re.DOTALL else _ALL & ~_NEWLINE
+    return None
+
+
+def _scoped(flags: int, av) -> int:
+    """Drapeaux dans un groupe (?i:...)"""
+    _, add, remove, _ = av
+    return (flags | add) & ~remove
+
+
+def _children(op, av, flags: int) -> Iterator[Tuple[list, int]]:
+    """Sous-séquences d'un nœud (hors répétitions)"""
+    if op is _SUBPATTERN:
+        yield av[3], _scoped(flags, av)
+    elif op is _BRANCH:
+        for branch in av[1]:
+            yield branch, flags
+    elif op in _ASSERTS:
+        yield av[1], flags
+    elif op is _GROUPREF_EXISTS:
+        yield av[1], flags
+        if av[2] is not None:
+            yield av[2], flags
+    elif op is _ATOMIC:
+        yield av, flags
+    elif op is _POSSESSIVE:
+        yield av[2], flags
+
+
+def _nullable(items) -> bool:
+    return all(_item_nullable(op, av) for op, av in items)
+
+
+def _item_nullable(op, av) -> bool:
+    if op in (_LITERAL, _NOT_LITERAL, _IN, _ANY):
+        return False
+    if op is _SUBPATTERN:
+        return _nullable(av[3])
+    if op is _ATOMIC:
+        return _nullable(av)
+    if op is _BRANCH:
+        return any(_nullable(branch) for branch in av[1])
+    if op in _REPEATS or op is _POSSESSIVE:
+        return av[0] == 0 or _nullable(av[2])
+    return True                         # ancres, assertions, références arrière
+
+
+def _first(items, flags: int, last: bool = False) -> int:
+    """Premiers (ou derniers) caractères possibles d'une séquence"""
+    mask = 0
+    for op, av in (reversed(list(items)) if last else items):
+        char = _char_mask(op, av, flags)
+        if char is not None:
+            return mask | char
+        if op in _REPEATS or op is _POSSESSIVE:
+            mask |= _first(av[2], flags, last)
+        elif op is _BRANCH or op is _SUBPATTERN or op is _ATOMIC:
+            for child, child_flags in _children(op, av, flags):
+                mask |= _first(child, child_flags, last)
+        elif op not in _ASSERTS and op is not sre_constants.AT:
+            mask |= _ALL                # références arrière: inconnu
+        if not _item_nullable(op, av):
+            break
+    return mask
+
+
+def _chars(items, flags: int) -> int:
+    """Tous les caractères qu'une séquence peut consommer"""
+    mask = 0
+    for op, av in items:
+        char = _char_mask(op, av, flags)
+        if char is not None:
+            mask |= char
+        elif op in _REPEATS:
+            mask |= _chars(av[2], flags)
+        elif op not in _ASSERTS:
+            for child, child_flags in _children(op, av, flags):
+                mask |= _chars(child, child_flags)
+    return mask
+
+
+def _mandatory(items, flags: int, skip) -> Iterator[int]:
+    """Caractères consommés à chaque passage dans la séquence, hors du nœud `skip`"""
+    for item in items:
+        if item is skip:
+            continue
+        op, av = item
+        char = _char_mask(op, av, flags)
+        if char is not None:
+            yield char
+        elif op is _SUBPATTERN or op is _ATOMIC:
+            for child, child_flags in _children(op, av, flags):
+                yield from _mandatory(child, child_flags, skip)
+        elif (op in _REPEATS or op is _POSSESSIVE) and av[0] > 0:
+            yield from _mandatory(av[2], flags, skip)
+
+
+def _repeats(items, flags: int) -> Iterator[Tuple[tuple, int]]:
+    """Répétitions avec retour arrière de l'arbre: (nœud, drapeaux)"""
+    for item in items:
+        op, av = item
+        if op in _REPEATS:
+            yield item, flags
+            yield from _repeats(av[2], flags)
+        else:
+            for child, child_flags in _children(op, av, flags):
+                yield from _repeats(child, child_flags)
+
+
+def _branches(items, flags: int) -> Iterator[Tuple[list, int]]:
+    """Alternatives de l'arbre (hors assertions)"""
+    for op, av in items:
+        if op is _BRANCH:
+            yield av[1], flags
+        if op in _REPEATS:
+            yield from _branches(av[2], flags)
+        elif op not in _ASSERTS:
+            for child, child_flags in _children(op, av, flags):
+                yield from _branches(child, child_flags)
+
+
+def _sequences(items, flags: int) -> Iterator[Tuple[list, int]]:
+    """Toutes les séquences de l'arbre"""
+    yield items, flags
+    for op, av in items:
+        if op in _REPEATS:
+            yield from _sequences(av[2], flags)
+        else:
+            for child, child_flags in _children(op, av, flags):
+                yield from _sequences(child, child_flags)
+
+
+def _variable_parts(items, flags: int) -> Iterator[Tuple[tuple, int]]:
+    """Nœuds de longueur variable: répétitions, alternatives dont une est vide
+
+    Les groupes atomiques et répétitions possessives ne reviennent pas en
+    arrière: leur contenu n'est pas redécoupé.
+    """
+    for item in items:
+        op, av = item
+        if op in _REPEATS:
+            if av[0] != av[1]:
+                yield item, flags
+            yield from _variable_parts(av[2], flags)
+        elif op is _BRANCH:
+            if any(not branch or _nullable(branch) for branch in av[1]):
+                yield item, flags
+            for branch in av[1]:
+                yield from _variable_parts(branch, flags)
+        elif op is _SUBPATTERN or op is _GROUPREF_EXISTS:
+            for child, child_flags in _children(op, av, flags):
+                yield from _variable_parts(child, child_flags)
+
+
+def _nested_repeat(body, flags: int) -> Optional[str]:
+    """Une partie de longueur variable sans séparateur obligatoire
+
+    Sans caractère obligatoire absent de cette partie, une suite de ses
+    caractères se découpe en passages de toutes les façons possibles.
+    """
+    for item, inner_flags in _variable_parts(body, flags):
+        chars = _chars([item], inner_flags)
+        if not any(mask & chars == 0 for mask in _mandatory(body, flags, item)):
+            return "répétitions imbriquées sans séparateur"
+    return None
+
+
+def _ambiguous_branch(body, flags: int) -> Optional[str]:
+    """Deux alternatives qui peuvent commencer par le même caractère
+
+    Sous une répétition, une alternative peut valoir la concaténation
+    d'autres (`(a|b|ab)+`: `ab` ou `a` puis `b`), ce qu'aucune comparaison
+    des seuls premiers et derniers caractères ne voit. On exige donc des
+    premiers caractères disjoints deux à deux: à chaque position, une seule
+    alternative peut démarrer. sre_parse met en facteur le préfixe commun:
+    `(ab|ab)` devient `ab` suivi d'une alternative entre deux séquences
+    vides, refusée parce que deux alternatives vides matchent le même texte.
+    """
+    for branches, branch_flags in _branches(body, flags):
+        if sum(_nullable(b) for b in branches) > 1:
+            return "alternative ambiguë sous une répétition"
+        seen = 0
+        for branch in branches:
+            first = _first(branch, branch_flags)
+            if first & seen:
+                return "alternative ambiguë sous une répétition"
+            seen |= first
+    return None
+
+
+def _flatten(items, flags: int) -> Iterator[Tuple[object, object, int]]:
+    """Séquence avec le contenu des groupes mis à plat"""
+    for op, av in items:
+        if op is _SUBPATTERN:
+            yield from _flatten(av[3], _scoped(flags, av))
+        else:
+            yield op, av, flags
+
+
+def _overlapping_run(items, flags: int) -> bool:
+    """Au moins MAX_OVERLAPPING_REPEATS répétitions non bornées consécutives qui se recouvrent
+
+    Sans obligation après elles, une chaîne qui contient `.*` va jusqu'à la
+    fin de ligne au premier essai: pas de retour arrière.
+    """
+    flat = list(_flatten(items, flags))
+    run, union, any_char = 0, 0, False
+    for i, (op, av, item_flags) in enumerate(flat):
+        if op in _REPEATS and av[1] == _MAXREPEAT:
+            chars = _chars(av[2], item_flags)
+            if run and chars & union:
+                run, union = run + 1, union | chars
+            else:
+                run, union, any_char = 1, chars, False
+            any_char = any_char or chars | _NEWLINE == _ALL
+            if run >= MAX_OVERLAPPING_REPEATS and not (
+                    any_char and all(_item_nullable(o, a) for o, a, _ in flat[i + 1:])):
+                return True
+            continue
+        char = _char_mask(op, av, item_flags)
+        if char is None:
+            if not _item_nullable(op, av):
+                run, union = 0, 0       # alternative obligatoire: séparateur supposé
+        elif char & union == 0:
+            run, union = 0, 0
+    return False
+
+
+def check_pattern(pattern: str, flags: int = 0) -> Optional[str]:
+    """Raison du refus d'une regex, None si son coût est borné (re.error si invalide)"""
+    parsed = sre_parse.parse(pattern, flags)
+    flags = parsed.state.flags
+    for (op, (low, high, body)), body_flags in _repeats(parsed, flags):
+        if high <= 1:
+            continue
+        if high <= MAX_BOUNDED_REPEAT and all(
+                inner[1][1] != _MAXREPEAT for inner, _ in _repeats(body, body_flags)):
+            continue                    # ex. octets IPv4 ((25[0-5]|...)\.){3}
+        reason = _nested_repeat(body, body_flags) or _ambiguous_branch(body, body_flags)
+        if reason:
+            return reason
+    for items, items_flags in _sequences(parsed, flags):
+        if _overlapping_run(items, items_flags):
+            return f"{MAX_OVERLAPPING_REPEATS} répétitions consécutives qui se recouvrent"
+    return None
+
+
+def _class_chars(mask: int, limit: int = 8) -> Optional[List[str]]:
+    """Caractères Latin-1 d'un masque (None s'il en a plus que `limit` ou hors Latin-1)"""
+    if mask >> 256:
+        return None
+    chars = [chr(code) for code in range(256) if mask >> code & 1]
+    return chars if len(chars) <= limit else None
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[List[str]]:
+    """Chaînes (casefold) dont l'une figure dans tout texte matché, None si aucune
+
+    Plus longue suite de littéraux obligatoires de la séquence principale,
+    ou petite classe de caractères obligatoire (`[#$]`). Sert de préfiltre:
+    une ligne sans aucune de ces chaînes ne peut pas matcher.
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    best = None
+    run = []
+
+    def better(candidates):
+        nonlocal best
+        score = (min(map(len, candidates)), -len(candidates))
+        if best is None or score > (min(map(len, best)), -len(best)):
+            best = candidates
+
+    for op, av, item_flags in _flatten(parsed, parsed.state.flags):
+        if op is _LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            better([''.join(run)])
+            run = []
+        if op is _IN:
+            chars = _class_chars(_class_mask(av, item_flags))
+            if chars:
+                better(chars)
+    if run:
+        better([''.join(run)])
+    if best is None:
+        return None
+    return sorted({literal.casefold() for literal in best})
+
+
+def builtin_patterns() -> List[Tuple[str, str, int]]:
+    """(origine, pattern, drapeaux) des patterns intégrés et des extracteurs de modules"""
+    from .context_detector import ContextDetector
+    from .module_manager import ModuleManager
+
+    found = []
+    for context_type, patterns in ContextDetector.PATTERNS.items():
+        for pattern, _ in patterns:
+            found.append((f"PATTERNS.{context_type.value}", pattern, re.IGNORECASE))
+    for name, table in (('PROMPT_PATTERNS', ContextDetector.PROMPT_PATTERNS),
+                        ('VERSION_PATTERNS', ContextDetector.VERSION_PATTERNS)):
+        for context_type, pattern in table.items():
+            found.append((f"{name}.{context_type.value}", pattern, 0))
+
+    manager = ModuleManager()
+    for module_name in sorted(manager.discover_modules()):
+        if not manager.load_module(module_name):
+            continue
+        module = manager.loaded_modules[module_name]
+        for key, regex in module.extractors:
+            found.append((f"{module_name}.{key}", regex.pattern, regex.flags))
+        for pattern in getattr(module, 'capture_patterns', ()):
+            found.append((f"{module_name}.capture", pattern, 0))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vérifie que des regex ont un coût borné par ligne")
+    parser.add_argument('pattern', nargs='*')
+    parser.add_argument('--profiles', metavar='DIR', help="Vérifie aussi les profils TOML/YAML")
+    parser.add_argument('--builtin', action='store_true', help="Patterns intégrés et extracteurs")
+    args = parser.parse_args(argv)
+
+    checks = [('argument', pattern, 0) for pattern in args.pattern]
+    if args.builtin:
+        checks.extend(builtin_patterns())
+    rejected = 0
+    for origin, pattern, flags in checks:
+        try:
+            reason = check_pattern(pattern, flags)
+        except re.error as e:
+            reason = f"regex invalide ({e})"
+        if reason:
+            rejected += 1
+        print(f"{'✗' if reason else '✓'} {origin:32s} {pattern!r}" + (f"  {reason}" if reason else ''))
+
+    if args.profiles:
+        from .profiles import ProfileError, load_profiles
+        try:
+            profile = load_profiles(args.profiles)
+            print(f"✓ profils {', '.join(profile.sources)}")
+        except ProfileError as e:
+            rejected += 1
+            print(f"✗ {e}")
+
+    print(f"\nMoteur: {REGEX_ENGINE}{'' if RE2_AVAILABLE else ' (re2 non installé)'}, "
+          f"lignes plafonnées à {MAX_LINE_LENGTH} caractères")
+    return 1 if rejected else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
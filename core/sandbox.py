@@ -0,0 +1,425 @@
+"""
+Sandbox - Exécution des modules avec budget de temps et isolation en processus
+
+En mode sandbox, chaque appel de module est chronométré: un module qui
+dépasse son budget de façon répétée (ou une fois de beaucoup) est
+désactivé automatiquement. Dans le processus principal, le contrôle a
+lieu après l'appel: il ne l'interrompt pas. Les modules lourds ou non fiables peuvent
+tourner dans un processus de travail, alimenté par lots de lignes via
+mémoire partagée: un module bloqué (regex catastrophique) ne bloque plus
+l'ingestion, son processus est tué à l'échéance.
+"""
+import multiprocessing
+import os
+from collections import deque
+from multiprocessing import shared_memory
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from .metrics import METRICS, MODULE_SECONDS
+
+# Budget par appel et seuils de désactivation
+BUDGET_MS = 5.0
+HARD_LIMIT_MS = 250.0       # un seul appel au-delà: désactivation immédiate
+MAX_OVERRUNS = 20           # dépassements consécutifs tolérés
+
+# Processus de travail
+BATCH_LINES = 256
+SLOT_BYTES = 256 * 1024     # un lot par slot de mémoire partagée
+SLOTS = 8                   # lots en vol max, au-delà les lignes sont jetées
+WORKER_TIMEOUT = 2.0        # secondes sans réponse avant de tuer le processus
+MAX_TIMEOUTS = 3            # processus bloqués avant désactivation...
+TIMEOUT_WINDOW = 600.0      # ... dans cette fenêtre glissante (secondes)
+BATCH_MAX_AGE = 0.05        # lot partiel envoyé après ce délai (poll)
+
+MODULE_OVERRUNS = METRICS.counter('pidebugger_module_overruns_total',
+                                  'Appels de module au-delà du budget', ('module',))
+MODULE_DROPPED = METRICS.counter('pidebugger_module_dropped_lines_total',
+                                 'Lignes non traitées (processus saturé ou tué)', ('module',))
+MODULE_DISABLED = METRICS.gauge('pidebugger_module_disabled',
+                                'Module désactivé par la sandbox', ('module',))
+
+
+class ModuleStats:
+    """Compteurs d'un module sous sandbox"""
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'overruns', 'consecutive',
+                 'timeouts', 'recent_timeouts', 'dropped', 'disabled')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.overruns = 0
+        self.consecutive = 0
+        self.timeouts = 0
+        self.recent_timeouts = deque()          # instants des derniers blocages
+        self.dropped = 0
+        self.disabled: Optional[str] = None     # raison de la désactivation
+
+    def observe(self, elapsed: float, calls: int = 1):
+        self.calls += calls
+        self.seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+
+
+def _worker_main(module_name: str, modules_dir: str, shm_name: str, conn):
+    """Boucle du processus de travail: lots en mémoire partagée → résultats épars"""
+    from .module_manager import ModuleManager
+
+    manager = ModuleManager(modules_dir)
+    if not manager.load_module(module_name):
+        conn.send(('error', None, f"chargement de {module_name} impossible"))
+        return
+    module = manager.loaded_modules[module_name]
+    process_batch = getattr(module, 'process_batch', None) or (
+        lambda lines, contexts: [(i, r) for i, r in enumerate(map(module.process_line, lines, contexts)) if r])
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == 'stop':
+                break
+            _, seq, slot, nbytes, runs = message
+            start = perf_counter()
+            offset = slot * SLOT_BYTES
+            lines = bytes(shm.buf[offset:offset + nbytes]).decode('utf-8').split('\n')
+
+            results = []
+            index = 0
+            for count, context_type in runs:
+                try:
+                    batch = process_batch(lines[index:index + count], [context_type] * count)
+                except Exception as e:
+                    batch = [(0, {'hardware': {}, 'commands': [], 'alerts': [f"{module_name}: {e}"]})]
+                results.extend((index + i, result) for i, result in batch)
+                index += count
+            conn.send(('result', seq, results, perf_counter() - start))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        shm.close()
+
+
+class ModuleWorker:
+    """Processus de travail d'un module (lots de lignes en mémoire partagée)"""
+
+    def __init__(self, module_name: str, modules_dir: str = 'modules', wait: float = 0.0):
+        self.module_name = module_name
+        self.modules_dir = modules_dir
+        self.wait = wait                        # attente max d'un slot libre (s)
+        self.responses: List[tuple] = []       # réponses reçues, non distribuées
+        self.shm = shared_memory.SharedMemory(create=True, size=SLOTS * SLOT_BYTES)
+        self.process = None
+        self.conn = None
+        self.seq = 0
+        self.in_flight: Dict[int, tuple] = {}   # seq → (slot, lignes, envoi)
+        self.free_slots = list(range(SLOTS))
+        # Lot en cours de constitution
+        self.lines: List[str] = []
+        self.runs: List[list] = []
+        self.nbytes = 0
+        self.batch_started = 0.0
+        self.start()
+
+    def start(self):
+        parent, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main, args=(self.module_name, self.modules_dir, self.shm.name, child),
+            daemon=True, name=f"pidebugger-{self.module_name}")
+        self.process.start()
+        child.close()
+        self.conn = parent
+        self.responses = []
+        self.in_flight.clear()
+        self.free_slots = list(range(SLOTS))
+
+    def add(self, line: str, context_type: str) -> int:
+        """Ajoute une ligne au lot; retourne les lignes jetées"""
+        size = len(line.encode('utf-8')) + 1
+        if size > SLOT_BYTES:
+            return 1
+        dropped = 0
+        if self.nbytes + size > SLOT_BYTES:
+            dropped = self.flush()
+        if not self.lines:
+            self.batch_started = perf_counter()
+        self.lines.append(line)
+        self.nbytes += size
+        if self.runs and self.runs[-1][1] == context_type:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, context_type])
+        if len(self.lines) >= BATCH_LINES:
+            dropped += self.flush()
+        return dropped
+
+    def flush(self) -> int:
+        """Envoie le lot courant; retourne les lignes jetées (slots pleins)"""
+        if not self.lines:
+            return 0
+        lines, runs = self.lines, self.runs
+        self.lines, self.runs, self.nbytes = [], [], 0
+        if not self.free_slots:
+            # Libère les slots des lots déjà traités (et attend si autorisé)
+            self._collect(self.wait)
+            if not self.free_slots:
+                return len(lines)
+
+        data = '\n'.join(lines).encode('utf-8')
+        slot = self.free_slots.pop()
+        offset = slot * SLOT_BYTES
+        self.shm.buf[offset:offset + len(data)] = data
+        self.seq += 1
+        self.in_flight[self.seq] = (slot, lines, perf_counter())
+        try:
+            self.conn.send(('batch', self.seq, slot, len(data), runs))
+        except (BrokenPipeError, OSError):
+            pass
+        return 0
+
+    def _collect(self, timeout: float = 0.0):
+        """Lit les réponses du processus (au plus `timeout` s d'attente)"""
+        try:
+            while self.conn.poll(timeout):
+                message = self.conn.recv()
+                if message[0] == 'error':
+                    self.responses.append(message)
+                    return
+                _, seq, results, elapsed = message
+                slot, lines, _ = self.in_flight.pop(seq)
+                self.free_slots.append(slot)
+                self.responses.append((lines, results, elapsed))
+                timeout = 0.0
+        except (EOFError, OSError):
+            pass
+
+    def receive(self) -> list:
+        """Réponses disponibles: [(lignes, résultats épars, durée)]"""
+        self._collect()
+        responses, self.responses = self.responses, []
+        for response in responses:
+            if response[0] == 'error':
+                raise RuntimeError(response[2])
+        return responses
+
+    def expired(self, timeout: float) -> bool:
+        """Un lot attend une réponse depuis plus de `timeout` secondes"""
+        now = perf_counter()
+        return any(now - sent > timeout for _, _, sent in self.in_flight.values()) \
+            or not self.process.is_alive()
+
+    def restart(self) -> int:
+        """Tue le processus bloqué; retourne les lignes perdues"""
+        lost = sum(len(lines) for _, lines, _ in self.in_flight.values())
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+        self.start()
+        return lost
+
+    def close(self):
+        try:
+            self.conn.send(('stop',))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ModuleSandbox:
+    """Exécution des modules d'un ModuleManager avec budget de temps
+
+    Installée par `ModuleManager.enable_sandbox()`: `process_line()` du
+    gestionnaire passe alors par ici. Les résultats des modules isolés
+    arrivent plus tard, via `poll()` et le callback `on_result`.
+    """
+
+    def __init__(self, manager, budget_ms: float = BUDGET_MS,
+                 hard_limit_ms: float = HARD_LIMIT_MS, max_overruns: int = MAX_OVERRUNS,
+                 on_result: Optional[Callable] = None, wait: float = 0.0):
+        self.manager = manager
+        self.budget = budget_ms / 1000
+        self.hard_limit = hard_limit_ms / 1000
+        self.max_overruns = max_overruns
+        self.on_result = on_result
+        self.wait = wait            # > 0: relecture hors ligne, attendre plutôt que jeter
+        self.stats: Dict[str, ModuleStats] = {}
+        self.workers: Dict[str, ModuleWorker] = {}
+        self.isolated = set()       # modules à isoler (relancés par enable())
+
+    def _stats(self, module_name: str) -> ModuleStats:
+        stats = self.stats.get(module_name)
+        if stats is None:
+            stats = self.stats[module_name] = ModuleStats()
+        return stats
+
+    def isolate(self, module_name: str):
+        """Exécute un module dans un processus de travail"""
+        self.isolated.add(module_name)
+        if module_name not in self.workers:
+            self.workers[module_name] = ModuleWorker(module_name, self.manager.modules_dir, self.wait)
+
+    def process_line(self, line: str, context_type: str) -> dict:
+        """Comme ModuleManager.process_line, avec budget et isolation"""
+        results = {
+            'hardware': {},
+            'commands': [],
+            'alerts': []
+        }
+        timed = METRICS.enabled
+        profiler = self.manager.profiler
+
+        for module_name in list(self.manager.active_modules):
+            worker = self.workers.get(module_name)
+            if worker:
+                dropped = worker.add(line, context_type)
+                if dropped:
+                    self._dropped(module_name, dropped)
+                continue
+
+            module = self.manager.loaded_modules.get(module_name)
+            if not module:
+                continue
+            start = perf_counter()
+            try:
+                module_result = module.process_line(line, context_type)
+            except Exception as e:
+                self.disable(module_name, f"exception: {e}")
+                continue
+            elapsed = perf_counter() - start
+            self._observe(module_name, elapsed)
+            if profiler:
+                profiler.record('module', type(module).__name__, 'process_line',
+                                elapsed, bool(module_result))
+            if timed:
+                MODULE_SECONDS.observe(elapsed, module_name)
+
+            if module_result:
+                results['hardware'].update(module_result.get('hardware', {}))
+                results['commands'].extend(module_result.get('commands', []))
+                results['alerts'].extend(module_result.get('alerts', []))
+
+        return results
+
+    def _observe(self, module_name: str, elapsed: float):
+        stats = self._stats(module_name)
+        stats.observe(elapsed)
+        if elapsed <= self.budget:
+            stats.consecutive = 0
+            return
+
+        stats.overruns += 1
+        stats.consecutive += 1
+        if METRICS.enabled:
+            MODULE_OVERRUNS.inc(1, module_name)
+        if elapsed > self.hard_limit:
+            self.disable(module_name, f"appel de {elapsed * 1000:.0f} ms")
+        elif stats.consecutive >= self.max_overruns:
+            self.disable(module_name, f"{stats.consecutive} dépassements de budget consécutifs")
+
+    def _dropped(self, module_name: str, count: int):
+        self._stats(module_name).dropped += count
+        if METRICS.enabled:
+            MODULE_DROPPED.inc(count, module_name)
+
+    def disable(self, module_name: str, reason: str):
+        """Désactive un module (jusqu'à `enable()`)"""
+        self._stats(module_name).disabled = reason
+        self.manager.disabled_modules.add(module_name)
+        self.manager.deactivate_module(module_name)
+        # Processus de travail arrêté: plus de relance tant que le module est désactivé
+        worker = self.workers.pop(module_name, None)
+        if worker:
+            worker.close()
+        MODULE_DISABLED.set(1, module_name)
+        print(f"Erreur module {module_name} désactivé: {reason}")
+
+    def enable(self, module_name: str):
+        """Réautorise un module désactivé"""
+        stats = self._stats(module_name)
+        stats.disabled = None
+        stats.consecutive = 0
+        self.manager.disabled_modules.discard(module_name)
+        if module_name in self.isolated:
+            stats.recent_timeouts.clear()
+            self.isolate(module_name)
+        MODULE_DISABLED.set(0, module_name)
+
+    def poll(self):
+        """Résultats des processus de travail, lots partiels, échéances"""
+        now = perf_counter()
+        for module_name, worker in list(self.workers.items()):
+            if worker.lines and now - worker.batch_started > BATCH_MAX_AGE:
+                dropped = worker.flush()
+                if dropped:
+                    self._dropped(module_name, dropped)
+
+            try:
+                responses = worker.receive()
+            except RuntimeError as e:
+                self.disable(module_name, str(e))
+                continue
+            for lines, sparse, elapsed in responses:
+                self._stats(module_name).observe(elapsed, len(lines))
+                if METRICS.enabled:
+                    MODULE_SECONDS.observe(elapsed / max(len(lines), 1), module_name)
+                if self.on_result:
+                    for _, result in sparse:
+                        self.on_result(result)
+
+            if worker.expired(WORKER_TIMEOUT):
+                stats = self._stats(module_name)
+                stats.timeouts += 1
+                # Seuls les blocages récents comptent: quelques-uns au fil
+                # d'une longue session ne désactivent pas le module
+                recent = stats.recent_timeouts
+                recent.append(now)
+                while now - recent[0] > TIMEOUT_WINDOW:
+                    recent.popleft()
+                if len(recent) >= MAX_TIMEOUTS:
+                    self._dropped(module_name, len(worker.lines) + sum(
+                        len(lines) for _, lines, _ in worker.in_flight.values()))
+                    self.disable(module_name, f"{len(recent)} processus bloqués en "
+                                              f"{TIMEOUT_WINDOW:.0f} s")
+                else:
+                    self._dropped(module_name, worker.restart())
+
+    def drain(self, timeout: float = WORKER_TIMEOUT):
+        """Envoie les lots partiels et attend les réponses (fin de capture)"""
+        for worker in self.workers.values():
+            worker.batch_started = 0.0
+        deadline = perf_counter() + timeout
+        self.poll()
+        while any(w.in_flight for w in self.workers.values()) and perf_counter() < deadline:
+            for worker in self.workers.values():
+                if worker.in_flight:
+                    worker.conn.poll(0.01)
+            self.poll()
+
+    def report(self) -> str:
+        """Latence, dépassements et pertes par module"""
+        lines = [f"{'module':20s} {'appels':>9s} {'µs/appel':>9s} {'max ms':>8s} {'>budget':>8s}"
+                 f" {'timeouts':>8s} {'jetées':>8s}  état"]
+        for module_name, s in sorted(self.stats.items()):
+            mean = s.seconds / s.calls * 1e6 if s.calls else 0.0
+            state = f"désactivé ({s.disabled})" if s.disabled else (
+                'processus' if module_name in self.workers else 'actif')
+            lines.append(f"{module_name:20s} {s.calls:9d} {mean:9.1f} {s.max_seconds * 1000:8.2f}"
+                         f" {s.overruns:8d} {s.timeouts:8d} {s.dropped:8d}  {state}")
+        if any(name not in self.workers and not s.disabled for name, s in self.stats.items()):
+            lines.append("Modules actifs (processus principal): budget contrôlé après chaque"
+                         " appel, un appel bloqué n'est pas interrompu (seuls les modules en"
+                         " processus sont tués à l'échéance)")
+        return '\n'.join(lines)
+
+    def close(self):
+        """Arrête les processus de travail"""
+        for worker in self.workers.values():
+            worker.close()
+        self.workers.clear()
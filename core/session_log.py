@@ -0,0 +1,370 @@
+"""
+Session Log - Journalisation compressée et rotative des flux série
+
+Chaque port est écrit dans des segments compressés (zstd si disponible,
+sinon gzip) découpés en frames indépendantes. Un index JSON lines associe
+à chaque frame sa position compressée, sa position dans le flux et ses
+horodatages, ainsi que les transitions de contexte: un boot précis peut
+être extrait sans décompresser le reste.
+"""
+import argparse
+import gzip
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Taille d'une frame compressée indépendante (granularité d'accès)
+FRAME_BYTES = 256 * 1024
+# Rotation des segments
+SEGMENT_BYTES = 64 * 1024 * 1024
+SEGMENT_SECONDS = 3600
+# Flush d'une frame partielle après inactivité
+FLUSH_INTERVAL = 2.0
+
+# Ordre des phases d'un boot (SPL et BL1 ne coexistent pas sur une carte)
+BOOT_PHASES = {
+    'bootrom': 0, 'wtmi': 1, 'atf_bl1': 2, 'uboot_spl': 2, 'atf_bl2': 3, 'atf_bl31': 4,
+    'atf_bl33': 5, 'uboot_main': 5, 'linux_kernel': 6, 'linux_init': 7, 'linux_shell': 8,
+}
+# Premiers étages: y entrer ouvre un boot, sauf depuis un étage antérieur
+FIRST_STAGE_CONTEXTS = ('bootrom', 'wtmi', 'atf_bl1', 'uboot_spl')
+# Dernière phase de bootloader: seules les phases jusqu'à elle ouvrent un boot
+BOOTLOADER_PHASE = BOOT_PHASES['uboot_main']
+# Firmware (bootrom, WTMI, ATF avant BL33): les étages s'y passent la main
+# dans les deux sens (BL2 rend la main à BL1 pour lancer BL31)
+FIRMWARE_PHASE = BOOT_PHASES['atf_bl31']
+
+
+def boot_starts(contexts: Iterable[str]) -> List[int]:
+    """Index des transitions qui ouvrent un boot
+
+    Un boot commence:
+    - en début de session, à une phase de bootloader;
+    - à un retour en arrière depuis U-Boot ou Linux vers une phase de
+      bootloader (`reset` au prompt U-Boot: uboot_main → bootrom, reboot
+      sans premiers étages bavards: linux_shell → uboot_main);
+    - au bootrom depuis n'importe quelle phase (il ne tourne qu'au reset);
+    - à la ré-entrée dans un premier étage (atf_bl1 → unknown → atf_bl1).
+    Les retours en arrière à l'intérieur du firmware (atf_bl2 → atf_bl1:
+    "NOTICE: BL1: Booting BL31" d'un boot Armada), les messages kernel au
+    shell (linux_shell → linux_kernel) et les contextes hors phases
+    (unknown) n'en ouvrent pas.
+    """
+    starts = []
+    previous = None
+    for i, context in enumerate(contexts):
+        phase = BOOT_PHASES.get(context)
+        if phase is None:
+            continue
+        if phase <= BOOTLOADER_PHASE and (
+                previous is None
+                or (phase < previous and (previous > FIRMWARE_PHASE or context == 'bootrom'))
+                or (phase == previous and context in FIRST_STAGE_CONTEXTS)):
+            starts.append(i)
+        previous = phase
+    return starts
+
+
+def port_slug(port: str) -> str:
+    """'/dev/ttyUSB0' → 'ttyUSB0', 'socket://pi:5000' → 'socket_pi_5000'"""
+    name = port.rsplit('/', 1)[-1] if '://' not in port else port
+    return re.sub(r'[^\w.-]+', '_', name).strip('_') or 'port'
+
+
+class _Codec:
+    """Compression d'une frame indépendante"""
+
+    def __init__(self, name: str):
+        if name == 'zstd' and not ZSTD_AVAILABLE:
+            name = 'gzip'
+        self.name = name
+        self.extension = '.zst' if name == 'zstd' else '.gz'
+        if name == 'zstd':
+            self._compressor = zstandard.ZstdCompressor(level=3)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == 'zstd':
+            return self._compressor.compress(data)
+        return gzip.compress(data, compresslevel=6, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.name == 'zstd':
+            return self._decompressor.decompress(data)
+        return gzip.decompress(data)
+
+    @staticmethod
+    def for_segment(segment: str) -> '_Codec':
+        return _Codec('zstd' if segment.endswith('.zst') else 'gzip')
+
+
+class SessionLogger:
+    """Journal d'un port: file non bloquante + thread d'écriture/compression
+
+    `write()` et `mark()` ne font qu'un put() dans une file: le thread de
+    lecture série ne touche jamais le disque.
+    """
+
+    def __init__(self, directory: str, port: str, codec: str = 'zstd',
+                 frame_bytes: int = FRAME_BYTES, segment_bytes: int = SEGMENT_BYTES,
+                 segment_seconds: float = SEGMENT_SECONDS):
+        self.directory = directory
+        self.port = port
+        self.slug = port_slug(port)
+        self.codec = _Codec(codec)
+        self.frame_bytes = frame_bytes
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, f"{self.slug}.index.jsonl")
+
+        # Position globale dans le flux (continue d'une session à l'autre)
+        self.offset = _last_offset(self.index_path)
+        self.offset_lock = threading.Lock()
+        # horodatage de chunk → position globale (pour mark())
+        self.chunk_offsets: OrderedDict = OrderedDict()
+
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+        # État du thread d'écriture
+        self._segment = None
+        self._segment_name = None
+        self._segment_start = 0.0
+        self._segment_ulen = 0
+        self._segment_goff = 0
+        self._frame = bytearray()
+        self._frame_t0 = None
+        self._frame_t1 = None
+        self._index = None
+
+        self.thread.start()
+
+    def write(self, data: bytes, timestamp: float) -> int:
+        """Ajoute un chunk, retourne sa position globale dans le flux"""
+        with self.offset_lock:
+            offset = self.offset
+            self.offset += len(data)
+            self.chunk_offsets[timestamp] = offset
+            if len(self.chunk_offsets) > 4096:
+                self.chunk_offsets.popitem(last=False)
+        self.queue.put(('data', data, timestamp, offset))
+        return offset
+
+    def mark(self, context: str, timestamp: float):
+        """Enregistre une transition de contexte (au début du chunk horodaté)"""
+        with self.offset_lock:
+            offset = self.chunk_offsets.get(timestamp, self.offset)
+        self.queue.put(('mark', context, timestamp, offset))
+
+    def close(self):
+        """Vide la file, écrit la dernière frame et ferme les fichiers"""
+        self.queue.put(('close', None, None, None))
+        self.thread.join()
+
+    def _run(self):
+        self._index = open(self.index_path, 'a', encoding='utf-8')
+        self._index_entry({'type': 'session', 'port': self.port, 't': time.time(),
+                           'goff': self.offset})
+        while True:
+            try:
+                kind, payload, timestamp, offset = self.queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                self._flush_frame()
+                continue
+
+            if kind == 'data':
+                self._append(payload, timestamp, offset)
+            elif kind == 'mark':
+                self._index_entry({'type': 'mark', 'ctx': payload, 't': timestamp, 'goff': offset})
+            elif kind == 'close':
+                self._flush_frame()
+                self._close_segment()
+                self._index.close()
+                return
+
+    def _append(self, data: bytes, timestamp: float, offset: int):
+        if self._segment is None:
+            self._open_segment(timestamp, offset)
+        if self._frame_t0 is None:
+            self._frame_t0 = timestamp
+        self._frame_t1 = timestamp
+        self._frame += data
+
+        if len(self._frame) >= self.frame_bytes:
+            self._flush_frame()
+        if (self._segment_ulen >= self.segment_bytes
+                or timestamp - self._segment_start >= self.segment_seconds):
+            self._flush_frame()
+            self._close_segment()
+
+    def _open_segment(self, timestamp: float, offset: int):
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(timestamp))
+        name = f"{self.slug}-{stamp}-{offset}.log{self.codec.extension}"
+        self._segment = open(os.path.join(self.directory, name), 'ab')
+        self._segment_name = name
+        self._segment_start = timestamp
+        self._segment_ulen = 0
+        self._segment_goff = offset
+        self._index_entry({'type': 'segment', 'seg': name, 't': timestamp, 'goff': offset})
+
+    def _flush_frame(self):
+        if not self._frame or self._segment is None:
+            return
+        data = bytes(self._frame)
+        compressed = self.codec.compress(data)
+        coff = self._segment.tell()
+        self._segment.write(compressed)
+        self._segment.flush()
+
+        self._index_entry({
+            'type': 'frame', 'seg': self._segment_name,
+            'coff': coff, 'clen': len(compressed),
+            'goff': self._segment_goff + self._segment_ulen, 'ulen': len(data),
+            't0': self._frame_t0, 't1': self._frame_t1,
+        })
+        self._segment_ulen += len(data)
+        self._frame.clear()
+        self._frame_t0 = self._frame_t1 = None
+
+    def _close_segment(self):
+        if self._segment:
+            self._segment.close()
+            self._segment = None
+
+    def _index_entry(self, entry: dict):
+        self._index.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._index.flush()
+
+
+def _last_offset(index_path: str) -> int:
+    """Fin du flux d'après un index existant"""
+    end = 0
+    if not os.path.exists(index_path):
+        return 0
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get('type') == 'frame':
+                end = max(end, entry['goff'] + entry['ulen'])
+    return end
+
+
+class SessionLogReader:
+    """Lecture d'un journal via son index (décompression des frames utiles)"""
+
+    def __init__(self, directory: str, port: str):
+        self.directory = directory
+        self.slug = port_slug(port)
+        self.frames: List[dict] = []
+        self.marks: List[dict] = []
+
+        with open(os.path.join(directory, f"{self.slug}.index.jsonl"), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('type') == 'frame':
+                    self.frames.append(entry)
+                elif entry.get('type') == 'mark':
+                    self.marks.append(entry)
+
+        self.frames.sort(key=lambda e: e['goff'])
+        self.marks.sort(key=lambda e: e['goff'])
+
+    @property
+    def end(self) -> int:
+        return self.frames[-1]['goff'] + self.frames[-1]['ulen'] if self.frames else 0
+
+    def _frame_data(self, frame: dict) -> bytes:
+        path = os.path.join(self.directory, frame['seg'])
+        with open(path, 'rb') as f:
+            f.seek(frame['coff'])
+            compressed = f.read(frame['clen'])
+        return _Codec.for_segment(frame['seg']).decompress(compressed)
+
+    def read(self, start: int, end: Optional[int] = None) -> bytes:
+        """Octets du flux entre deux positions globales"""
+        end = self.end if end is None else end
+        out = []
+        for frame in self.frames:
+            fstart = frame['goff']
+            fend = fstart + frame['ulen']
+            if fend <= start or fstart >= end:
+                continue
+            data = self._frame_data(frame)
+            out.append(data[max(start - fstart, 0):min(end, fend) - fstart])
+        return b''.join(out)
+
+    def read_time(self, t_start: float, t_end: float) -> bytes:
+        """Frames couvrant une fenêtre de temps (granularité frame)"""
+        frames = [f for f in self.frames if f['t1'] >= t_start and f['t0'] <= t_end]
+        if not frames:
+            return b''
+        return self.read(frames[0]['goff'], frames[-1]['goff'] + frames[-1]['ulen'])
+
+    def boots(self) -> List[Tuple[dict, Optional[dict]]]:
+        """Boots détectés: (mark de début, mark du boot suivant ou None)"""
+        marks = self.marks
+        starts = [marks[i] for i in boot_starts(mark['ctx'] for mark in marks)]
+        return [(start, starts[i + 1] if i + 1 < len(starts) else None)
+                for i, start in enumerate(starts)]
+
+    def extract_boot(self, index: int) -> bytes:
+        """Flux complet d'un boot"""
+        start, nxt = self.boots()[index]
+        return self.read(start['goff'], nxt['goff'] if nxt else None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lecture des journaux de session")
+    parser.add_argument('directory')
+    parser.add_argument('port', help="Port (ex: /dev/ttyUSB0 ou ttyUSB0)")
+    parser.add_argument('--boots', action='store_true', help="Liste les boots")
+    parser.add_argument('--boot', type=int, help="Extrait le boot N (négatif: depuis la fin)")
+    parser.add_argument('--since', type=float, help="Début (timestamp epoch)")
+    parser.add_argument('--until', type=float, help="Fin (timestamp epoch)")
+    parser.add_argument('-o', '--output', help="Fichier de sortie (défaut: stdout)")
+    args = parser.parse_args(argv)
+
+    reader = SessionLogReader(args.directory, args.port)
+
+    if args.boots or (args.boot is None and args.since is None):
+        for i, (start, nxt) in enumerate(reader.boots()):
+            size = (nxt['goff'] if nxt else reader.end) - start['goff']
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start['t']))
+            print(f"{i:5d}  {when}  {start['ctx']:12s} {size:>12,d} octets")
+        return 0
+
+    if args.boot is not None:
+        data = reader.extract_boot(args.boot)
+    else:
+        data = reader.read_time(args.since, args.until if args.until else float('inf'))
+
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(data)
+    else:
+        sys.stdout.buffer.write(data)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
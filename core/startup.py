@@ -0,0 +1,58 @@
+"""
+Startup - Temps de démarrage par étape
+
+    STARTUP.mark('qt')                  # fin d'une étape
+    with STARTUP.step('modules'): ...   # étape délimitée
+    print(STARTUP.report())
+
+Les temps sont comptés depuis l'import de ce module (premier import du
+point d'entrée); `interpreter` estime le démarrage de Python lui-même.
+"""
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+class StartupTimer:
+    """Étapes du démarrage: (nom, fin depuis t0, durée)"""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.last = self.t0
+        self.steps: List[Tuple[str, float, float]] = []
+        self.done_at: Optional[float] = None
+        # Démarrage de l'interpréteur (horloge process, avant le premier import)
+        self.interpreter = max(time.process_time() - (time.perf_counter() - self.t0), 0.0)
+
+    def mark(self, name: str):
+        """Fin d'une étape commencée à la marque précédente"""
+        now = time.perf_counter()
+        self.steps.append((name, now - self.t0, now - self.last))
+        self.last = now
+
+    @contextmanager
+    def step(self, name: str):
+        """Étape délimitée (le temps écoulé depuis la marque précédente est compté à part)"""
+        start = time.perf_counter()
+        if start - self.last > 1e-3:
+            self.steps.append(('(boucle Qt)', start - self.t0, start - self.last))
+        self.last = start
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def done(self):
+        self.done_at = time.perf_counter() - self.t0
+
+    def report(self) -> str:
+        lines = [f"{'étape':28s} {'durée ms':>9s} {'cumul ms':>9s}",
+                 f"{'interpreter (CPU)':28s} {self.interpreter * 1000:9.1f} {'':>9s}"]
+        for name, end, duration in self.steps:
+            lines.append(f"{name:28s} {duration * 1000:9.1f} {end * 1000:9.1f}")
+        if self.done_at is not None:
+            lines.append(f"{'total':28s} {'':>9s} {self.done_at * 1000:9.1f}")
+        return '\n'.join(lines)
+
+
+STARTUP = StartupTimer()
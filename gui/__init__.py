@@ -0,0 +1,7 @@
+"""
+GUI - Interface Qt de PiDebugger
+
+Découpée pour un démarrage rapide: la fenêtre (window.py) n'importe que
+le nécessaire à son premier affichage; panels secondaires, backend série,
+profileur et modules sont importés ou construits à la première utilisation.
+"""
@@ -0,0 +1,277 @@
+"""
+Panels - Fenêtres secondaires (métriques, cascade du boot, timeline multi-cartes)
+
+Importé à la première ouverture d'un panel depuis la sidebar.
+"""
+import time
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QPushButton, QFileDialog, QLabel
+
+from core.metrics import METRICS, RateTracker
+from core.rack_timeline import RackTimeline, TARGET_CONTEXT
+from core.session_log import port_slug
+
+from . import styles
+
+
+class MetricsPanel(QWidget):
+    """Panel de debug des métriques internes"""
+    
+    def __init__(self, sandbox=None):
+        super().__init__()
+        self.setWindowTitle("📈 Metrics")
+        self.resize(900, 600)
+        self.rates = RateTracker()
+        self.sandbox = sandbox
+        # État de METRICS.enabled avant l'ouverture (rétabli à la fermeture)
+        self.previous_enabled = None
+        self.init_ui()
+        
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setStyleSheet(styles.REPORT_TEXT)
+        layout.addWidget(self.text)
+    
+    def showEvent(self, event):
+        if self.previous_enabled is None:
+            self.previous_enabled = METRICS.enabled
+        METRICS.enabled = True
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.timer.stop()
+        if self.previous_enabled is not None:
+            METRICS.enabled = self.previous_enabled
+            self.previous_enabled = None
+        super().hideEvent(event)
+    
+    def refresh(self):
+        """Débits par seconde puis exposition complète"""
+        lines = ["# Débits (/s)"]
+        for key, rate in sorted(self.rates.rates().items()):
+            lines.append(f"{key:70s} {rate:12.1f}")
+        lines.append("")
+        if self.sandbox:
+            lines.append("# Sandbox modules")
+            lines.append(self.sandbox.report())
+            lines.append("")
+        lines.append(METRICS.render())
+        
+        scroll = self.text.verticalScrollBar().value()
+        self.text.setPlainText('\n'.join(lines))
+        self.text.verticalScrollBar().setValue(scroll)
+
+
+class BootTimelinePanel(QWidget):
+    """Cascade des initcalls/probes les plus lents du boot kernel"""
+    
+    def __init__(self, module_manager):
+        super().__init__()
+        self.setWindowTitle("⏳ Boot kernel")
+        self.resize(1100, 600)
+        self.module_manager = module_manager
+        self.init_ui()
+        
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.text.setStyleSheet(styles.REPORT_TEXT)
+        
+        export_btn = QPushButton("Export…")
+        export_btn.clicked.connect(self.export)
+        
+        layout.addWidget(self.text)
+        layout.addWidget(export_btn)
+    
+    def timeline(self):
+        module = self.module_manager.loaded_modules.get('linux_module')
+        return getattr(module, 'timeline', None)
+    
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+    
+    def refresh(self):
+        timeline = self.timeline()
+        self.text.setPlainText(timeline.waterfall(top=40) if timeline else "linux_module non chargé")
+    
+    def export(self):
+        """Export CSV / JSON / Chrome trace"""
+        timeline = self.timeline()
+        if not timeline:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export", time.strftime('boot-%Y%m%d-%H%M%S.trace.json'),
+            "Chrome trace (*.trace.json);;CSV (*.csv);;JSON (*.json)")
+        if path:
+            timeline.export(path)
+
+
+class RackTimelineCanvas(QWidget):
+    """Une ligne par carte sur un axe de temps commun (molette: zoom, glisser: défilement)"""
+    
+    LABEL_WIDTH = 140
+    AXIS_HEIGHT = 18
+    
+    def __init__(self, rack):
+        super().__init__()
+        self.rack = rack
+        self.view = None            # (t0, t1) affiché, None = tout
+        self.drag_x = None
+        self.colors = {}
+        self.setMinimumHeight(200)
+    
+    def color(self, code: int) -> QColor:
+        color = self.colors.get(code)
+        if color is None:
+            name = self.rack.contexts.name(code)
+            color = self.colors[code] = QColor(
+                styles.CONTEXT_COLORS.get(name, styles.CONTEXT_COLOR_DEFAULT))
+        return color
+    
+    def time_range(self):
+        if self.view:
+            return self.view
+        return self.rack.time_range()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor('#1e1e1e'))
+        tracks = [self.rack.tracks[name] for name in sorted(self.rack.tracks)]
+        t0, t1 = self.time_range()
+        width = self.width() - self.LABEL_WIDTH
+        if not tracks or t1 <= t0 or width <= 0:
+            painter.end()
+            return
+        
+        row = max(2.0, min(20.0, (self.height() - self.AXIS_HEIGHT) / len(tracks)))
+        painter.setPen(QColor('#cccccc'))
+        for n, track in enumerate(tracks):
+            y = int(n * row)
+            if y > self.height():
+                break
+            height = max(int(row) - 1, 1)
+            # Segments décimés par pixel: coût borné par la largeur
+            for x0, x1, code, count in track.spans(t0, t1, width):
+                painter.fillRect(self.LABEL_WIDTH + int(x0), y,
+                                 max(int(x1) - int(x0), 1), height, self.color(code))
+            if row >= 10:
+                painter.drawText(4, y + height - 2, track.name[:18])
+        
+        # Axe: secondes depuis le début de la vue
+        y = self.height() - 4
+        for i in range(5):
+            x = self.LABEL_WIDTH + int(width * i / 4)
+            painter.drawText(min(x, self.width() - 60), y, f"{(t1 - t0) * i / 4:.1f} s")
+        painter.end()
+    
+    def wheelEvent(self, event):
+        """Zoom autour du curseur (sans relire les journaux)"""
+        t0, t1 = self.time_range()
+        width = self.width() - self.LABEL_WIDTH
+        if t1 <= t0 or width <= 0:
+            return
+        x = event.position().x() - self.LABEL_WIDTH
+        anchor = t0 + (t1 - t0) * min(max(x / width, 0.0), 1.0)
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        self.view = (anchor - (anchor - t0) * factor, anchor + (t1 - anchor) * factor)
+        self.update()
+    
+    def mousePressEvent(self, event):
+        self.drag_x = event.position().x()
+    
+    def mouseMoveEvent(self, event):
+        if self.drag_x is None:
+            return
+        t0, t1 = self.time_range()
+        width = self.width() - self.LABEL_WIDTH
+        if width <= 0:
+            return
+        shift = (self.drag_x - event.position().x()) * (t1 - t0) / width
+        self.drag_x = event.position().x()
+        self.view = (t0 + shift, t1 + shift)
+        self.update()
+    
+    def mouseReleaseEvent(self, event):
+        self.drag_x = None
+    
+    def mouseDoubleClickEvent(self, event):
+        """Retour à la vue complète"""
+        self.view = None
+        self.update()
+
+
+class RackTimelinePanel(QWidget):
+    """Transitions de contexte de toutes les sessions (en cours + journaux)"""
+    
+    def __init__(self, bus, event_store, port: str, log_dirs):
+        super().__init__()
+        self.setWindowTitle("🗄 Rack timeline")
+        self.resize(1300, 700)
+        self.log_dirs = [d for d in log_dirs if d]
+        
+        self.rack = RackTimeline()
+        # Session en cours: transitions déjà conservées puis abonnement
+        name = port_slug(port) if port else 'session'
+        for kind, number, ts, key, value in event_store:
+            if kind == 'context':
+                self.rack.add(name, key, ts)
+        self.rack.subscribe(bus, name)
+        
+        self.init_ui()
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.canvas = RackTimelineCanvas(self.rack)
+        self.slowest = QLabel()
+        self.slowest.setStyleSheet(styles.REPORT_TEXT)
+        self.slowest.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        
+        layout.addWidget(self.canvas, stretch=1)
+        layout.addWidget(self.slowest)
+    
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+    
+    def set_port(self, port: str):
+        """Nouvelle connexion: la session en cours change de piste"""
+        self.rack.follow(port_slug(port))
+    
+    def refresh(self):
+        """Lignes ajoutées aux index des journaux, puis redessin"""
+        for directory in self.log_dirs:
+            self.rack.load_directory(directory)
+        ranked = self.rack.slowest(TARGET_CONTEXT)[:8]
+        self.slowest.setText(f"Dernier boot → {TARGET_CONTEXT}:   " + "   ".join(
+            f"{name} {'—' if seconds is None else f'{seconds:.1f} s'}" for name, seconds in ranked))
+        self.canvas.update()
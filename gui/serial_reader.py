@@ -0,0 +1,87 @@
+"""
+Serial Reader - Thread de lecture série et import différé de pyserial
+"""
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+try:
+    from core.metrics import METRICS, RX_BYTES, READER_WAKEUPS, DECODE_SECONDS
+    CORE_AVAILABLE = True
+except ImportError:
+    CORE_AVAILABLE = False
+
+_serial = None
+
+
+def load_serial():
+    """Module pyserial, importé à la première utilisation (None si absent)"""
+    global _serial
+    if _serial is None:
+        try:
+            import serial
+            import serial.tools.list_ports
+            _serial = serial
+        except ImportError:
+            _serial = False
+            print("⚠️  pyserial non installé")
+    return _serial or None
+
+
+class SerialReader(QThread):
+    """Thread lecture série"""
+    data_received = pyqtSignal(str, float)
+    # Chunk d'un flux binaire (core.binary_stream): ni décodé ni analysé
+    binary_received = pyqtSignal(bytes, float)
+    
+    def __init__(self, serial_port, session_log=None, capture=None, hub=None, classifier=None):
+        super().__init__()
+        self.serial_port = serial_port
+        self.session_log = session_log
+        self.capture = capture
+        self.hub = hub
+        self.classifier = classifier
+        self.running = True
+        self.emitted = 0
+    
+    def run(self):
+        port = self.serial_port.port
+        while self.running and self.serial_port and self.serial_port.is_open:
+            try:
+                timed = CORE_AVAILABLE and METRICS.enabled
+                if timed:
+                    READER_WAKEUPS.inc(1, port)
+                
+                if self.serial_port.in_waiting:
+                    data = self.serial_port.read(self.serial_port.in_waiting)
+                    timestamp = time.time()
+                    if timed:
+                        RX_BYTES.inc(len(data), port)
+                    if self.session_log:
+                        # Octets bruts, compression dans le thread du journal
+                        self.session_log.write(data, timestamp)
+                    if self.capture:
+                        # Anneau mémoire, rien sur disque sans déclencheur
+                        self.capture.write(data, timestamp)
+                    if self.hub:
+                        # Miroir RX vers pty / socket Unix (même objet bytes pour tous)
+                        self.hub.publish(data)
+                    self.emitted += 1
+                    # Flux binaire (XMODEM, mauvaise vitesse): pas de décodage
+                    raw = self.classifier.feed(data) if self.classifier else data
+                    if raw is None:
+                        self.binary_received.emit(data, timestamp)
+                    elif timed:
+                        start = time.perf_counter()
+                        text = raw.decode('utf-8', errors='replace')
+                        DECODE_SECONDS.observe(time.perf_counter() - start, port)
+                        self.data_received.emit(text, timestamp)
+                    else:
+                        self.data_received.emit(raw.decode('utf-8', errors='replace'), timestamp)
+                time.sleep(0.01)
+            except Exception as e:
+                print(f"Erreur: {e}")
+                break
+    
+    def stop(self):
+        self.running = False
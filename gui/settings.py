@@ -0,0 +1,28 @@
+"""
+Settings - Options de l'application (variables d'environnement, puis ligne de commande)
+"""
+import os
+
+PROFILES_DIR = os.environ.get('PIDEBUGGER_PROFILES', 'profiles')
+# Journalisation compressée des sessions (désactivée si vide)
+LOG_DIR = os.environ.get('PIDEBUGGER_LOG_DIR', '')
+# Budget de temps par module (ms, 0 = pas de sandbox) et modules isolés en processus
+SANDBOX_BUDGET_MS = float(os.environ.get('PIDEBUGGER_SANDBOX_MS', '0') or 0)
+ISOLATED_MODULES = [m for m in os.environ.get('PIDEBUGGER_ISOLATE', '').split(',') if m]
+# Captures déclenchées (désactivées si vide): anneau par port (Mo), contextes
+# déclencheurs ('*': toute transition) et regex en plus de celles des modules
+CAPTURE_DIR = os.environ.get('PIDEBUGGER_CAPTURE_DIR', '')
+CAPTURE_RING_MB = float(os.environ.get('PIDEBUGGER_CAPTURE_RING_MB', '8') or 8)
+CAPTURE_CONTEXTS = [c for c in os.environ.get('PIDEBUGGER_CAPTURE_CONTEXTS', 'bootrom').split(',') if c]
+# (une seule regex: les virgules sont valides dans un motif)
+CAPTURE_PATTERNS = [p for p in [os.environ.get('PIDEBUGGER_CAPTURE_RE', '')] if p]
+# Commande d'alimentation de la carte (spec core.power: gpio:17, hidrelay:/dev/hidraw0:1, mock)
+POWER_BACKEND = os.environ.get('PIDEBUGGER_POWER', '')
+# Export local du port connecté ('pty', 'unix' ou 'pty,unix'): liens et sockets dans EXPORT_DIR
+EXPORT_LOCAL = [e for e in os.environ.get('PIDEBUGGER_EXPORT', '').split(',') if e]
+EXPORT_DIR = os.environ.get('PIDEBUGGER_EXPORT_DIR', '/tmp')
+# Fenêtre (octets) du détecteur de flux binaire, 0 = désactivé: en binaire,
+# ni décodage ni détection, résumé hexadécimal dans le terminal
+BINARY_WINDOW = int(os.environ.get('PIDEBUGGER_BINARY_WINDOW', '256') or 0)
+# Rapport de démarrage (temps par étape) sur la sortie standard
+STARTUP_REPORT = bool(os.environ.get('PIDEBUGGER_STARTUP_REPORT'))
@@ -0,0 +1,211 @@
+"""
+Styles - Feuilles de style et thème VSCode
+
+Chaînes constantes: les widgets les appliquent à leur construction, les
+panels secondaires seulement quand ils sont ouverts.
+"""
+
+SIDEBAR_BUTTON = """
+    QPushButton {
+        background-color: transparent;
+        border: none;
+        font-size: 20pt;
+    }
+    QPushButton:hover {
+        background-color: #2a2a2a;
+    }
+    QPushButton:pressed {
+        background-color: #007acc;
+    }
+"""
+
+PANEL_TITLE = """
+    font-size: 15pt;
+    font-weight: bold;
+    color: #007acc;
+    padding: 6px;
+"""
+
+MODULES_LIST = """
+    QListWidget {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 4px;
+        color: #d4d4d4;
+        font-size: 13pt;
+        padding: 4px;
+    }
+    QListWidget::item {
+        padding: 8px;
+        border-radius: 3px;
+    }
+    QListWidget::item:hover {
+        background-color: #3e3e42;
+    }
+    QListWidget::item:selected {
+        background-color: #007acc;
+    }
+"""
+
+SUGGESTIONS_LIST = """
+    QListWidget {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 4px;
+        color: #89d185;
+        font-size: 13pt;
+        padding: 4px;
+    }
+    QListWidget::item {
+        padding: 8px;
+        border-radius: 3px;
+    }
+    QListWidget::item:hover {
+        background-color: #3e3e42;
+    }
+    QListWidget::item:selected {
+        background-color: #007acc;
+        color: #ffffff;
+    }
+"""
+
+CONN_LABEL = "font-size: 16pt;"
+TERMINAL_LABEL = "font-size: 14pt; font-weight: bold; color: #007acc;"
+PROMPT_LABEL = "font-size: 16pt; color: #007acc; font-weight: bold;"
+SECTION_LABEL = "font-size: 15pt; font-weight: bold; color: #007acc;"
+
+TERMINAL = """
+    QTextEdit {
+        background-color: #1e1e1e;
+        color: #d4d4d4;
+        font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+        font-size: 14pt;
+        border: 1px solid #3e3e42;
+        padding: 8px;
+    }
+"""
+
+# Texte monospace des panels secondaires (métriques, cascade du boot)
+REPORT_TEXT = """
+    QTextEdit {
+        background-color: #1e1e1e;
+        color: #d4d4d4;
+        font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+        font-size: 11pt;
+        border: 1px solid #3e3e42;
+    }
+"""
+
+CONTEXT_BOX = """
+    background-color: #2d2d30;
+    border: 1px solid #3e3e42;
+    border-radius: 4px;
+    padding: 12px;
+    font-size: 13pt;
+    color: #569cd6;
+"""
+
+HARDWARE_BOX = """
+    background-color: #2d2d30;
+    border: 1px solid #3e3e42;
+    border-radius: 4px;
+    padding: 12px;
+    font-size: 13pt;
+    color: #ce9178;
+"""
+
+TIMELINE_LIST = """
+    QListWidget {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 4px;
+        color: #d4d4d4;
+        font-size: 12pt;
+        padding: 4px;
+    }
+    QListWidget::item {
+        padding: 6px;
+    }
+"""
+
+STATUS_BAR = """
+    QStatusBar {
+        background-color: #007acc;
+        color: #ffffff;
+        font-size: 12pt;
+        padding: 4px 8px;
+    }
+"""
+
+# Couleur des phases dans la timeline multi-cartes (contextes hors liste: gris)
+CONTEXT_COLORS = {
+    'unknown': '#3e3e42',
+    'bootrom': '#c586c0',
+    'wtmi': '#b180d7',
+    'atf_bl1': '#d7ba7d',
+    'atf_bl2': '#dcdcaa',
+    'atf_bl31': '#ce9178',
+    'atf_bl33': '#d18616',
+    'uboot_spl': '#4fc1ff',
+    'uboot_main': '#007acc',
+    'linux_kernel': '#6a9955',
+    'linux_init': '#89d185',
+    'linux_shell': '#4ec9b0',
+}
+CONTEXT_COLOR_DEFAULT = '#808080'
+
+WINDOW = """
+    QPushButton {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 3px;
+        padding: 6px 12px;
+        font-size: 13pt;
+        color: #d4d4d4;
+    }
+    QPushButton:hover {
+        background-color: #3e3e42;
+        border-color: #007acc;
+    }
+    QPushButton:pressed {
+        background-color: #007acc;
+    }
+    QComboBox {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 3px;
+        padding: 6px 12px;
+        font-size: 13pt;
+        color: #d4d4d4;
+    }
+    QLineEdit {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 3px;
+        padding: 6px 12px;
+        font-size: 13pt;
+        color: #d4d4d4;
+    }
+    QLineEdit:focus {
+        border-color: #007acc;
+    }
+"""
+
+
+def apply_vscode_theme(window):
+    """Thème VSCode: style Fusion, palette sombre, feuille de la fenêtre"""
+    from PyQt6.QtGui import QPalette, QColor
+    from PyQt6.QtWidgets import QStyleFactory
+
+    window.setStyle(QStyleFactory.create('Fusion'))
+
+    palette = QPalette()
+    palette.setColor(QPalette.ColorRole.Window, QColor("#1e1e1e"))
+    palette.setColor(QPalette.ColorRole.WindowText, QColor("#d4d4d4"))
+    palette.setColor(QPalette.ColorRole.Base, QColor("#1e1e1e"))
+    palette.setColor(QPalette.ColorRole.Text, QColor("#d4d4d4"))
+    palette.setColor(QPalette.ColorRole.Button, QColor("#2d2d30"))
+    palette.setColor(QPalette.ColorRole.ButtonText, QColor("#d4d4d4"))
+
+    window.setPalette(palette)
+    window.setStyleSheet(WINDOW)
@@ -0,0 +1,158 @@
+"""
+Terminal - Rendu des opérations ANSI dans le QTextEdit du terminal
+"""
+from PyQt6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+from PyQt6.QtWidgets import QTextEdit
+
+from core.ansi import (
+    OP_TEXT, OP_CLEAR, OP_ERASE_LINE, OP_GOTO, OP_MOVE, OP_CR, OP_SCREEN_END,
+)
+
+
+class AnsiRenderer:
+    """Rendu des opérations ANSI dans le terminal
+
+    Un QTextCharFormat est créé une seule fois par style puis réutilisé;
+    chaque run de texte de même style est inséré en un seul appel.
+    Les déplacements de curseur (top/htop) s'appliquent à un "écran"
+    qui commence au bloc où le premier positionnement a eu lieu.
+    """
+    
+    DEFAULT_COLOR = "#d4d4d4"
+    SCREEN_ROWS = 200
+    
+    def __init__(self, terminal: QTextEdit):
+        self.terminal = terminal
+        self.cursor = QTextCursor(terminal.document())
+        self.formats = {}
+        self.origin = None
+    
+    def format_for(self, style: tuple) -> QTextCharFormat:
+        """Format Qt pour un style ANSI (cache)"""
+        fmt = self.formats.get(style)
+        if fmt is None:
+            fg, bg, bold, underline = style
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(fg or self.DEFAULT_COLOR))
+            if bg:
+                fmt.setBackground(QColor(bg))
+            if bold:
+                fmt.setFontWeight(QFont.Weight.Bold)
+            if underline:
+                fmt.setFontUnderline(True)
+            self.formats[style] = fmt
+        return fmt
+    
+    def render(self, ops: list):
+        """Applique les opérations du parser ANSI"""
+        cursor = self.cursor
+        if self.origin is None:
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+        
+        for op in ops:
+            kind = op[0]
+            if kind == OP_TEXT:
+                self._write(op[1], self.format_for(op[2]))
+            elif kind == OP_CR:
+                cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+            elif kind == OP_MOVE:
+                self._move(op[1], op[2])
+            elif kind == OP_GOTO:
+                self._goto(op[1], op[2])
+            elif kind == OP_CLEAR:
+                self._clear(op[1])
+            elif kind == OP_ERASE_LINE:
+                self._erase_line(op[1])
+            elif kind == OP_SCREEN_END:
+                self.origin = None
+                cursor.movePosition(QTextCursor.MoveOperation.End)
+        
+        # Sortie normale qui défile: fin du mode écran
+        doc = self.terminal.document()
+        if self.origin is not None and doc.blockCount() - self.origin > self.SCREEN_ROWS:
+            self.origin = None
+        
+        self.terminal.setTextCursor(cursor)
+        self.terminal.ensureCursorVisible()
+    
+    def reset(self):
+        """Revient en mode ajout en fin de document"""
+        self.origin = None
+        self.cursor.movePosition(QTextCursor.MoveOperation.End)
+    
+    def _write(self, text: str, fmt: QTextCharFormat):
+        """Insère en fin de document, écrase le texte sinon"""
+        cursor = self.cursor
+        if cursor.atEnd():
+            cursor.insertText(text, fmt)
+            return
+        
+        for i, part in enumerate(text.split('\n')):
+            if i and not cursor.movePosition(QTextCursor.MoveOperation.NextBlock):
+                cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock)
+                cursor.insertText('\n', fmt)
+            if part:
+                available = cursor.block().length() - 1 - cursor.positionInBlock()
+                if available > 0:
+                    cursor.movePosition(
+                        QTextCursor.MoveOperation.Right,
+                        QTextCursor.MoveMode.KeepAnchor,
+                        min(len(part), available),
+                    )
+                cursor.insertText(part, fmt)
+    
+    def _screen_origin(self) -> int:
+        """Bloc de début de l'écran courant"""
+        if self.origin is None:
+            self.origin = self.cursor.blockNumber()
+        return self.origin
+    
+    def _goto(self, row: int, col: int):
+        """Positionne le curseur (ligne, colonne) dans l'écran"""
+        doc = self.terminal.document()
+        target = self._screen_origin() + row
+        
+        missing = target - (doc.blockCount() - 1)
+        if missing > 0:
+            self.cursor.movePosition(QTextCursor.MoveOperation.End)
+            self.cursor.insertText('\n' * missing)
+        
+        block = doc.findBlockByNumber(target)
+        length = block.length() - 1
+        self.cursor.setPosition(block.position() + min(col, length))
+        if col > length:
+            self.cursor.insertText(' ' * (col - length))
+    
+    def _move(self, rows: int, cols: int):
+        """Déplacement relatif du curseur"""
+        if rows:
+            self._screen_origin()
+            row = self.cursor.blockNumber() - self.origin + rows
+            self._goto(max(row, 0), self.cursor.positionInBlock())
+        if cols:
+            self._goto(self.cursor.blockNumber() - self._screen_origin(),
+                       max(self.cursor.positionInBlock() + cols, 0))
+    
+    def _clear(self, mode: int):
+        """Efface l'écran (2/3) ou la fin de l'écran (0)"""
+        cursor = self.cursor
+        if mode in (2, 3):
+            block = self.terminal.document().findBlockByNumber(self._screen_origin())
+            cursor.setPosition(block.position())
+        elif mode != 0:
+            return
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+    
+    def _erase_line(self, mode: int):
+        """Efface la fin de ligne (0) ou la ligne entière (2)"""
+        cursor = self.cursor
+        col = cursor.positionInBlock()
+        if mode == 2:
+            cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+        elif mode != 0:
+            return
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        if mode == 2 and col:
+            cursor.insertText(' ' * col)
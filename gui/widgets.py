@@ -0,0 +1,175 @@
+"""
+Widgets - Sidebar, panels modules/suggestions et saisie de commande
+"""
+import os
+
+from PyQt6.QtCore import Qt, QEvent, QStringListModel, pyqtSignal
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QListWidget,
+    QListWidgetItem, QCompleter,
+)
+
+from . import styles
+
+
+class VSCodeSidebar(QWidget):
+    """Sidebar VSCode avec icônes"""
+    button_clicked = pyqtSignal(str)
+    
+    def __init__(self):
+        super().__init__()
+        self.setFixedWidth(50)
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(2)
+        layout.setContentsMargins(0, 10, 0, 10)
+        
+        buttons = [
+            ("🏠", "home", "Home"),
+            ("📊", "status", "Boot Status"),
+            ("💾", "modules", "Modules"),
+            ("💡", "suggestions", "Suggestions"),
+            ("📈", "metrics", "Metrics"),
+            ("⏱", "profile", "Profiling"),
+            ("⏳", "boot", "Boot Waterfall"),
+            ("🗄", "rack", "Rack Timeline"),
+            ("⚙️", "settings", "Settings"),
+        ]
+        
+        for icon, name, tooltip in buttons:
+            btn = QPushButton(icon)
+            btn.setObjectName(name)
+            btn.setToolTip(tooltip)
+            btn.setFixedSize(45, 45)
+            btn.clicked.connect(lambda checked, n=name: self.button_clicked.emit(n))
+            btn.setStyleSheet(styles.SIDEBAR_BUTTON)
+            layout.addWidget(btn)
+        
+        layout.addStretch()
+
+
+class ModulePanel(QWidget):
+    """Panel d'affichage des modules actifs"""
+    
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(6)
+        
+        title = QLabel("📦 Active Modules")
+        title.setStyleSheet(styles.PANEL_TITLE)
+        
+        self.modules_list = QListWidget()
+        self.modules_list.setStyleSheet(styles.MODULES_LIST)
+        
+        layout.addWidget(title)
+        layout.addWidget(self.modules_list)
+    
+    def update_modules(self, modules: list):
+        """Met à jour la liste des modules"""
+        self.modules_list.clear()
+        for module in modules:
+            item = QListWidgetItem(f"✅ {module}")
+            self.modules_list.addItem(item)
+
+
+class CommandInput(QLineEdit):
+    """Saisie de commande avec complétion classée (Tab)
+
+    Tab complète jusqu'au plus long préfixe commun des candidats, puis
+    parcourt les candidats; la liste classée s'affiche pendant la frappe.
+    """
+    
+    def __init__(self, engine=None):
+        super().__init__()
+        self.engine = engine
+        self.candidates = []
+        self.cycle = -1
+        
+        self.model = QStringListModel()
+        self.popup_completer = QCompleter(self.model, self)
+        self.popup_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.popup_completer.setWidget(self)
+        self.popup_completer.activated.connect(self.setText)
+        self.textEdited.connect(self.update_candidates)
+    
+    def update_candidates(self, text: str):
+        """Candidats pour le texte saisi"""
+        self.cycle = -1
+        self.candidates = self.engine.complete(text) if self.engine and text else []
+        self.model.setStringList(self.candidates)
+        if self.candidates and self.candidates != [text]:
+            self.popup_completer.complete()
+        else:
+            self.popup_completer.popup().hide()
+    
+    def event(self, event):
+        # Tab intercepté avant le changement de focus
+        if event.type() == QEvent.Type.KeyPress and event.key() == Qt.Key.Key_Tab:
+            self.complete_next()
+            return True
+        return super().event(event)
+    
+    def complete_next(self):
+        """Tab: préfixe commun, puis candidat suivant"""
+        text = self.text()
+        if self.cycle == -1:
+            self.update_candidates(text)
+        if not self.candidates:
+            return
+        
+        common = os.path.commonprefix(self.candidates)
+        if self.cycle == -1 and len(common) > len(text):
+            self.setText(common)
+            self.update_candidates(common)
+            return
+        
+        self.cycle = (self.cycle + 1) % len(self.candidates)
+        self.setText(self.candidates[self.cycle])
+    
+    def clear(self):
+        super().clear()
+        self.candidates = []
+        self.cycle = -1
+        self.popup_completer.popup().hide()
+
+
+class SuggestionsPanel(QWidget):
+    """Panel de suggestions contextuelles"""
+    
+    command_selected = pyqtSignal(str)
+    
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(6)
+        
+        title = QLabel("💡 Suggestions")
+        title.setStyleSheet(styles.PANEL_TITLE)
+        
+        self.suggestions_list = QListWidget()
+        self.suggestions_list.setStyleSheet(styles.SUGGESTIONS_LIST)
+        self.suggestions_list.itemDoubleClicked.connect(self.on_item_double_clicked)
+        
+        layout.addWidget(title)
+        layout.addWidget(self.suggestions_list)
+    
+    def update_suggestions(self, suggestions: list):
+        """Met à jour les suggestions"""
+        self.suggestions_list.clear()
+        for cmd in suggestions[:10]:
+            item = QListWidgetItem(f"• {cmd}")
+            self.suggestions_list.addItem(item)
+    
+    def on_item_double_clicked(self, item):
+        """Double-clic sur suggestion"""
+        cmd = item.text().replace("• ", "")
+        self.command_selected.emit(cmd)
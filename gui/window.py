@@ -0,0 +1,995 @@
+"""
+Window - Fenêtre principale de PiDebugger
+
+Le constructeur ne bâtit que le squelette visible (sidebar, terminal,
+saisie, barre d'état); le reste est fait après le premier affichage, une
+étape par tour de boucle Qt (`startup_steps`): panels latéraux, historique
+de complétion, profils, backend série. Les modules sont importés à leur
+première activation, les panels secondaires à leur première ouverture.
+"""
+import time
+from collections import deque
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PyQt6.QtWidgets import (
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton,
+    QComboBox, QLabel, QListWidget, QSplitter,
+)
+
+from . import settings, styles
+from .serial_reader import SerialReader, load_serial
+from .widgets import VSCodeSidebar, ModulePanel, SuggestionsPanel, CommandInput
+
+try:
+    from core.context_detector import ContextDetector, ContextType
+    from core.module_manager import ModuleManager
+    from core.pipeline import ConsolePipeline
+    from core.binary_stream import BinaryClassifier, hex_summary
+    from core.events import (
+        EventBus, LineReceived, ContextChanged, HardwareFact, CommandDiscovered, CommandSent,
+    )
+    from core.records import LineStore, EventStore
+    from core.completion import CommandCompleter, HISTORY_PATH
+    from core.metrics import METRICS, RX_LINES, FLUSH_SECONDS, QUEUE_DEPTH
+    from core.startup import STARTUP
+    from .terminal import AnsiRenderer
+    CORE_AVAILABLE = True
+except ImportError:
+    CORE_AVAILABLE = False
+    print("⚠️  Modules core/ non trouvés")
+
+# Vues filtrées du terminal (construites depuis les colonnes de LineStore)
+VIEW_FILTERS = [
+    ("All contexts", None),
+    ("Early boot", ('bootrom', 'wtmi', 'atf_bl1', 'atf_bl2', 'atf_bl31', 'atf_bl33')),
+    ("U-Boot", ('uboot_spl', 'uboot_main')),
+    ("Kernel", ('linux_kernel',)),
+    ("Userspace", ('linux_init', 'linux_shell')),
+]
+VIEW_WINDOWS = [("All time", None), ("Last 10 s", 10), ("Last 1 min", 60), ("Last 5 min", 300)]
+# Texte maximal d'une vue (les lignes les plus récentes)
+VIEW_BYTES = 4 * 2**20
+
+
+class PiDebuggerV51(QMainWindow):
+    """PiDebugger v5.1 Modular"""
+    
+    def __init__(self):
+        super().__init__()
+        self.serial = None
+        self.reader_thread = None
+        self.session_log = None
+        self.capture = None
+        self.capture_triggers = None
+        self.local_export = None    # pty / socket Unix du port (core.bridge)
+        self.start_time = None
+        self.rx_bytes = 0
+        self.tx_bytes = 0
+        self.consumed = 0
+        # Rafale binaire en cours: octets, premiers octets, ligne du terminal à terminer
+        self.binary_pending = 0
+        self.binary_sample = b''
+        self.binary_newline = False
+        self.metrics_panel = None
+        self.boot_panel = None
+        self.rack_panel = None
+        self.view_last = None       # dernière ligne affichée par la vue filtrée
+        self.view_lines = deque()   # (numéro, octets) des lignes de la vue filtrée
+        self.view_size = 0
+        self.cycler = None          # cycles d'alimentation (core.power), créé au premier clic
+        self.profiler = None
+        self.bridge_urls = []
+        self.completer = None
+        self.profile_watcher = None
+        self.module_panel = None
+        self.suggestions_panel = None
+        self.serial_module = None
+        
+        # Core components
+        if CORE_AVAILABLE:
+            # Complétion (historique chargé après le premier affichage)
+            self.completer = CommandCompleter(HISTORY_PATH)
+            
+            # Événements du pipeline: chaque consommateur s'abonne à ses types
+            self.bus = EventBus()
+            self.bus.subscribe(ContextChanged, self.on_context_events)
+            self.bus.subscribe(HardwareFact, self.on_hardware_facts)
+            self.bus.subscribe(CommandDiscovered, self.on_commands_discovered)
+            self.bus.subscribe(CommandSent, self.on_commands_sent)
+            # Lignes et événements de la session, en colonnes compactes
+            self.line_store = LineStore()
+            self.event_store = EventStore()
+            self.bus.subscribe(LineReceived, self.line_store.on_lines)
+            self.event_store.subscribe(self.bus)
+            # Profils de cartes publiés par UbootModule, écrits hors du thread GUI
+            from core.board_profile import ProfileRecorder
+            self.profile_recorder = ProfileRecorder()
+            self.profile_recorder.subscribe(self.bus)
+            # Captures déclenchées (anneau mémoire par port, voir core.capture)
+            if settings.CAPTURE_DIR:
+                from core.capture import CaptureTriggers
+                contexts = settings.CAPTURE_CONTEXTS
+                self.capture_triggers = CaptureTriggers(
+                    None if '*' in contexts else contexts, settings.CAPTURE_PATTERNS)
+                self.capture_triggers.subscribe(self.bus)
+            
+            self.context_detector = ContextDetector()
+            # Modules importés à leur première activation (contexte détecté)
+            self.module_manager = ModuleManager()
+            self.module_manager.on_module_loaded = self.on_module_loaded
+        else:
+            self.bus = None
+            self.line_store = None
+            self.event_store = None
+            self.profile_recorder = None
+            self.context_detector = None
+            self.module_manager = None
+        
+        self.init_ui()
+        styles.apply_vscode_theme(self)
+        
+        # Flux terminal: séquences ANSI → rendu coloré + lignes pour détection
+        if CORE_AVAILABLE:
+            self.pipeline = ConsolePipeline(
+                self.context_detector, self.module_manager, bus=self.bus,
+            )
+            self.ansi_renderer = AnsiRenderer(self.terminal)
+            STARTUP.mark('fenêtre')
+        
+        # Timer status bar
+        self.status_timer = QTimer()
+        self.status_timer.timeout.connect(self.update_status_bar)
+        self.status_timer.start(1000)
+        
+        # Le reste après le premier affichage, une étape par tour de boucle
+        self.startup_steps = [
+            ('panels latéraux', self.create_side_panels),
+            ('historique', self.load_history),
+            ('profils', self.load_profiles),
+            ('sandbox', self.start_sandbox),
+            ('pyserial', self.start_serial),
+        ]
+        QTimer.singleShot(0, self.run_startup_step)
+    
+    def run_startup_step(self):
+        """Exécute l'étape de démarrage suivante puis rend la main à Qt"""
+        if not self.startup_steps:
+            if CORE_AVAILABLE:
+                STARTUP.done()
+                if settings.STARTUP_REPORT:
+                    print(STARTUP.report())
+            return
+        name, step = self.startup_steps.pop(0)
+        if CORE_AVAILABLE:
+            with STARTUP.step(name):
+                step()
+        else:
+            step()
+        QTimer.singleShot(0, self.run_startup_step)
+    
+    def load_history(self):
+        """Historique de complétion des sessions précédentes"""
+        if self.completer:
+            self.completer.load()
+    
+    def load_profiles(self):
+        """Profils de contextes/modules (rechargés à chaud)"""
+        if not CORE_AVAILABLE:
+            return
+        from core.profiles import ProfileWatcher
+        
+        self.profile_watcher = ProfileWatcher(settings.PROFILES_DIR)
+        self.apply_profile(self.profile_watcher.load())
+        if self.profile_watcher.last_error:
+            self.append_terminal(f"⚠️ Profil: {self.profile_watcher.last_error}\n", "#cca700")
+        
+        self.profile_timer = QTimer()
+        self.profile_timer.timeout.connect(self.reload_profiles)
+        self.profile_timer.start(2000)
+    
+    def start_sandbox(self):
+        """Budget par module / processus de travail (résultats via poll)"""
+        if not CORE_AVAILABLE or not (settings.SANDBOX_BUDGET_MS or settings.ISOLATED_MODULES):
+            return
+        sandbox = self.module_manager.enable_sandbox(
+            budget_ms=settings.SANDBOX_BUDGET_MS or 5.0, on_result=self.on_module_result)
+        for module in settings.ISOLATED_MODULES:
+            sandbox.isolate(module)
+        
+        self.sandbox_timer = QTimer()
+        self.sandbox_timer.timeout.connect(self.poll_sandbox)
+        self.sandbox_timer.start(50)
+    
+    def start_serial(self):
+        """Import de pyserial, liste des ports puis rafraîchissement périodique"""
+        self.serial_module = load_serial()
+        self.refresh_ports()
+        
+        self.port_timer = QTimer()
+        self.port_timer.timeout.connect(self.refresh_ports)
+        self.port_timer.start(2000)
+    
+    def on_module_loaded(self, module_name: str, instance):
+        """Module importé à sa première activation: commandes pour la complétion"""
+        if self.completer:
+            for category in getattr(instance, 'commands', {}).values():
+                self.completer.add_many(category, 'module')
+        if self.capture_triggers:
+            self.capture_triggers.add_patterns(getattr(instance, 'capture_patterns', ()))
+    
+    def init_ui(self):
+        """Interface"""
+        self.setWindowTitle('⚙️ PiDebugger v5.1 Modular - VSCode Style')
+        self.setGeometry(100, 100, 1800, 900)
+        
+        central = QWidget()
+        self.setCentralWidget(central)
+        main_layout = QHBoxLayout(central)
+        main_layout.setSpacing(0)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # Sidebar
+        self.sidebar = VSCodeSidebar()
+        self.sidebar.button_clicked.connect(self.on_sidebar_clicked)
+        
+        # Splitter 3 colonnes
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        
+        # Panels gauche (modules, suggestions) et droit (contexte, hardware,
+        # timeline): conteneurs vides, remplis après le premier affichage
+        self.left_container = QWidget()
+        self.right_container = QWidget()
+        
+        # Panel centre: Terminal
+        center_panel = self.create_center_panel()
+        
+        splitter.addWidget(self.left_container)
+        splitter.addWidget(center_panel)
+        splitter.addWidget(self.right_container)
+        splitter.setSizes([300, 900, 300])
+        
+        main_layout.addWidget(self.sidebar)
+        main_layout.addWidget(splitter)
+        
+        # Status bar
+        self.create_status_bar()
+    
+    def create_side_panels(self):
+        """Construit les panels latéraux dans leurs conteneurs"""
+        self.create_left_panel(self.left_container)
+        self.create_right_panel(self.right_container)
+    
+    def create_left_panel(self, widget):
+        """Panel gauche: Modules + Suggestions"""
+        layout = QVBoxLayout(widget)
+        layout.setSpacing(8)
+        layout.setContentsMargins(8, 8, 8, 8)
+        
+        self.module_panel = ModulePanel()
+        self.suggestions_panel = SuggestionsPanel()
+        self.suggestions_panel.command_selected.connect(self.on_suggestion_selected)
+        
+        layout.addWidget(self.module_panel, stretch=1)
+        layout.addWidget(self.suggestions_panel, stretch=2)
+        
+        return widget
+    
+    def create_center_panel(self):
+        """Panel centre: Terminal"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setSpacing(8)
+        layout.setContentsMargins(8, 8, 8, 8)
+        
+        # Connection
+        conn_layout = QHBoxLayout()
+        conn_layout.setSpacing(8)
+        
+        conn_label = QLabel("🔌")
+        conn_label.setStyleSheet(styles.CONN_LABEL)
+        
+        self.port_combo = QComboBox()
+        self.port_combo.setMinimumWidth(250)
+        # Éditable: accepte aussi socket://hôte:port ou rfc2217://hôte:port (bridge)
+        self.port_combo.setEditable(True)
+        
+        self.refresh_btn = QPushButton("🔄")
+        self.refresh_btn.setFixedWidth(40)
+        self.refresh_btn.clicked.connect(self.refresh_ports)
+        
+        self.connect_btn = QPushButton("Connect")
+        self.connect_btn.clicked.connect(self.toggle_connection)
+        self.connect_btn.setFixedWidth(100)
+        
+        conn_layout.addWidget(conn_label)
+        conn_layout.addWidget(self.port_combo)
+        conn_layout.addWidget(self.refresh_btn)
+        conn_layout.addWidget(self.connect_btn)
+        
+        # Coupure/remise sous tension de la carte (backend --power)
+        if settings.POWER_BACKEND:
+            self.power_btn = QPushButton("⏻")
+            self.power_btn.setFixedWidth(40)
+            self.power_btn.setToolTip(f"Power cycle ({settings.POWER_BACKEND})")
+            self.power_btn.clicked.connect(self.power_cycle)
+            conn_layout.addWidget(self.power_btn)
+        conn_layout.addStretch()
+        
+        # Terminal
+        term_label = QLabel("💻 Terminal")
+        term_label.setStyleSheet(styles.TERMINAL_LABEL)
+        
+        self.terminal = QTextEdit()
+        self.terminal.setReadOnly(True)
+        self.terminal.setStyleSheet(styles.TERMINAL)
+        
+        # Vue filtrée (contexte, fenêtre de temps): remplace le terminal
+        # tant qu'un filtre est actif
+        self.filter_view = QTextEdit()
+        self.filter_view.setReadOnly(True)
+        self.filter_view.setUndoRedoEnabled(False)     # retraits/ajouts incrémentaux
+        self.filter_view.setStyleSheet(styles.TERMINAL)
+        self.filter_view.hide()
+        
+        self.view_combo = QComboBox()
+        self.view_combo.addItems([name for name, _ in VIEW_FILTERS])
+        self.view_combo.currentIndexChanged.connect(self.refresh_filter_view)
+        self.window_combo = QComboBox()
+        self.window_combo.addItems([name for name, _ in VIEW_WINDOWS])
+        self.window_combo.currentIndexChanged.connect(self.refresh_filter_view)
+        
+        term_header = QHBoxLayout()
+        term_header.addWidget(term_label)
+        term_header.addStretch()
+        term_header.addWidget(self.view_combo)
+        term_header.addWidget(self.window_combo)
+        
+        # Input
+        input_layout = QHBoxLayout()
+        input_layout.setSpacing(4)
+        
+        prompt = QLabel(">")
+        prompt.setStyleSheet(styles.PROMPT_LABEL)
+        
+        self.command_input = CommandInput(self.completer)
+        self.command_input.setPlaceholderText("Type command...")
+        self.command_input.returnPressed.connect(self.send_command)
+        
+        self.send_btn = QPushButton("Send")
+        self.send_btn.setFixedWidth(80)
+        self.send_btn.clicked.connect(self.send_command)
+        
+        self.enter_btn = QPushButton("↵")
+        self.enter_btn.setFixedWidth(50)
+        self.enter_btn.setToolTip("Send Enter")
+        self.enter_btn.clicked.connect(self.send_enter)
+        
+        self.interrupt_btn = QPushButton("^C")
+        self.interrupt_btn.setFixedWidth(50)
+        self.interrupt_btn.clicked.connect(self.send_interrupt)
+        
+        input_layout.addWidget(prompt)
+        input_layout.addWidget(self.command_input)
+        input_layout.addWidget(self.send_btn)
+        input_layout.addWidget(self.enter_btn)
+        input_layout.addWidget(self.interrupt_btn)
+        
+        layout.addLayout(conn_layout)
+        layout.addLayout(term_header)
+        layout.addWidget(self.terminal)
+        layout.addWidget(self.filter_view)
+        layout.addLayout(input_layout)
+        
+        return widget
+    
+    def create_right_panel(self, widget):
+        """Panel droit: Hardware + Timeline"""
+        layout = QVBoxLayout(widget)
+        layout.setSpacing(8)
+        layout.setContentsMargins(8, 8, 8, 8)
+        
+        # Context
+        context_label = QLabel("🎯 Context")
+        context_label.setStyleSheet(styles.SECTION_LABEL)
+        
+        self.context_text = QLabel("Disconnected")
+        self.context_text.setStyleSheet(styles.CONTEXT_BOX)
+        self.context_text.setWordWrap(True)
+        
+        # Hardware
+        hw_label = QLabel("🔧 Hardware")
+        hw_label.setStyleSheet(styles.SECTION_LABEL)
+        
+        self.hardware_text = QLabel("No hardware detected")
+        self.hardware_text.setStyleSheet(styles.HARDWARE_BOX)
+        self.hardware_text.setWordWrap(True)
+        
+        # Timeline
+        timeline_label = QLabel("📈 Timeline")
+        timeline_label.setStyleSheet(styles.SECTION_LABEL)
+        
+        self.timeline_list = QListWidget()
+        self.timeline_list.setStyleSheet(styles.TIMELINE_LIST)
+        
+        layout.addWidget(context_label)
+        layout.addWidget(self.context_text)
+        layout.addWidget(hw_label)
+        layout.addWidget(self.hardware_text)
+        layout.addWidget(timeline_label)
+        layout.addWidget(self.timeline_list, stretch=1)
+        
+        return widget
+    
+    def create_status_bar(self):
+        """Status bar"""
+        status = self.statusBar()
+        status.setStyleSheet(styles.STATUS_BAR)
+        
+        self.status_context = QLabel("Context: —")
+        self.status_port = QLabel("Port: —")
+        self.status_uptime = QLabel("Uptime: —")
+        self.status_stats = QLabel("RX: 0 | TX: 0")
+        
+        status.addWidget(self.status_context)
+        status.addWidget(QLabel(" │ "))
+        status.addWidget(self.status_port)
+        status.addWidget(QLabel(" │ "))
+        status.addWidget(self.status_uptime)
+        status.addPermanentWidget(self.status_stats)
+    
+    def refresh_ports(self):
+        """Rafraîchit les ports"""
+        serial = self.serial_module
+        if serial is None:
+            return
+        
+        # Ne pas écraser une URL en cours de saisie
+        if self.port_combo.lineEdit().hasFocus():
+            return
+        
+        current = self.port_combo.currentText()
+        self.port_combo.clear()
+        
+        ports = serial.tools.list_ports.comports()
+        for port in ports:
+            self.port_combo.addItem(f"{port.device} - {port.description}")
+        
+        for url in self.bridge_urls:
+            self.port_combo.addItem(url)
+        
+        idx = self.port_combo.findText(current)
+        if idx >= 0:
+            self.port_combo.setCurrentIndex(idx)
+    
+    def toggle_connection(self):
+        """Toggle connexion"""
+        if self.serial and self.serial.is_open:
+            self.disconnect()
+        else:
+            self.connect()
+    
+    def connect(self):
+        """Connexion"""
+        serial = self.serial_module
+        if serial is None:
+            return
+        
+        port_text = self.port_combo.currentText()
+        if not port_text:
+            return
+        
+        port = port_text.split(' - ')[0].strip()
+        
+        try:
+            if '://' in port:
+                # Port distant exporté par un bridge (python -m core.bridge)
+                self.serial = serial.serial_for_url(port, 115200, timeout=0.1)
+                if port not in self.bridge_urls:
+                    self.bridge_urls.append(port)
+            else:
+                self.serial = serial.Serial(port, 115200, timeout=0.1)
+            if CORE_AVAILABLE and settings.LOG_DIR:
+                from core.session_log import SessionLogger
+                self.session_log = SessionLogger(settings.LOG_DIR, port)
+            if self.capture_triggers:
+                from core.capture import TriggerCapture
+                self.capture = TriggerCapture(
+                    settings.CAPTURE_DIR, port, int(settings.CAPTURE_RING_MB * 2**20))
+                self.capture_triggers.capture = self.capture
+            hub = None
+            if CORE_AVAILABLE and settings.EXPORT_LOCAL:
+                hub = self.start_local_export(port)
+            if self.line_store is not None:
+                self.line_store.current_port = port
+            if self.rack_panel is not None:
+                self.rack_panel.set_port(port)
+            classifier = None
+            if CORE_AVAILABLE and settings.BINARY_WINDOW:
+                classifier = BinaryClassifier(settings.BINARY_WINDOW)
+            self.reader_thread = SerialReader(
+                self.serial, self.session_log, self.capture, hub, classifier)
+            self.consumed = 0
+            self.reader_thread.data_received.connect(self.on_data_received)
+            self.reader_thread.binary_received.connect(self.on_binary_received)
+            self.reader_thread.start()
+            
+            self.connect_btn.setText("Disconnect")
+            self.connect_btn.setStyleSheet("background-color: #f48771;")
+            self.start_time = time.time()
+            
+            if self.context_detector:
+                self.context_detector.current_context.type = ContextType.UNKNOWN
+                self.pipeline.reset()
+            
+            self.append_terminal(f"✅ Connected to {port}\n", "#89d185")
+            
+        except Exception as e:
+            self.append_terminal(f"❌ Error: {e}\n", "#f48771")
+    
+    def start_local_export(self, port: str):
+        """Partage du port avec des outils externes: pty et/ou socket Unix"""
+        from core.bridge import BridgeServer, local_paths
+        
+        server = BridgeServer()
+        # Le port est lu par SerialReader, qui publie dans le hub
+        exported = server.add_port(self.serial, None, read=False)
+        link, sock = local_paths(settings.EXPORT_DIR, port)
+        if 'pty' in settings.EXPORT_LOCAL:
+            server.add_pty(exported, link)
+            self.append_terminal(f"🔗 pty: {link} → {exported.pty_path}\n", "#89d185")
+        if 'unix' in settings.EXPORT_LOCAL:
+            server.add_unix(exported, sock)
+            self.append_terminal(f"🔗 unix: {sock}\n", "#89d185")
+        server.start()
+        self.local_export = server
+        return exported.hub
+    
+    def disconnect(self):
+        """Déconnexion"""
+        if self.reader_thread:
+            self.reader_thread.stop()
+            self.reader_thread.wait()
+        
+        if self.binary_pending:
+            self.flush_binary_summary()
+        
+        if self.local_export:
+            self.local_export.stop()
+            self.local_export = None
+        
+        if self.session_log:
+            self.session_log.close()
+            self.session_log = None
+        
+        if self.capture:
+            self.capture_triggers.capture = None
+            self.capture.close()
+            self.capture = None
+        
+        if self.serial:
+            self.serial.close()
+            self.serial = None
+        
+        self.connect_btn.setText("Connect")
+        self.connect_btn.setStyleSheet("")
+        self.start_time = None
+        
+        self.append_terminal("❌ Disconnected\n", "#f48771")
+    
+    def send_command(self):
+        """Envoie commande"""
+        cmd = self.command_input.text()
+        if not cmd or not self.serial or not self.serial.is_open:
+            return
+        
+        try:
+            self.serial.write((cmd + '\n').encode('utf-8'))
+            self.serial.flush()
+            self.tx_bytes += len(cmd) + 1
+            if self.bus:
+                self.bus.publish(CommandSent, cmd, self.serial.port, time.time())
+                self.bus.flush()
+            self.append_terminal(f"{cmd}\n", "#569cd6")
+            self.command_input.clear()
+        except Exception as e:
+            self.append_terminal(f"❌ {e}\n", "#f48771")
+    
+    def send_enter(self):
+        """Envoie Enter"""
+        if self.serial and self.serial.is_open:
+            try:
+                self.serial.write(b'\n')
+                self.serial.flush()
+                self.tx_bytes += 1
+                self.append_terminal("↵\n", "#cca700")
+            except:
+                pass
+    
+    def send_interrupt(self):
+        """Envoie Ctrl-C"""
+        if self.serial and self.serial.is_open:
+            try:
+                self.serial.write(b'\x03')
+                self.serial.flush()
+                self.tx_bytes += 1
+                self.append_terminal("^C\n", "#f48771")
+            except:
+                pass
+    
+    def on_data_received(self, text, timestamp):
+        """Données reçues"""
+        self.rx_bytes += len(text)
+        self.consumed += 1
+        
+        if self.binary_pending:
+            self.flush_binary_summary()
+        
+        if not CORE_AVAILABLE:
+            self.append_terminal(text, "#d4d4d4")
+            return
+        
+        # Pipeline: ANSI → lignes → contexte → modules, puis rendu coloré
+        if METRICS.enabled:
+            port = self.serial.port if self.serial else '—'
+            if self.reader_thread:
+                QUEUE_DEPTH.set(self.reader_thread.emitted - self.consumed, port)
+            lines_before = self.pipeline.line_count
+            ops = self.pipeline.feed(text, timestamp)
+            RX_LINES.inc(self.pipeline.line_count - lines_before, port)
+            start = time.perf_counter()
+            self.ansi_renderer.render(ops)
+            FLUSH_SECONDS.observe(time.perf_counter() - start)
+        else:
+            self.ansi_renderer.render(self.pipeline.feed(text, timestamp))
+    
+    def on_binary_received(self, data, timestamp):
+        """Chunk binaire: ni détection ni modules, une ligne de résumé par seconde"""
+        self.rx_bytes += len(data)
+        self.consumed += 1
+        if not self.binary_pending:
+            self.binary_sample = data[:16]
+            # Ligne interrompue par la rafale: le résumé commence à la ligne
+            self.binary_newline = bool(self.pipeline.lines.partial)
+        self.binary_pending += len(data)
+        self.pipeline.skip_binary(len(data))
+    
+    def flush_binary_summary(self):
+        """Résumé hexadécimal des octets binaires reçus depuis le dernier résumé"""
+        prefix = '\n' if self.binary_newline else ''
+        summary = hex_summary(self.binary_sample, self.binary_pending)
+        self.append_terminal(f"{prefix}{summary}\n", "#808080")
+        self.binary_pending = 0
+        self.binary_newline = False
+    
+    def on_context_events(self, events):
+        """Nouveaux contextes du chunk (modules déjà activés par le pipeline)"""
+        if self.session_log:
+            for event in events:
+                self.session_log.mark(event.context.type.value, event.ts)
+        # Seul le dernier contexte est affiché
+        context = events[-1].context
+        self.update_context(context)
+        self.update_modules_ui(context.type.value)
+    
+    def on_hardware_facts(self, events):
+        """Informations matérielles extraites pendant le chunk"""
+        self.update_hardware({event.key: event.value for event in events})
+    
+    def on_commands_discovered(self, events):
+        """Commandes découvertes (sortie `help` U-Boot)"""
+        if self.completer:
+            self.completer.add_many((event.command for event in events), 'help')
+    
+    def on_commands_sent(self, events):
+        """Commandes envoyées: fréquence/récence pour la complétion"""
+        if self.completer:
+            for event in events:
+                self.completer.record(event.command, event.ts)
+            self.completer.save()
+    
+    def on_module_result(self, result: dict):
+        """Résultat différé d'un module isolé (sandbox)"""
+        context = self.context_detector.current_context.type.value
+        self.bus.publish_result(result, self.pipeline.line_count, context, time.time())
+    
+    def poll_sandbox(self):
+        """Résultats des modules isolés → bus"""
+        self.module_manager.sandbox.poll()
+        self.bus.flush()
+    
+    def activate_modules_for_context(self, context_type: str):
+        """Active les modules pour un contexte"""
+        self.module_manager.activate_for_context(context_type)
+        self.update_modules_ui(context_type)
+    
+    def update_modules_ui(self, context_type: str):
+        """Met à jour modules actifs et suggestions"""
+        if self.module_panel is None:
+            return
+        self.module_panel.update_modules(self.module_manager.get_active_modules())
+        
+        # Update suggestions
+        suggestions = self.module_manager.get_suggestions(context_type)
+        if self.completer:
+            suggestions = self.completer.rank(suggestions)
+        self.suggestions_panel.update_suggestions(suggestions)
+    
+    def apply_profile(self, profile):
+        """Applique un profil compilé sans réinitialiser la session"""
+        self.context_detector.apply_profile(profile)
+        self.module_manager.apply_profile(profile)
+        self.completer.add_many(self.module_manager.get_all_commands(), 'module')
+    
+    def reload_profiles(self):
+        """Recharge les profils modifiés sur disque"""
+        error = self.profile_watcher.last_error
+        profile = self.profile_watcher.poll()
+        
+        if profile:
+            self.apply_profile(profile)
+            ctx = self.context_detector.current_context.type.value
+            self.activate_modules_for_context(ctx)
+            self.append_terminal(
+                f"🔄 Profils rechargés ({len(profile.sources)} fichiers, "
+                f"{profile.compile_ms:.1f} ms)\n", "#89d185"
+            )
+        elif self.profile_watcher.last_error and self.profile_watcher.last_error != error:
+            self.append_terminal(f"⚠️ Profil: {self.profile_watcher.last_error}\n", "#cca700")
+    
+    def update_context(self, context):
+        """Met à jour le contexte"""
+        ctx_type = context.type.value.replace('_', ' ').title()
+        
+        text = f"{ctx_type}"
+        if context.prompt:
+            text += f"\nPrompt: {context.prompt}"
+        if context.version:
+            text += f"\nVersion: {context.version}"
+        
+        self.context_text.setText(text)
+        
+        # Timeline
+        ts = time.strftime('%H:%M:%S')
+        self.timeline_list.insertItem(0, f"{ts} - {ctx_type}")
+    
+    def update_hardware(self, hardware: dict):
+        """Met à jour hardware"""
+        lines = []
+        for key, value in hardware.items():
+            if not isinstance(value, (dict, list)):
+                lines.append(f"{key}: {value}")
+        
+        if lines:
+            self.hardware_text.setText('\n'.join(lines[:6]))
+    
+    def append_terminal(self, text, color="#d4d4d4"):
+        """Ajoute au terminal"""
+        cursor = self.terminal.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        
+        cursor.insertText(text, fmt)
+        self.terminal.setTextCursor(cursor)
+        self.terminal.ensureCursorVisible()
+        
+        if CORE_AVAILABLE:
+            self.ansi_renderer.reset()
+    
+    def power_cycle(self):
+        """Coupe la carte puis la rallume; le cycle mesure les phases jusqu'au shell"""
+        if not CORE_AVAILABLE:
+            return
+        if self.cycler is None:
+            from core.power import BootCycler, MockPower, open_backend
+            try:
+                backend = open_backend(settings.POWER_BACKEND)
+            except Exception as e:
+                self.append_terminal(f"❌ Power: {e}\n", "#f48771")
+                return
+            self.cycler = BootCycler(self.line_store.current_port or 'session', backend,
+                                     on_cycle=self.on_power_cycle)
+            self.cycler.subscribe(self.bus)
+            if isinstance(backend, MockPower):
+                # Carte simulée: sa sortie remplace le port série
+                self.mock_timer = QTimer()
+                self.mock_timer.timeout.connect(self.read_mock_power)
+                self.mock_timer.start(50)
+        
+        try:
+            self.cycler.backend.off()
+        except Exception as e:
+            self.append_terminal(f"❌ Power: {e}\n", "#f48771")
+            return
+        self.power_btn.setEnabled(False)
+        self.append_terminal("⏻ Power off\n", "#cca700")
+        QTimer.singleShot(int(self.cycler.off_seconds * 1000), self.power_on)
+    
+    def power_on(self):
+        """Remise sous tension: début du cycle (contexte remis à zéro)"""
+        self.context_detector.current_context.type = ContextType.UNKNOWN
+        self.pipeline.reset()
+        try:
+            self.cycler.start()
+        except Exception as e:
+            self.append_terminal(f"❌ Power: {e}\n", "#f48771")
+            return
+        finally:
+            self.power_btn.setEnabled(True)
+        self.append_terminal("⏻ Power on\n", "#cca700")
+    
+    def read_mock_power(self):
+        """Sortie de la carte simulée (backend mock) vers le pipeline"""
+        data = self.cycler.backend.drain()
+        if data:
+            self.rx_bytes += len(data)
+            self.ansi_renderer.render(self.pipeline.feed(data.decode('utf-8', errors='replace'), time.time()))
+    
+    def on_power_cycle(self, result):
+        """Cycle terminé: instants d'entrée dans chaque phase"""
+        phases = ', '.join(f"{ctx} {t:.2f}s" for ctx, t in result['phases'].items())
+        state = "✅" if result['reached'] else "⏱ timeout"
+        self.append_terminal(f"⏻ Cycle {result['cycle']} {state}: {phases}\n", "#cca700")
+    
+    def refresh_filter_view(self):
+        """Vue filtrée depuis l'index de lignes (pas de nouvelle détection)"""
+        contexts = VIEW_FILTERS[self.view_combo.currentIndex()][1]
+        window = VIEW_WINDOWS[self.window_combo.currentIndex()][1]
+        if self.line_store is None or (contexts is None and window is None):
+            self.view_last = None
+            self.filter_view.hide()
+            self.terminal.show()
+            return
+        
+        store = self.line_store
+        t0 = time.time() - window if window else None
+        runs = store.runs(contexts, t0)
+        self.view_lines = deque(store.sizes(runs, VIEW_BYTES))
+        self.view_size = sum(size for _, size in self.view_lines)
+        self.filter_view.setPlainText(store.view(runs, VIEW_BYTES))
+        self.filter_view.moveCursor(QTextCursor.MoveOperation.End)
+        self.view_last = store.last
+        self.terminal.hide()
+        self.filter_view.show()
+    
+    def extend_filter_view(self):
+        """Vue filtrée: ajoute les nouvelles lignes, retire celles sorties de la fenêtre"""
+        contexts = VIEW_FILTERS[self.view_combo.currentIndex()][1]
+        window = VIEW_WINDOWS[self.window_combo.currentIndex()][1]
+        store = self.line_store
+        t0 = time.time() - window if window else None
+        runs = store.runs(contexts, t0, since=self.view_last + 1)
+        added = store.sizes(runs, VIEW_BYTES)
+        if sum(size for _, size in added) >= VIEW_BYTES:
+            self.refresh_filter_view()
+            return
+        
+        # Lignes en tête: oubliées par l'index, hors fenêtre de temps, au-delà de VIEW_BYTES
+        lines = self.view_lines
+        lines.extend(added)
+        self.view_size += sum(size for _, size in added)
+        removed = 0
+        while lines:
+            number, size = lines[0]
+            if (number >= store.first and (window is None or store.age(number) <= window)
+                    and self.view_size <= VIEW_BYTES):
+                break
+            lines.popleft()
+            self.view_size -= size
+            removed += 1
+        
+        cursor = QTextCursor(self.filter_view.document())
+        cursor.beginEditBlock()
+        if removed:
+            cursor.movePosition(QTextCursor.MoveOperation.NextBlock,
+                                QTextCursor.MoveMode.KeepAnchor, removed)
+            cursor.removeSelectedText()
+        if added:
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(store.view(runs))
+        cursor.endEditBlock()
+        if added:
+            self.filter_view.moveCursor(QTextCursor.MoveOperation.End)
+        self.view_last = store.last
+    
+    def update_status_bar(self):
+        """Met à jour status bar"""
+        if self.capture:
+            self.capture.poll()
+        if self.cycler:
+            self.cycler.expire()
+        if self.binary_pending:
+            self.flush_binary_summary()
+        if self.view_last is not None and (
+                self.line_store.last != self.view_last
+                or VIEW_WINDOWS[self.window_combo.currentIndex()][1]):
+            self.extend_filter_view()
+        if self.context_detector:
+            ctx = self.context_detector.current_context.type.value
+            self.status_context.setText(f"Context: {ctx}")
+        
+        if self.serial and self.serial.is_open:
+            self.status_port.setText(f"Port: {self.serial.port}")
+        else:
+            self.status_port.setText("Port: —")
+        
+        if self.start_time:
+            uptime = int(time.time() - self.start_time)
+            h = uptime // 3600
+            m = (uptime % 3600) // 60
+            s = uptime % 60
+            self.status_uptime.setText(f"Uptime: {h:02d}:{m:02d}:{s:02d}")
+        
+        rx_k = self.rx_bytes / 1024
+        tx_k = self.tx_bytes / 1024
+        self.status_stats.setText(f"RX: {rx_k:.1f}K | TX: {tx_k:.1f}K")
+    
+    def on_sidebar_clicked(self, name):
+        """Clic sidebar"""
+        if name == "metrics" and CORE_AVAILABLE:
+            if self.metrics_panel is None:
+                from .panels import MetricsPanel
+                self.metrics_panel = MetricsPanel(self.module_manager.sandbox)
+            self.metrics_panel.show()
+            self.metrics_panel.raise_()
+            return
+        if name == "profile" and CORE_AVAILABLE:
+            self.toggle_profiling()
+            return
+        if name == "boot" and CORE_AVAILABLE:
+            if self.boot_panel is None:
+                from .panels import BootTimelinePanel
+                self.boot_panel = BootTimelinePanel(self.module_manager)
+            self.boot_panel.show()
+            self.boot_panel.raise_()
+            return
+        if name == "rack" and CORE_AVAILABLE:
+            if self.rack_panel is None:
+                from .panels import RackTimelinePanel
+                self.rack_panel = RackTimelinePanel(
+                    self.bus, self.event_store, self.line_store.current_port, [settings.LOG_DIR])
+            self.rack_panel.show()
+            self.rack_panel.raise_()
+            return
+        print(f"Sidebar: {name}")
+    
+    def toggle_profiling(self):
+        """Démarre/arrête le profilage du pipeline de détection"""
+        if self.profiler is None:
+            from core.profiler import Profiler
+            self.profiler = Profiler()
+            self.profiler.attach(self.context_detector, self.module_manager)
+            self.append_terminal("⏱ Profilage démarré\n", "#cca700")
+            return
+        
+        profiler, self.profiler = self.profiler, None
+        profiler.detach(self.context_detector, self.module_manager)
+        
+        base = time.strftime('profile-%Y%m%d-%H%M%S')
+        with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+            f.write(profiler.report(top=1000) + '\n')
+        with open(f"{base}.folded", 'w', encoding='utf-8') as f:
+            f.write(profiler.collapsed())
+        
+        self.append_terminal(
+            f"⏱ Profilage arrêté: {base}.txt, {base}.folded\n{profiler.report(top=10)}\n",
+            "#cca700"
+        )
+    
+    def on_suggestion_selected(self, cmd):
+        """Suggestion sélectionnée"""
+        self.command_input.setText(cmd)
+        self.command_input.setFocus()
+    
+    def closeEvent(self, event):
+        """Fermeture"""
+        self.disconnect()
+        if CORE_AVAILABLE and self.module_manager.sandbox:
+            self.module_manager.sandbox.close()
+        if self.cycler:
+            self.cycler.backend.close()
+        if self.profile_recorder:
+            self.profile_recorder.close()
+        event.accept()
@@ -1 +1,2 @@
-__all__ = ['base_module', 'uboot_module', 'linux_module', 'atf_module']
+__all__ = ['base_module', 'uboot_module', 'linux_module', 'atf_module',
+           'bootrom_module', 'wtmi_module', 'boot_tables']
@@ -3,6 +3,7 @@ ATF Module - ARM Trusted Firmware
 """
 import re
 from .base_module import BaseModule
+from .boot_tables import TableDecoder
 
 class AtfModule(BaseModule):
     """Module ATF"""
@@ -12,6 +13,14 @@ class AtfModule(BaseModule):
             name='atf_firmware',
             context_types=['atf_bl1', 'atf_bl2', 'atf_bl31', 'atf_bl33']
         )
+        
+        self.extractors = [
+            ('atf_version', re.compile(r'BL31: v([\d.]+)')),   # Version ATF
+            ('platform', re.compile(r'Platform: (.*?)$')),     # Platform
+        ]
+        
+        # Erreurs ATF: niveau, image id et code errno décodés par tables
+        self.decoder = TableDecoder(['atf'])
     
     def get_suggestions(self, context_type: str) -> list:
         """Suggestions ATF (limitées)"""
@@ -20,19 +29,15 @@ class AtfModule(BaseModule):
     def process_line(self, line: str, context_type: str) -> dict:
         """Traite une ligne ATF"""
         result = {
-            'hardware': {},
+            'hardware': self.extract(line),
             'commands': [],
             'alerts': []
         }
         
-        # Version ATF
-        match = re.search(r'BL31: v([\d.]+)', line)
-        if match:
-            result['hardware']['atf_version'] = match.group(1)
+        self.decoder.decode(line, result)
         
-        # Platform
-        match = re.search(r'Platform: (.*?)$', line)
-        if match:
-            result['hardware']['platform'] = match.group(1).strip()
-        
-        return result if result['hardware'] else None
+        return result if result['hardware'] or result['alerts'] else None
+    
+    def process_batch(self, lines: list, contexts: list) -> list:
+        """Lot de lignes ATF: extracteurs sur le tampon joint puis tables"""
+        return self.decoder.decode_batch(lines, self.extract_batch(lines))
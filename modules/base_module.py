@@ -1,8 +1,29 @@
 """
 Base Module - Classe de base pour tous les modules
 """
+import re
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from bisect import bisect_right
+from itertools import accumulate
+from time import perf_counter
+from typing import List, Dict, Optional, Tuple
+
+from core.regex_safety import compile_pattern
+
+# Constructions dont le sens change entre une ligne seule et un tampon
+# multi-lignes: ces extracteurs restent évalués ligne par ligne
+_LINE_ONLY_RE = re.compile(r'\\[AZ]|\(\?<[=!]')
+
+
+def join_lines(lines: List[str]) -> Tuple[str, List[int]]:
+    """Tampon '\\n'.join(lines) et position de début de chaque ligne"""
+    return '\n'.join(lines), list(accumulate((len(l) + 1 for l in lines[:-1]), initial=0))
+
+
+def line_index(starts: List[int], pos: int) -> int:
+    """Ligne contenant la position `pos` du tampon"""
+    return bisect_right(starts, pos) - 1
+
 
 class BaseModule(ABC):
     """Classe de base pour modules"""
@@ -11,6 +32,14 @@ class BaseModule(ABC):
         self.name = name
         self.context_types = context_types
         self.enabled = True
+        # Extracteurs hardware: (clé, regex compilée), groupe 1 = valeur
+        self.extractors = []
+        # Profiler actif (None = désactivé)
+        self.profiler = None
+        # Extracteurs recompilés pour le tampon d'un lot (re.M), voir extract_batch
+        self._batch_extractors = None
+        # Regex qui déclenchent une capture (core.capture)
+        self.capture_patterns = []
     
     @abstractmethod
     def get_suggestions(self, context_type: str) -> List[str]:
@@ -22,6 +51,92 @@ class BaseModule(ABC):
         """Traite une ligne et extrait des infos"""
         pass
     
+    def process_batch(self, lines: List[str], contexts: List[str]) -> List[Tuple[int, Dict]]:
+        """Traite un lot de lignes; retourne les résultats non vides [(index, résultat)]
+        
+        Adaptateur par défaut: un appel process_line par ligne. Les modules
+        sans état entre lignes le remplacent par un balayage du tampon joint.
+        """
+        results = []
+        process_line = self.process_line
+        for i, (line, context_type) in enumerate(zip(lines, contexts)):
+            result = process_line(line, context_type)
+            if result:
+                results.append((i, result))
+        return results
+    
     def is_compatible(self, context_type: str) -> bool:
         """Vérifie si le module est compatible avec le contexte"""
         return context_type in self.context_types
+    
+    def extract(self, line: str) -> dict:
+        """Applique les extracteurs à une ligne"""
+        if self.profiler:
+            return self._extract_profiled(line)
+        
+        hardware = {}
+        for key, regex in self.extractors:
+            match = regex.search(line)
+            if match:
+                hardware[key] = match.group(1).strip()
+        return hardware
+    
+    def extract_batch(self, lines: List[str], buffer: Optional[str] = None,
+                      starts: Optional[List[int]] = None) -> Dict[int, dict]:
+        """extract() sur un lot: un finditer par extracteur sur le tampon joint
+        
+        Retourne {index de ligne: hardware} pour les lignes avec au moins un match.
+        """
+        if self.profiler:
+            found = {}
+            for i, line in enumerate(lines):
+                hardware = self._extract_profiled(line)
+                if hardware:
+                    found[i] = hardware
+            return found
+        
+        if buffer is None:
+            buffer, starts = join_lines(lines)
+        if self._batch_extractors is None or self._batch_extractors[0] is not self.extractors:
+            self._batch_extractors = (self.extractors, [
+                (key, regex, None if _LINE_ONLY_RE.search(regex.pattern)
+                 else compile_pattern(regex.pattern, regex.flags | re.M))
+                for key, regex in self.extractors
+            ])
+        
+        found: Dict[int, dict] = {}
+        for key, regex, batch_regex in self._batch_extractors[1]:
+            if batch_regex is None:
+                for i, line in enumerate(lines):
+                    match = regex.search(line)
+                    if match:
+                        found.setdefault(i, {})[key] = match.group(1).strip()
+                continue
+            
+            for match in batch_regex.finditer(buffer):
+                first = line_index(starts, match.start())
+                if '\n' in match.group(0):
+                    # Match à cheval sur plusieurs lignes: recherche ligne par ligne
+                    for i in range(first, line_index(starts, match.end() - 1) + 1):
+                        line_match = regex.search(lines[i])
+                        if line_match:
+                            hardware = found.setdefault(i, {})
+                            hardware.setdefault(key, line_match.group(1).strip())
+                    continue
+                hardware = found.setdefault(first, {})
+                if key not in hardware:
+                    hardware[key] = match.group(1).strip()
+        return found
+    
+    def _extract_profiled(self, line: str) -> dict:
+        """extract() avec temps et hits par extracteur"""
+        hardware = {}
+        record = self.profiler.record
+        owner = type(self).__name__
+        for key, regex in self.extractors:
+            start = perf_counter()
+            match = regex.search(line)
+            record('extract', owner, key, perf_counter() - start, match is not None)
+            if match:
+                hardware[key] = match.group(1).strip()
+        return hardware
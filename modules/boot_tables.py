@@ -0,0 +1,178 @@
+"""
+Boot Tables - Décodage des étapes de boot précoces par tables de correspondance
+
+Les tables (tables/early_boot.json) sont chargées une fois et indexées en
+dictionnaires: une ligne coûte une recherche exacte puis au plus une
+recherche par longueur de préfixe connue, sans chaîne de regex.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables', 'early_boot.json')
+
+
+@lru_cache(maxsize=None)
+def load_tables(path: str = TABLES_PATH) -> dict:
+    """Tables brutes (chargées une seule fois par processus)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TableDecoder:
+    """Décodeur d'une ou plusieurs sections des tables"""
+
+    def __init__(self, sections: List[str], path: str = TABLES_PATH):
+        tables = load_tables(path)
+        self.messages: Dict[str, list] = {}
+        self.prefixes: Dict[str, list] = {}
+        self.starts: Dict[str, list] = {}
+        self.boot_sources: Dict[str, str] = {}
+        self.levels: Dict[str, str] = {}
+        self.image_ids: Dict[str, str] = {}
+        self.errno: Dict[str, str] = {}
+        for name in sections:
+            section = tables[name]
+            self.messages.update(section.get('messages', {}))
+            self.prefixes.update(section.get('prefixes', {}))
+            self.starts.update(section.get('starts', {}))
+            self.boot_sources.update(section.get('boot_sources', {}))
+            self.levels.update(section.get('levels', {}))
+            self.image_ids.update(section.get('image_ids', {}))
+            self.errno.update(section.get('errno', {}))
+        # Longueurs de préfixe (en mots) à essayer, de la plus longue à la plus courte
+        self.prefix_lengths = sorted({len(p.split()) for p in self.prefixes}, reverse=True)
+        self.max_words = self.prefix_lengths[0] if self.prefix_lengths else 0
+        # Débuts de mot ("WTMI-devel-18.12.1"): un seul startswith() en C
+        self.start_keys = tuple(self.starts)
+
+    def decode(self, line: str, result: dict) -> bool:
+        """Décode une ligne dans `result` (hardware/alerts); True si reconnue"""
+        message = line.strip()
+        level = None
+        if self.levels:
+            # "ERROR:   BL2: ..." → niveau + message
+            head, _, rest = message.partition(' ')
+            level = self.levels.get(head)
+            if level:
+                message = rest.strip()
+
+        entry = self.messages.get(message)
+        if entry:
+            key, value, severity = entry
+            result['hardware'][key] = value
+            if severity == 'error':
+                result['alerts'].append(f"{key}: {value}")
+            return True
+
+        words = message.split(None, self.max_words)
+        for n in self.prefix_lengths:
+            if len(words) < n:
+                continue
+            handler = self.prefixes.get(' '.join(words[:n]))
+            if handler:
+                remainder = ' '.join(words[n:])
+                self._apply(handler, message, remainder, result)
+                return True
+
+        if self.start_keys and message.startswith(self.start_keys):
+            for start, handler in self.starts.items():
+                if message.startswith(start):
+                    self._apply(handler, message, message[len(start):], result)
+                    return True
+
+        if level == 'error':
+            result['alerts'].append(f"ATF: {message}")
+            return True
+        return False
+
+    def decode_batch(self, lines: List[str],
+                     found: Optional[Dict[int, dict]] = None) -> List[Tuple[int, dict]]:
+        """Décode un lot; `found` = hardware déjà extrait par ligne (extract_batch)
+
+        Un seul dict résultat est alloué par ligne reconnue, pas par ligne lue.
+        """
+        results = []
+        result = {'hardware': {}, 'commands': [], 'alerts': []}
+        for i, line in enumerate(lines):
+            hardware = found.get(i) if found else None
+            if hardware:
+                result['hardware'] = hardware
+            if self.decode(line, result) or hardware:
+                results.append((i, result))
+                result = {'hardware': {}, 'commands': [], 'alerts': []}
+        return results
+
+    def _apply(self, handler: list, message: str, remainder: str, result: dict):
+        kind, key = handler
+        hardware = result['hardware']
+
+        if kind == 'version':
+            hardware[key] = remainder.split()[0] if remainder else message
+        elif kind == 'value':
+            hardware[key] = remainder
+        elif kind == 'status':
+            hardware[key] = message
+        elif kind == 'boot_source':
+            hardware[key] = self.boot_source(remainder)
+        elif kind == 'fields':
+            hardware.update(self.fields(key, remainder))
+        elif kind == 'image_error':
+            decoded = self.image_error(key, message)
+            hardware['atf_error'] = decoded
+            result['alerts'].append(decoded)
+        elif kind == 'error':
+            hardware[key] = message
+            result['alerts'].append(message)
+
+    def boot_source(self, remainder: str) -> str:
+        """'SD 0 (0x29)' → 'SD/eMMC (SDIO) — SD 0 (0x29)'"""
+        first = remainder.split(None, 1)[0] if remainder else ''
+        name = self.boot_sources.get(first)
+        return f"{name} — {remainder}" if name else remainder
+
+    @staticmethod
+    def fields(prefix: str, remainder: str) -> Dict[str, str]:
+        """'5, CPU VDD voltage: 1.155V' → {'svc': '5', 'cpu_vdd_voltage': '1.155V'}"""
+        values = {}
+        for i, part in enumerate(remainder.split(',')):
+            name, sep, value = part.partition(':')
+            if i == 0 and not sep:
+                values[prefix] = part.strip()
+            elif sep:
+                values['_'.join(name.lower().split())] = value.strip()
+        return values
+
+    def image_error(self, kind: str, message: str) -> str:
+        """'BL2: Failed to load image id 3 (-2)' → 'ATF load BL31: ENOENT (image absente)'"""
+        image_id, code = _image_id(message), _errno(message)
+        image = self.image_ids.get(image_id, f"image {image_id}") if image_id else 'image'
+        reason = self.errno.get(code, code) if code else 'échec'
+        return f"ATF {kind} {image}: {reason}"
+
+
+def _image_id(message: str) -> Optional[str]:
+    """Numéro après 'id ' ou 'id='"""
+    for marker in ('id=', 'id '):
+        _, found, rest = message.partition(marker)
+        if found:
+            digits = ''
+            for char in rest.lstrip():
+                if not char.isdigit():
+                    break
+                digits += char
+            if digits:
+                return digits
+    return None
+
+
+def _errno(message: str) -> Optional[str]:
+    """Code entre parenthèses en fin de message: '(-2)' → '-2'"""
+    start = message.rfind('(')
+    end = message.find(')', start)
+    if start == -1 or end == -1:
+        return None
+    code = message[start + 1:end].strip()
+    return code if code.lstrip('-').isdigit() else None
+
@@ -0,0 +1,38 @@
+"""
+BootROM Module - Source de boot, vérification d'image et entraînement DDR
+"""
+from .base_module import BaseModule
+from .boot_tables import TableDecoder
+
+class BootromModule(BaseModule):
+    """Module BootROM"""
+    
+    def __init__(self):
+        super().__init__(
+            name='bootrom_firmware',
+            context_types=['bootrom']
+        )
+        
+        # Tables précalculées (messages exacts, préfixes, sources de boot)
+        self.decoder = TableDecoder(['bootrom', 'ddr'])
+    
+    def get_suggestions(self, context_type: str) -> list:
+        """Suggestions BootROM (aucune: pas de console interactive)"""
+        return []
+    
+    def process_line(self, line: str, context_type: str) -> dict:
+        """Traite une ligne BootROM"""
+        result = {
+            'hardware': {},
+            'commands': [],
+            'alerts': []
+        }
+        
+        if not self.decoder.decode(line, result):
+            return None
+        
+        return result
+    
+    def process_batch(self, lines: list, contexts: list) -> list:
+        """Lot de lignes BootROM: un dict résultat par ligne reconnue seulement"""
+        return self.decoder.decode_batch(lines)
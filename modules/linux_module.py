@@ -2,7 +2,8 @@
 Linux Module - Commandes et détection Linux
 """
 import re
-from .base_module import BaseModule
+from .base_module import BaseModule, join_lines, line_index
+from core.boot_timeline import BootTimeline, KIND_INITCALL, KIND_PROBE
 
 class LinuxModule(BaseModule):
     """Module Linux"""
@@ -22,6 +23,32 @@ class LinuxModule(BaseModule):
             'memory': ['free -h', 'cat /proc/meminfo', 'vmstat'],
             'packages': ['opkg list', 'opkg update'],
         }
+        
+        self.extractors = [
+            ('kernel_version', re.compile(r'Linux version ([\d.-]+)')),    # Version kernel
+            ('arch', re.compile(r'(aarch64|armv7|x86_64)', re.I)),          # Architecture
+        ]
+        
+        # Timestamp dmesg: "[    1.234567] message"
+        self.dmesg_re = re.compile(r'^\[\s*(\d+\.\d+)\]\s?(.*)$')
+        # Même motif sur le tampon d'un lot (les blancs ne franchissent pas '\n')
+        self.dmesg_batch_re = re.compile(r'^\[[^\S\n]*(\d+\.\d+)\][^\S\n]?(.*)$', re.M)
+        # initcall_debug: "initcall foo_init+0x0/0x1000 returned 0 after 123 usecs"
+        self.initcall_re = re.compile(r'^initcall (\S+?)(?:\+0x\S+)? returned (-?\d+) after (\d+) usecs')
+        # Probe (initcall_debug): "probe of d0070000.pcie returned 0 after 10 usecs",
+        # "mvebu-pcie d0070000.pcie: probe with driver mvebu-pcie returned 0 after 10 usecs"
+        self.probe_re = re.compile(
+            r'(?:probe of (\S+)|probe with driver (\S+)) returned (-?\d+) after (\d+) usecs')
+        # Ligne de driver: "mvebu-pcie d0070000.pcie: link up"
+        self.driver_re = re.compile(r'^([\w.-]+) ([\w.:@-]+): ')
+        
+        # Chronologie du boot kernel (flux)
+        self.timeline = BootTimeline()
+        
+        self.capture_patterns = [
+            r'Kernel panic', r'Internal error: Oops', r'Unable to handle kernel',
+            r'BUG: ', r'Call trace:', r'rcu_sched self-detected stall',
+        ]
     
     def get_suggestions(self, context_type: str) -> list:
         """Suggestions Linux"""
@@ -38,19 +65,63 @@ class LinuxModule(BaseModule):
     def process_line(self, line: str, context_type: str) -> dict:
         """Traite une ligne Linux"""
         result = {
-            'hardware': {},
+            'hardware': self.extract(line),
             'commands': [],
             'alerts': []
         }
         
-        # Version kernel
-        match = re.search(r'Linux version ([\d.-]+)', line)
-        if match:
-            result['hardware']['kernel_version'] = match.group(1)
+        if line.startswith('['):
+            self.parse_dmesg(line, result)
         
-        # Architecture
-        match = re.search(r'(aarch64|armv7|x86_64)', line, re.I)
+        return result if result['hardware'] or result['alerts'] else None
+    
+    def process_batch(self, lines: list, contexts: list) -> list:
+        """Lot de lignes: un finditer par motif sur le tampon joint"""
+        buffer, starts = join_lines(lines)
+        found = self.extract_batch(lines, buffer, starts)
+        
+        alerts = {}
+        dmesg_message = self.dmesg_message
+        for match in self.dmesg_batch_re.finditer(buffer):
+            alert = dmesg_message(float(match.group(1)), match.group(2))
+            if alert:
+                alerts.setdefault(line_index(starts, match.start()), []).append(alert)
+        
+        return [(i, {'hardware': found.get(i, {}), 'commands': [], 'alerts': alerts.get(i, [])})
+                for i in sorted(found.keys() | alerts.keys())]
+    
+    def parse_dmesg(self, line: str, result: dict):
+        """Timestamp, initcall et probe d'une ligne dmesg"""
+        match = self.dmesg_re.match(line)
         if match:
-            result['hardware']['arch'] = match.group(1)
+            alert = self.dmesg_message(float(match.group(1)), match.group(2))
+            if alert:
+                result['alerts'].append(alert)
+    
+    def dmesg_message(self, ts: float, message: str):
+        """Message dmesg horodaté → chronologie; retourne une alerte éventuelle"""
+        timeline = self.timeline
+        timeline.timestamp(ts)
+        
+        if 'usecs' in message:
+            initcall = self.initcall_re.match(message)
+            if initcall:
+                name, ret, usecs = initcall.groups()
+                timeline.add(KIND_INITCALL, name, ts, int(usecs), int(ret))
+                if ret != '0':
+                    return f"initcall {name} returned {ret}"
+                return None
+            probe = self.probe_re.search(message)
+            if probe:
+                device, driver, ret, usecs = probe.groups()
+                name = driver or device
+                driver_line = self.driver_re.match(message)
+                if driver_line and not driver:
+                    name = f"{driver_line.group(1)} {device}"
+                timeline.add(KIND_PROBE, name, ts, int(usecs), int(ret))
+                return None
         
-        return result if result['hardware'] else None
+        driver_line = self.driver_re.match(message)
+        if driver_line:
+            timeline.driver_line(driver_line.group(1), ts)
+        return None
@@ -4,6 +4,9 @@ U-Boot Module - Commandes et détection U-Boot
 import re
 from .base_module import BaseModule
 
+# Fait publié en fin de réponse printenv/bdinfo (core.board_profile.PROFILE_FACT)
+PROFILE_FACT = 'board_profile'
+
 class UbootModule(BaseModule):
     """Module U-Boot"""
     
@@ -21,6 +24,35 @@ class UbootModule(BaseModule):
             'network': ['dhcp', 'ping', 'tftpboot'],
             'storage': ['mmc', 'usb', 'fatload', 'ext4load'],
         }
+        
+        self.extractors = [
+            ('uboot_version', re.compile(r'U-Boot ([\d.]+)')),   # Version U-Boot
+            ('board', re.compile(r'Board: (.*?)$')),              # Board info
+            ('soc', re.compile(r'(Armada \d+|A[37]\d+)')),        # SoC
+            ('model', re.compile(r'^Model: (.*?)$')),             # Modèle
+        ]
+        
+        # Ligne de prompt avec la commande tapée: "Marvell>> printenv", "=> bdinfo"
+        self.prompt_re = re.compile(r'^(?:[A-Za-z][\w-]*>{1,2}|=>)\s*(\S*)\s*(.*?)\s*$')
+        # Sortie de `help`: "bootm   - boot application image from memory"
+        self.help_re = re.compile(r'^([a-z][\w.-]*)\s+- \S')
+        # Sortie de `printenv`: "bootdelay=2"
+        self.env_re = re.compile(r'^([\w.:-]+)=(.*)$')
+        # Sortie de `bdinfo`: "DRAM bank   = 0x00000001", "-> size     = 0x380000000"
+        self.bdinfo_re = re.compile(r'^(->\s*)?(\S.*?)\s*=\s*(.*?)\s*$')
+        
+        self.capture_patterns = [r'### ERROR ###', r'"Synchronous Abort"', r'resetting \.\.\.']
+        
+        # Réponse en cours d'analyse
+        self.response = None       # 'printenv', 'bdinfo', 'help' ou None
+        self.full_env = False      # printenv sans argument: variables absentes supprimées
+        self.seen_keys = set()
+        self.banks = []
+        
+        # Carte courante et ce qui en a été lu (persisté par core.board_profile)
+        self.board = 'unknown'
+        self.env_values = {}
+        self.bdinfo_values = {}
     
     def get_suggestions(self, context_type: str) -> list:
         """Suggestions U-Boot"""
@@ -37,24 +69,104 @@ class UbootModule(BaseModule):
     def process_line(self, line: str, context_type: str) -> dict:
         """Traite une ligne U-Boot"""
         result = {
-            'hardware': {},
+            'hardware': self.extract(line),
             'commands': [],
             'alerts': []
         }
         
-        # Version U-Boot
-        match = re.search(r'U-Boot ([\d.]+)', line)
-        if match:
-            result['hardware']['uboot_version'] = match.group(1)
+        # Identité de la carte (nouvelle carte: rien de lu)
+        board = result['hardware'].get('model') or result['hardware'].get('board')
+        if board and board != self.board:
+            self.board = board
+            self.env_values = {}
+            self.bdinfo_values = {}
+        
+        prompt = self.prompt_re.match(line)
+        if prompt:
+            # Nouveau prompt: fin de la réponse précédente
+            self.finish_response(result)
+            self.start_response(prompt.group(1), prompt.group(2))
+        elif self.response:
+            self.parse_response(line, result)
+        
+        return result if result['hardware'] or result['commands'] else None
+    
+    def start_response(self, command: str, args: str):
+        """Commande tapée au prompt"""
+        if command in ('printenv', 'bdinfo', 'help'):
+            self.response = command
+            self.full_env = command == 'printenv' and not args
+            self.seen_keys = set()
+            self.banks = []
+    
+    def parse_response(self, line: str, result: dict):
+        """Ligne de réponse à printenv / bdinfo / help"""
+        if self.response == 'printenv':
+            match = self.env_re.match(line)
+            if match:
+                key = match.group(1)
+                self.seen_keys.add(key)
+                self.env_values[key] = match.group(2)
+            elif line.startswith('Environment size:'):
+                self.finish_response(result)
+        
+        elif self.response == 'bdinfo':
+            match = self.bdinfo_re.match(line)
+            if not match:
+                return
+            key, value = match.group(2), match.group(3)
+            if key == 'DRAM bank':
+                self.banks.append({'bank': _to_int(value)})
+            elif match.group(1) and self.banks:
+                self.banks[-1][key] = _to_int(value)
+            else:
+                self.bdinfo_values[key] = value
+        
+        elif self.response == 'help':
+            # Commandes découvertes (complétion)
+            match = self.help_re.match(line)
+            if match:
+                result['commands'].append(match.group(1))
+    
+    def finish_response(self, result: dict):
+        """Fin de réponse: publie les données lues (fait PROFILE_FACT)
         
-        # Board info
-        match = re.search(r'Board: (.*?)$', line)
-        if match:
-            result['hardware']['board'] = match.group(1).strip()
+        Pas d'accès disque ici (thread GUI ou processus isolé): le profil
+        est fusionné et écrit par core.board_profile.ProfileRecorder.
+        """
+        response, self.response = self.response, None
+        if response not in ('printenv', 'bdinfo'):
+            return
         
-        # SoC
-        match = re.search(r'(Armada \d+|A[37]\d+)', line)
-        if match:
-            result['hardware']['soc'] = match.group(1)
+        fact = {'board': self.board}
+        if response == 'printenv':
+            if self.full_env:
+                for key in set(self.env_values) - self.seen_keys:
+                    del self.env_values[key]
+            # Carte sans bannière Model/Board: nommée par son environnement
+            if self.board == 'unknown' and self.env_values.get('board_name'):
+                fact['renamed_from'] = self.board
+                self.board = fact['board'] = self.env_values['board_name']
+            fact['env'] = {key: self.env_values[key] for key in self.seen_keys}
+            fact['full_env'] = self.full_env
+            result['hardware']['env'] = f"{len(self.env_values)} variables"
+        else:
+            fact['bdinfo'] = dict(self.bdinfo_values)
+            fact['dram'] = list(self.banks)
+            if self.banks:
+                total = sum(bank.get('size', 0) for bank in self.banks)
+                result['hardware']['dram'] = f"{total / 2**30:.2f} GiB ({len(self.banks)} bancs)"
         
-        return result if result['hardware'] else None
+        result['hardware'][PROFILE_FACT] = fact
+    
+    def env(self, key: str):
+        """Variable d'environnement lue pendant la session (sans interroger la console)"""
+        return self.env_values.get(key)
+
+
+def _to_int(value: str):
+    """'0x7F000000' → 2130706432 (valeur brute si non numérique)"""
+    try:
+        return int(value, 16) if value.lower().startswith('0x') else int(value)
+    except ValueError:
+        return value
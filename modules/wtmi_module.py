@@ -0,0 +1,38 @@
+"""
+WTMI Module - Statut TIM/WTMI, SVC et entraînement DDR
+"""
+from .base_module import BaseModule
+from .boot_tables import TableDecoder
+
+class WtmiModule(BaseModule):
+    """Module WTMI"""
+    
+    def __init__(self):
+        super().__init__(
+            name='wtmi_firmware',
+            context_types=['wtmi']
+        )
+        
+        # Tables précalculées (messages exacts, préfixes, sources de boot)
+        self.decoder = TableDecoder(['wtmi', 'ddr'])
+    
+    def get_suggestions(self, context_type: str) -> list:
+        """Suggestions WTMI (aucune)"""
+        return []
+    
+    def process_line(self, line: str, context_type: str) -> dict:
+        """Traite une ligne WTMI"""
+        result = {
+            'hardware': {},
+            'commands': [],
+            'alerts': []
+        }
+        
+        if not self.decoder.decode(line, result):
+            return None
+        
+        return result
+    
+    def process_batch(self, lines: list, contexts: list) -> list:
+        """Lot de lignes WTMI: un dict résultat par ligne reconnue seulement"""
+        return self.decoder.decode_batch(lines)
@@ -0,0 +1,65 @@
+"""
+Boot Diff - Patience diff sur des logs répétitifs (peu ou pas de lignes uniques)
+
+    python3 -m pytest tests/        # ou python3 -m unittest discover tests
+"""
+import random
+import unittest
+
+from core.boot_diff import SMALL_GAP, patience_diff
+
+VOCABULARY = [f"mv88e6085 f1072004.mdio-mii:01: port {n} link up" for n in range(20)]
+
+
+def repetitive(size: int, seed: int) -> list:
+    """Log sans aucune ligne unique: `size` lignes tirées d'un petit vocabulaire"""
+    rng = random.Random(seed)
+    return [rng.choice(VOCABULARY) for _ in range(size)]
+
+
+def substitute(lines: list, count: int, seed: int) -> list:
+    """`count` lignes remplacées par une autre ligne du vocabulaire"""
+    rng = random.Random(seed)
+    changed = list(lines)
+    for i in rng.sample(range(len(lines)), count):
+        changed[i] = rng.choice([line for line in VOCABULARY if line != lines[i]])
+    return changed
+
+
+class PatienceDiffTest(unittest.TestCase):
+
+    def check_ops(self, a, b, ops):
+        """Chaque ligne apparaît une fois, dans l'ordre; '=' relie des lignes égales"""
+        self.assertEqual(sorted(i for tag, i, _ in ops if tag != '+'), list(range(len(a))))
+        self.assertEqual(sorted(j for tag, _, j in ops if tag != '-'), list(range(len(b))))
+        pairs = [(i, j) for tag, i, j in ops if tag == '=']
+        self.assertEqual(pairs, sorted(pairs))
+        self.assertTrue(all(a[i] == b[j] for i, j in pairs))
+
+    def test_repeated_lines_substitution(self):
+        a = repetitive(20000, 1)
+        self.assertGreater(len(a) ** 2, SMALL_GAP)
+        b = substitute(a, 50, 2)
+        ops = patience_diff(a, b)
+        self.check_ops(a, b, ops)
+        self.assertLessEqual(sum(1 for op in ops if op[0] == '+'), 50)
+        self.assertLessEqual(sum(1 for op in ops if op[0] == '-'), 50)
+
+    def test_repeated_lines_insertion(self):
+        a = repetitive(20000, 3)
+        b = a[:7000] + VOCABULARY[:5] + a[7000:13000] + a[13100:]
+        ops = patience_diff(a, b)
+        self.check_ops(a, b, ops)
+        self.assertLessEqual(sum(1 for op in ops if op[0] == '+'), 5)
+        self.assertLessEqual(sum(1 for op in ops if op[0] == '-'), 100)
+
+    def test_unique_lines(self):
+        a = [f"line {n}" for n in range(1000)]
+        b = a[:100] + ['new'] + a[100:500] + a[501:]
+        ops = patience_diff(a, b)
+        self.check_ops(a, b, ops)
+        self.assertEqual([op for op in ops if op[0] != '='], [('+', None, 100), ('-', 500, None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Bridge - Exports TCP, socket Unix et pty sur un port Loopback (sans matériel)
+
+    python3 -m pytest tests/        # ou python3 -m unittest discover tests
+"""
+import os
+import select
+import socket
+import tempfile
+import time
+import unittest
+
+from core.bridge import BridgeServer, Loopback, local_paths
+
+TIMEOUT = 5.0
+
+
+def receive(read, expected: bytes, timeout: float = TIMEOUT) -> bytes:
+    """Lit via `read()` jusqu'à contenir `expected` (ou échéance)"""
+    data = b''
+    deadline = time.monotonic() + timeout
+    while expected not in data and time.monotonic() < deadline:
+        data += read()
+    return data
+
+
+def socket_reader(sock: socket.socket):
+    sock.settimeout(0.1)
+
+    def read() -> bytes:
+        try:
+            return sock.recv(4096)
+        except socket.timeout:
+            return b''
+    return read
+
+
+def fd_reader(fd: int):
+    def read() -> bytes:
+        if select.select([fd], [], [], 0.1)[0]:
+            return os.read(fd, 4096)
+        return b''
+    return read
+
+
+class BridgeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pidebugger-bridge-')
+        self.link, self.sock_path = local_paths(self.directory, 'loop')
+        self.server = BridgeServer('127.0.0.1')
+        self.exported = self.server.add_port(Loopback(), 0)
+        self.server.add_unix(self.exported, self.sock_path)
+        self.pty_path = self.server.add_pty(self.exported, self.link)
+        self.server.start()
+        self.sockets = []
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+        if self.server.running:
+            self.server.stop()
+        os.rmdir(self.directory)
+
+    def tcp_client(self) -> socket.socket:
+        sock = socket.create_connection(('127.0.0.1', self.exported.tcp_port), TIMEOUT)
+        self.sockets.append(sock)
+        return sock
+
+    def unix_client(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.sock_path)
+        self.sockets.append(sock)
+        return sock
+
+    def wait_clients(self, count: int):
+        """Les connexions sont acceptées par la boucle du serveur"""
+        deadline = time.monotonic() + TIMEOUT
+        while len(self.exported.hub.clients) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.exported.hub.clients), count)
+
+    def test_tcp_round_trip(self):
+        sock = self.tcp_client()
+        self.wait_clients(2)                # pty + TCP
+        sock.sendall(b'tcp ping\n')
+        self.assertIn(b'tcp ping\n', receive(socket_reader(sock), b'tcp ping\n'))
+
+    def test_unix_round_trip(self):
+        sock = self.unix_client()
+        self.wait_clients(2)
+        sock.sendall(b'unix ping\n')
+        self.assertIn(b'unix ping\n', receive(socket_reader(sock), b'unix ping\n'))
+
+    def test_pty_round_trip(self):
+        self.assertEqual(os.readlink(self.link), self.pty_path)
+        fd = os.open(self.link, os.O_RDWR | os.O_NOCTTY)
+        try:
+            os.write(fd, b'pty ping\n')
+            self.assertIn(b'pty ping\n', receive(fd_reader(fd), b'pty ping\n'))
+        finally:
+            os.close(fd)
+
+    def test_fanout(self):
+        """Ce qu'un client envoie (écho du port) arrive à tous les clients"""
+        senders = [self.tcp_client(), self.tcp_client(), self.unix_client()]
+        self.wait_clients(4)
+        fd = os.open(self.link, os.O_RDWR | os.O_NOCTTY)
+        try:
+            senders[0].sendall(b'fanout\n')
+            for sock in senders:
+                self.assertIn(b'fanout\n', receive(socket_reader(sock), b'fanout\n'))
+            self.assertIn(b'fanout\n', receive(fd_reader(fd), b'fanout\n'))
+        finally:
+            os.close(fd)
+
+    def test_stop_removes_links(self):
+        self.assertTrue(os.path.islink(self.link))
+        self.assertTrue(os.path.exists(self.sock_path))
+        self.server.stop()
+        self.assertFalse(os.path.lexists(self.link))
+        self.assertFalse(os.path.exists(self.sock_path))
+        self.assertEqual(self.server.connections, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
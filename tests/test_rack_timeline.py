@@ -0,0 +1,79 @@
+"""
+Rack Timeline - Cycles de boot et classement des cartes lentes
+
+    python3 -m pytest tests/        # ou python3 -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.rack_timeline import RackTimeline
+from core.session_log import SessionLogger
+
+# Boot Armada: BL2 rend la main à BL1 pour lancer BL31 (même boot)
+ARMADA_BOOT = ['bootrom', 'wtmi', 'atf_bl1', 'atf_bl2', 'atf_bl1', 'atf_bl31',
+               'uboot_main', 'linux_kernel', 'linux_shell']
+CYCLES = 3
+
+
+def add_cycles(rack: RackTimeline, name: str, phase_seconds: float, t0: float = 1000.0):
+    """CYCLES boots de `name`, chaque phase durant `phase_seconds` (+1 s au shell)"""
+    ts = t0
+    for _ in range(CYCLES):
+        for context in ARMADA_BOOT:
+            rack.add(name, context, ts)
+            ts += phase_seconds if context != 'linux_shell' else 1.0
+    rack.track(name).touch(ts)
+
+
+class RackTimelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rack = RackTimeline()
+        add_cycles(self.rack, 'fast', 1.0)
+        add_cycles(self.rack, 'slow', 3.0)
+
+    def test_one_cycle_per_boot(self):
+        for track in self.rack.tracks.values():
+            self.assertEqual(len(track.cycles()), CYCLES)
+
+    def test_reach_time_covers_whole_boot(self):
+        """Mesuré depuis le bootrom, pas depuis le retour BL2 → BL1"""
+        shell = len(ARMADA_BOOT) - 1
+        for cycle in range(-CYCLES, CYCLES):
+            self.assertEqual(self.rack.track('fast').reach_time('linux_shell', cycle), shell * 1.0)
+            self.assertEqual(self.rack.track('slow').reach_time('linux_shell', cycle), shell * 3.0)
+        self.assertIsNone(self.rack.track('fast').reach_time('linux_shell', CYCLES))
+
+    def test_ranking(self):
+        for cycle in (-1, -2, 0):
+            self.assertEqual([name for name, _ in self.rack.slowest(cycle=cycle)], ['slow', 'fast'])
+
+    def test_phase_durations(self):
+        phases = self.rack.track('slow').phase_durations(-2)
+        self.assertEqual([context for context, _ in phases], ARMADA_BOOT)
+
+    def test_load_index(self):
+        """Mêmes cycles depuis l'index d'un journal de session"""
+        directory = tempfile.mkdtemp(prefix='pidebugger-rack-')
+        try:
+            logger = SessionLogger(directory, 'ttyUSB0', codec='gzip')
+            ts = 1000.0
+            for _ in range(CYCLES):
+                for context in ARMADA_BOOT:
+                    logger.write(context.encode() + b'\n', ts)
+                    logger.mark(context, ts)
+                    ts += 1.0
+            logger.close()
+            rack = RackTimeline()
+            rack.load_directory(directory)
+            track = rack.track('ttyUSB0')
+            self.assertEqual(len(track.cycles()), CYCLES)
+            self.assertEqual(track.reach_time('linux_shell', -2), len(ARMADA_BOOT) - 1.0)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Records - Colonnes de LineStore: ports nombreux, fenêtres de temps
+
+    python3 -m pytest tests/        # ou python3 -m unittest discover tests
+"""
+import time
+import unittest
+
+from core.records import MAX_PORTS, LineStore
+
+
+class LineStoreTest(unittest.TestCase):
+
+    def test_port_limit(self):
+        """Au-delà de MAX_PORTS ports: erreur explicite, colonnes intactes"""
+        store = LineStore()
+        for n in range(MAX_PORTS):
+            store.append(f"line {n}", 'linux_kernel', 1000.0 + n, f"/dev/ttyUSB{n}")
+        self.assertEqual(store.runs(port=f"/dev/ttyUSB{MAX_PORTS - 1}"), [(MAX_PORTS - 1, MAX_PORTS)])
+        with self.assertRaisesRegex(ValueError, 'ports'):
+            store.append('de trop', 'linux_kernel', 2000.0, 'socket://pi:5000')
+        with self.assertRaises(ValueError):
+            store.extend(['de trop'], ['linux_kernel'], 2000.0, 'socket://pi:5000')
+        self.assertEqual(len(store.times), MAX_PORTS)
+        self.assertEqual(len(store.offsets), MAX_PORTS + 1)
+        self.assertEqual(store.line(-1), f"line {MAX_PORTS - 1}")
+
+    def test_window_survives_wall_clock_step(self):
+        """Horloge murale qui recule (NTP sur un Pi sans RTC): la fenêtre reste juste"""
+        store = LineStore()
+        now = time.time()
+        store.extend(['avant NTP 1', 'avant NTP 2'], ['uboot_main'] * 2, now + 3600)
+        store.extend(['après NTP'], ['linux_kernel'], now)
+        runs = store.runs(t0=time.time() - 60)
+        self.assertEqual(runs, [(0, 3)])
+        self.assertEqual(store.view(runs), 'avant NTP 1\navant NTP 2\naprès NTP\n')
+        self.assertLess(store.age(-1), 60)
+        self.assertEqual(store.runs(t0=time.time() + 60), [])
+
+    def test_trim_keeps_columns_aligned(self):
+        store = LineStore(max_bytes=64)
+        for n in range(40):
+            store.append(f"l{n}", 'linux_shell', 1000.0 + n, 'p')
+        self.assertEqual(len(store.clocks), len(store.times))
+        self.assertEqual(store.line(-1), 'l39')
+        self.assertEqual(store.runs(t0=time.time() - 60), [(0, len(store))])
+
+
+if __name__ == '__main__':
+    unittest.main()
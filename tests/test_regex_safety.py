@@ -0,0 +1,68 @@
+"""
+Regex Safety - Patterns refusés (retour arrière exponentiel) et acceptés
+
+    python3 -m pytest tests/        # ou python3 -m unittest discover tests
+"""
+import re
+import time
+import unittest
+
+from core.regex_safety import UnsafePattern, builtin_patterns, check_pattern, compile_pattern
+
+# (pattern, texte qui le fait échouer en temps exponentiel avec `re`)
+CATASTROPHIC = [
+    (r'(a+)+$', 'a' * 40 + '!'),
+    (r'(\w+\s?)+$', 'ab ' * 20 + '!'),
+    (r'(.*,)*x', ',' * 40),
+    (r'(a|aa)+b', 'a' * 40),
+    # Une alternative égale à la concaténation d'autres
+    (r'(?:a|b|ab)+c', 'ab' * 24),
+    (r'(?:ab|a|b)*$', 'ab' * 24 + '!'),
+    (r'(?:abc|a|bc)+x', 'abc' * 20),
+    (r'(?:a|ab|ba)+c', 'ab' * 24),
+    (r'(?:\d|\d\d)+x', '1' * 40),
+    (r'(?:x|xy|yx|y)+z', 'xy' * 24),
+]
+
+SAFE = [
+    r'(foo|bar)+',
+    r'(?:a|b)+c',
+    r'(?:\s|,)+$',
+    r'((25[0-5]|2[0-4]\d|1?\d?\d)\.){3}',
+    r'^\[\s*(\d+\.\d+)\]\s+(.*)$',
+    r'(?:ab|cd)*x',
+]
+
+
+class CheckPatternTest(unittest.TestCase):
+
+    def test_catastrophic_rejected(self):
+        for pattern, _ in CATASTROPHIC:
+            with self.subTest(pattern=pattern):
+                self.assertIsNotNone(check_pattern(pattern))
+                with self.assertRaises(UnsafePattern):
+                    compile_pattern(pattern)
+
+    def test_safe_accepted(self):
+        for pattern in SAFE:
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(check_pattern(pattern))
+
+    def test_builtin_accepted(self):
+        for origin, pattern, flags in builtin_patterns():
+            with self.subTest(origin=origin):
+                self.assertIsNone(check_pattern(pattern, flags))
+
+    def test_safe_bounded_on_adversarial_input(self):
+        """Les patterns acceptés restent rapides sur les entrées des refusés"""
+        texts = [text for _, text in CATASTROPHIC]
+        for pattern in SAFE:
+            compiled = re.compile(pattern)
+            start = time.perf_counter()
+            for text in texts:
+                compiled.search(text * 20)
+            self.assertLess(time.perf_counter() - start, 0.5, pattern)
+
+
+if __name__ == '__main__':
+    unittest.main()
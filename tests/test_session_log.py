@@ -0,0 +1,72 @@
+"""
+Session Log - Découpage en boots des journaux (logs de benchmarks rejoués)
+
+    python3 -m pytest tests/        # ou python3 -m unittest discover tests
+"""
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.context_detector import ContextDetector
+from core.session_log import SessionLogger, SessionLogReader, boot_starts
+
+LOGS = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'logs', '*.log')))
+CYCLES = 3
+
+
+def replay(directory: str, port: str, data: bytes, cycles: int):
+    """Journal d'un port qui reçoit `cycles` fois le même boot, ligne par ligne"""
+    logger = SessionLogger(directory, port, codec='gzip')
+    detector = ContextDetector()
+    ts = 1000.0
+    for _ in range(cycles):
+        for line in data.splitlines(keepends=True):
+            ts += 0.001
+            logger.write(line, ts)
+            if detector.update(line.decode('utf-8', errors='replace').rstrip('\r\n')):
+                logger.mark(detector.current_context.type.value, ts)
+    logger.close()
+
+
+class BootStartsTest(unittest.TestCase):
+
+    def test_armada_firmware_hand_offs(self):
+        """BL2 rend la main à BL1 pour lancer BL31: même boot"""
+        contexts = ['bootrom', 'wtmi', 'atf_bl1', 'atf_bl2', 'atf_bl1', 'atf_bl31',
+                    'uboot_main', 'linux_kernel', 'linux_shell']
+        self.assertEqual(boot_starts(contexts), [0])
+        self.assertEqual(boot_starts(contexts * 3), [0, 9, 18])
+
+    def test_resets(self):
+        self.assertEqual(boot_starts(['uboot_main', 'bootrom', 'atf_bl1']), [0, 1])
+        self.assertEqual(boot_starts(['linux_shell', 'uboot_main', 'linux_kernel']), [1])
+        self.assertEqual(boot_starts(['atf_bl1', 'atf_bl2', 'bootrom']), [0, 2])
+        self.assertEqual(boot_starts(['linux_shell', 'linux_kernel', 'linux_shell']), [])
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pidebugger-session-')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_one_boot_per_cycle(self):
+        self.assertTrue(LOGS)
+        for path in LOGS:
+            with self.subTest(log=os.path.basename(path)):
+                with open(path, 'rb') as f:
+                    data = f.read()
+                port = os.path.basename(path)[:-len('.log')]
+                replay(self.directory, port, data, CYCLES)
+                reader = SessionLogReader(self.directory, port)
+                self.assertEqual(len(reader.boots()), CYCLES)
+                for index in range(CYCLES):
+                    self.assertEqual(reader.extract_boot(index), data)
+
+
+if __name__ == '__main__':
+    unittest.main()